@@ -1,6 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from brain_api.api.dependencies import get_db, get_influx_service, get_mqtt_service
+from brain_api.api.dependencies import (
+    get_async_influx_service,
+    get_db,
+    get_influx_service,
+    get_mqtt_service,
+)
 from brain_api.schemas import ChargingRequestCreate, ChargingRequestResponse
 from brain_api.services import ChargingRequestService
 
@@ -20,6 +25,7 @@ async def request_charging(
     db=Depends(get_db),
     mqtt_service=Depends(get_mqtt_service),
     influx_service=Depends(get_influx_service),
+    async_influx_service=Depends(get_async_influx_service),
 ):
     """
     Request a charging session for a vehicle at a specific node.
@@ -27,5 +33,9 @@ async def request_charging(
     The QR code scan provides the node ID, and the app provides the vehicle ID.
     This publishes a message to the MQTT topic for the hub to process.
     """
-    service = ChargingRequestService(db, mqtt_service, influx_service)
-    return service.request_charging(node_id=node_id, vehicle_id=request_data.vehicle_id)
+    service = ChargingRequestService(
+        db, mqtt_service, influx_service, async_influx_service=async_influx_service
+    )
+    return await service.request_charging_async(
+        node_id=node_id, vehicle_id=request_data.vehicle_id
+    )
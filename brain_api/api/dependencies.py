@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
+from ..core.config import settings
 from ..db import get_db
 from ..services import (
     ChargingSessionService,
@@ -12,13 +13,15 @@ from ..services import (
     RecommendationService,
     VehicleService,
 )
-from ..services.influxdb_service import InfluxDBService
+from ..services.influxdb_service import AsyncInfluxDBService, InfluxDBService
 
 DBSession = Annotated[Session, Depends(get_db)]
 
 
 _mqtt_service = None
 _influx_service = None
+_async_influx_service = None
+_data_collector = None
 
 
 def get_mqtt_service():
@@ -35,6 +38,20 @@ def set_mqtt_service(mqtt_service):
     _mqtt_service = mqtt_service
 
 
+def get_data_collector():
+    """Dependency that provides the MQTT data collector instance."""
+    global _data_collector
+    if _data_collector is None:
+        raise RuntimeError("MQTT data collector not initialized")
+    return _data_collector
+
+
+def set_data_collector(data_collector):
+    """Set the global MQTT data collector instance."""
+    global _data_collector
+    _data_collector = data_collector
+
+
 def get_influx_service() -> InfluxDBService:
     """Dependency that provides InfluxDB service instance."""
     global _influx_service
@@ -43,6 +60,27 @@ def get_influx_service() -> InfluxDBService:
     return _influx_service
 
 
+def get_async_influx_service() -> AsyncInfluxDBService:
+    """Dependency that provides the shared async InfluxDB service instance."""
+    global _async_influx_service
+    if _async_influx_service is None:
+        _async_influx_service = AsyncInfluxDBService(
+            connection_pool_maxsize=settings.INFLUXDB_ASYNC_POOL_SIZE
+        )
+    return _async_influx_service
+
+
+async def close_influx_services() -> None:
+    """Close the shared InfluxDB clients."""
+    global _influx_service, _async_influx_service
+    if _influx_service is not None:
+        _influx_service.close()
+        _influx_service = None
+    if _async_influx_service is not None:
+        await _async_influx_service.close()
+        _async_influx_service = None
+
+
 def get_hub_service(db: DBSession) -> HubService:
     """Dependency that provides HubService instance."""
     return HubService(db)
@@ -69,10 +107,12 @@ def get_dlm_service(db: DBSession) -> DLMService:
 
 
 def get_recommendation_service(
-    db: DBSession, influx: InfluxDBService = Depends(get_influx_service)
+    db: DBSession,
+    influx: InfluxDBService = Depends(get_influx_service),
+    async_influx: AsyncInfluxDBService = Depends(get_async_influx_service),
 ) -> RecommendationService:
     """Dependency that provides RecommendationService instance."""
-    return RecommendationService(db, influx)
+    return RecommendationService(db, influx, async_influx_service=async_influx)
 
 
 HubServiceDep = Annotated[HubService, Depends(get_hub_service)]
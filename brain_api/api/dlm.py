@@ -1,9 +1,20 @@
+from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
+from ..core.config import settings
+from ..models import DLMEventDbo
+from ..repositories import DLMEventRepository
 from ..repositories.base import NotFoundError
-from ..schemas import DLMEventListResponse, DLMEventLog, DLMEventResponse
+from ..schemas import (
+    DLMEventListResponse,
+    DLMEventLog,
+    DLMEventResponse,
+    ExportFormat,
+)
+from ..services.export import encode_export, export_headers, stream_in_session
 from .dependencies import DLMServiceDep
 
 router = APIRouter(prefix="/dlm", tags=["Dynamic Load Management"])
@@ -18,11 +29,23 @@ def list_events(
     service: DLMServiceDep,
     hub_id: str | None = None,
     node_id: str | None = None,
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    exact_total: bool = Query(False, description="Count exactly instead of estimating"),
 ) -> DLMEventListResponse:
-    """List DLM events with optional filtering by hub or node."""
-    return service.list(hub_id=hub_id, node_id=node_id, skip=skip, limit=limit)
+    """List DLM events newest first, with optional filtering by hub or node."""
+    try:
+        return service.list(
+            hub_id=hub_id,
+            node_id=node_id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            exact_total=exact_total,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get(
@@ -39,6 +62,38 @@ def get_recent_events(
     return service.get_recent(hours=hours, limit=limit)
 
 
+@router.get(
+    "/events/export",
+    response_class=StreamingResponse,
+    summary="Export DLM events",
+)
+def export_events(
+    format: ExportFormat = ExportFormat.NDJSON,
+    gzip: bool = False,
+    hub_id: str | None = None,
+    node_id: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> StreamingResponse:
+    """Stream all matching DLM events as NDJSON or CSV, in constant memory."""
+    rows = stream_in_session(
+        lambda db: DLMEventRepository(db).stream_events(
+            hub_id=hub_id,
+            node_id=node_id,
+            start=start,
+            end=end,
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        )
+    )
+    columns = [c.name for c in DLMEventDbo.__table__.columns]
+    media_type, headers = export_headers("dlm_events", format, gzip)
+    return StreamingResponse(
+        encode_export(rows, columns, format, gzip),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 @router.get(
     "/events/{event_id}",
     response_model=DLMEventResponse,
@@ -4,7 +4,8 @@ from fastapi import APIRouter
 
 from ..core.config import settings
 from ..db import check_db_health
-from ..schemas import HealthResponse
+from ..schemas import CollectorMetricsResponse, HealthResponse
+from .dependencies import get_data_collector
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -36,3 +37,19 @@ async def health_check() -> HealthResponse:
             "database": db_health["status"],
         },
     )
+
+
+@router.get(
+    "/health/collector",
+    response_model=CollectorMetricsResponse,
+    summary="Data Collector Metrics",
+    description="Throughput and backpressure metrics of the MQTT write-behind pipeline",
+)
+async def collector_metrics() -> CollectorMetricsResponse:
+    """
+    Report MQTT data collector pipeline metrics.
+
+    Returns:
+        CollectorMetricsResponse: Queue depth, throughput and batch statistics
+    """
+    return CollectorMetricsResponse(**get_data_collector().get_metrics())
@@ -1,6 +1,11 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 
-from ..schemas import RecommendationRequest, RecommendationResponse
+from ..schemas import (
+    BulkRecommendationRequest,
+    BulkRecommendationResponse,
+    RecommendationRequest,
+    RecommendationResponse,
+)
 from .dependencies import RecommendationServiceDep
 
 router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
@@ -11,7 +16,7 @@ router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
     response_model=RecommendationResponse,
     summary="Get charging station recommendation",
 )
-def get_recommendation(
+async def get_recommendation(
     request: RecommendationRequest,
     service: RecommendationServiceDep,
 ) -> RecommendationResponse:
@@ -25,7 +30,7 @@ def get_recommendation(
     - Vehicle battery urgency
     """
     try:
-        recommendation = service.get_recommendation(request)
+        recommendation = await service.get_recommendation_async(request)
 
         if not recommendation:
             raise HTTPException(
@@ -42,3 +47,39 @@ def get_recommendation(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate recommendation: {str(e)}",
         )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkRecommendationResponse,
+    summary="Get charging station recommendations for many vehicles",
+)
+def get_bulk_recommendations(
+    request: BulkRecommendationRequest,
+    service: RecommendationServiceDep,
+    assign: bool = Query(
+        False, description="Assign each vehicle a distinct charging station"
+    ),
+) -> BulkRecommendationResponse:
+    """
+    Get charging station recommendations for many vehicles.
+
+    All vehicles are scored in a single pass with the same criteria as the
+    single-vehicle endpoint. By default each vehicle gets its own best
+    station; with ``assign`` a global assignment over the score spreads
+    concurrent vehicles across free nodes instead of sending them all to
+    the same one. Recommendations are returned in request order, with null
+    for vehicles without an available station.
+    """
+    try:
+        if assign:
+            recommendations = service.assign_recommendations(request.vehicles)
+        else:
+            recommendations = service.get_recommendations(request.vehicles)
+        return BulkRecommendationResponse(recommendations=recommendations)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate recommendations: {str(e)}",
+        )
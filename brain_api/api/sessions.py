@@ -1,14 +1,23 @@
+from datetime import date, datetime
 from typing import List
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 
+from ..core.config import settings
+from ..models import ChargingSessionDbo
+from ..repositories import ChargingSessionRepository
 from ..repositories.base import NotFoundError
 from ..schemas import (
     ChargingSessionEnd,
     ChargingSessionListResponse,
     ChargingSessionResponse,
     ChargingSessionStart,
+    EnergyReportResponse,
+    EnergyScope,
+    ExportFormat,
 )
+from ..services.export import encode_export, export_headers, stream_in_session
 from .dependencies import ChargingSessionServiceDep
 
 router = APIRouter(prefix="/sessions", tags=["Charging Sessions"])
@@ -43,6 +52,56 @@ def get_active_sessions(
     return service.get_active(node_id)
 
 
+@router.get(
+    "/energy",
+    response_model=EnergyReportResponse,
+    summary="Get energy report",
+)
+def get_energy_report(
+    service: ChargingSessionServiceDep,
+    scope: EnergyScope = EnergyScope.NODE,
+    entity_id: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+) -> EnergyReportResponse:
+    """Get daily energy, session count and average power per node or hub."""
+    return service.get_energy_report(
+        scope=scope, entity_id=entity_id, start=start, end=end
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export charging sessions",
+)
+def export_sessions(
+    format: ExportFormat = ExportFormat.NDJSON,
+    gzip: bool = False,
+    node_id: str | None = None,
+    vehicle_id: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> StreamingResponse:
+    """Stream all matching sessions as NDJSON or CSV, in constant memory."""
+    rows = stream_in_session(
+        lambda db: ChargingSessionRepository(db).stream_sessions(
+            node_id=node_id,
+            vehicle_id=vehicle_id,
+            start=start,
+            end=end,
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        )
+    )
+    columns = [c.name for c in ChargingSessionDbo.__table__.columns]
+    media_type, headers = export_headers("charging_sessions", format, gzip)
+    return StreamingResponse(
+        encode_export(rows, columns, format, gzip),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 @router.get(
     "/{session_id}",
     response_model=ChargingSessionResponse,
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -34,6 +36,36 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = 10
     DB_ECHO: bool = False  # SQL query logging
 
+    # Monthly partitions of dlm_events and charging_sessions
+    DB_PARTITION_MONTHS_AHEAD: int = 3  # future partitions created in advance
+    DB_PARTITION_MAINTENANCE_INTERVAL_H: float = 6.0
+    DLM_EVENTS_RETENTION_MONTHS: Optional[int] = None  # None = keep forever
+    CHARGING_SESSIONS_RETENTION_MONTHS: Optional[int] = None  # None = keep forever
+    DB_RETENTION_DROP: bool = True  # False only detaches expired partitions
+
+    # MQTT Data Collector (write-behind pipeline)
+    COLLECTOR_WORKERS: int = 4
+    COLLECTOR_QUEUE_SIZE: int = 10000  # per worker
+    COLLECTOR_BATCH_SIZE: int = 500
+    COLLECTOR_BATCH_INTERVAL_MS: int = 100
+    COLLECTOR_ENQUEUE_TIMEOUT: float = 1.0  # seconds before dropping a message
+    HUB_LAST_SEEN_FLUSH_INTERVAL: float = 10.0  # seconds between last_seen flushes
+    SESSION_METRICS_INFLUX_CROSSCHECK: bool = False  # compare local energy with Influx
+
+    # In-memory latest telemetry
+    TELEMETRY_MAX_AGE_S: int = 3600  # entries older than this are considered stale
+
+    # Recommendations
+    RECOMMENDATION_CANDIDATE_HUBS: int = 10  # nearest hubs scored per request
+    RECOMMENDATION_MAX_DISTANCE_KM: Optional[float] = None  # None = no limit
+    RECOMMENDATION_CACHE_SIZE: int = 1024
+    RECOMMENDATION_CACHE_TTL_S: float = 15.0
+    RECOMMENDATION_CACHE_CELL_DEG: float = 0.005  # ~500 m location cells
+    RECOMMENDATION_CACHE_BATTERY_BUCKET: int = 10  # battery level bucket (%)
+
+    # Streaming exports
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor round trip
+
     # MQTT Broker
     MQTT_BROKER_HOST: str = (
         "wpt-dlm-mqtt" if ENVIRONMENT == "production" else "localhost"
@@ -49,6 +81,18 @@ class Settings(BaseSettings):
     INFLUXDB_TOKEN: str = "change_me_in_production"
     INFLUXDB_ORG: str = "wpt-dlm"
     INFLUXDB_BUCKET: str = "telemetry"
+    INFLUXDB_ASYNC_POOL_SIZE: int = 20  # pooled HTTP connections (async client)
+    INFLUXDB_ROLLUPS_ENABLED: bool = True  # manage 1m/15m node power rollups
+    INFLUXDB_ROLLUP_1M_RETENTION_DAYS: int = 90  # 15m rollups are kept forever
+    INFLUXDB_ROLLUP_MIN_WINDOWS: int = 60  # windows a range needs to use a rollup
+
+    # Direct InfluxDB telemetry writes (alternative to the Telegraf inputs)
+    INFLUX_DIRECT_WRITE: bool = False
+    INFLUX_WRITE_BATCH_SIZE: int = 1000
+    INFLUX_WRITE_FLUSH_INTERVAL_MS: int = 1000
+    INFLUX_WRITE_BUFFER_LIMIT: int = 10000  # oldest records dropped beyond this
+    INFLUX_WRITE_MAX_RETRIES: int = 3
+    INFLUX_WRITE_RETRY_INTERVAL_MS: int = 1000  # doubled on each retry
 
     @computed_field
     @property
@@ -0,0 +1,144 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from ..schemas import RecommendationResponse
+from .config import settings
+from .registry_cache import registry_cache
+
+CacheKey = Tuple[int, int, int]
+CacheEntry = Tuple[float, int, RecommendationResponse]
+
+
+class RecommendationCache:
+    """
+    Bounded LRU + TTL cache of single-vehicle recommendations.
+
+    Requests are keyed by a quantized location cell and battery bucket, so
+    clients polling from (almost) the same position share one hub/node
+    choice. Requester-specific fields (distance, wait time) are recomputed
+    by the caller on every hit.
+    Entries are dropped when they expire, when the hub registry changes,
+    or when the recommended node becomes occupied.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 15.0,
+        cell_size_deg: float = 0.005,
+        battery_bucket: int = 10,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached recommendations
+            ttl: Time to live of an entry (seconds)
+            cell_size_deg: Location cell size in degrees (0.005 deg ~ 500 m)
+            battery_bucket: Battery level bucket size (%)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cell_size_deg = cell_size_deg
+        self.battery_bucket = battery_bucket
+
+        # key -> (expires_at, hub registry version, recommendation)
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._keys_by_node: Dict[str, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, latitude: float, longitude: float, battery_level: int) -> CacheKey:
+        """Quantize a request into its cache key."""
+        return (
+            math.floor(latitude / self.cell_size_deg),
+            math.floor(longitude / self.cell_size_deg),
+            battery_level // self.battery_bucket,
+        )
+
+    def get(self, key: CacheKey) -> Optional[RecommendationResponse]:
+        """
+        Get a cached recommendation.
+
+        Args:
+            key: Cache key from ``key()``
+
+        Returns:
+            The recommendation, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, version, recommendation = entry
+            expired = expires_at < time.monotonic()
+            if expired or version != registry_cache.hubs.version:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return recommendation
+
+    def put(self, key: CacheKey, recommendation: RecommendationResponse) -> None:
+        """
+        Cache a recommendation, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key from ``key()``
+            recommendation: Recommendation to cache
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (
+                time.monotonic() + self.ttl,
+                registry_cache.hubs.version,
+                recommendation,
+            )
+            self._keys_by_node.setdefault(recommendation.node_id, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_node(self, node_id: str) -> None:
+        """Drop every cached recommendation pointing to a node."""
+        with self._lock:
+            for key in self._keys_by_node.pop(node_id, ()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_node.clear()
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove an entry and its node back-reference (lock held)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        node_id = entry[2].node_id
+        keys = self._keys_by_node.get(node_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_node[node_id]
+
+
+recommendation_cache = RecommendationCache(
+    max_size=settings.RECOMMENDATION_CACHE_SIZE,
+    ttl=settings.RECOMMENDATION_CACHE_TTL_S,
+    cell_size_deg=settings.RECOMMENDATION_CACHE_CELL_DEG,
+    battery_bucket=settings.RECOMMENDATION_CACHE_BATTERY_BUCKET,
+)
@@ -0,0 +1,162 @@
+import logging
+import threading
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from ..models import HubDbo, NodeDbo
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_entity(entity: Any) -> SimpleNamespace:
+    """
+    Copy the column values of an ORM entity into a detached snapshot.
+
+    Must be called while the entity is loaded (i.e. before commit expires it).
+
+    Args:
+        entity: SQLAlchemy model instance
+
+    Returns:
+        Namespace with one attribute per mapped column
+    """
+    mapper = inspect(entity).mapper
+    return SimpleNamespace(
+        **{attr.key: getattr(entity, attr.key) for attr in mapper.column_attrs}
+    )
+
+
+class EntityCache:
+    """
+    Thread-safe in-memory map of primary key -> entity snapshot.
+
+    A cache only answers lookups once it is warm; until then (or after
+    invalidate_all) callers are expected to fall back to the database.
+
+    ``version`` is bumped on every change, so derived structures (e.g. the
+    hub spatial index) can tell when to rebuild.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._items: Dict[Any, SimpleNamespace] = {}
+        self._lock = threading.Lock()
+        self._warm = False
+        self._version = 0
+
+    @property
+    def is_warm(self) -> bool:
+        return self._warm
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def load(self, items: Dict[Any, SimpleNamespace]) -> None:
+        """Replace the cache content and mark it warm."""
+        with self._lock:
+            self._items = dict(items)
+            self._warm = True
+            self._version += 1
+
+    def get(self, pk: Any) -> Optional[SimpleNamespace]:
+        """Get the snapshot for a primary key, or None if unknown."""
+        with self._lock:
+            return self._items.get(pk)
+
+    def put(self, pk: Any, snapshot: SimpleNamespace) -> None:
+        """Insert or replace a snapshot (write-through after commit)."""
+        with self._lock:
+            self._items[pk] = snapshot
+            self._version += 1
+
+    def patch(self, changes: Dict[Any, Dict[str, Any]]) -> None:
+        """
+        Replace some column values of cached snapshots (write-through after
+        a bulk UPDATE). Primary keys that are not cached are ignored.
+        """
+        with self._lock:
+            patched = False
+            for pk, fields in changes.items():
+                snapshot = self._items.get(pk)
+                if snapshot is not None:
+                    self._items[pk] = SimpleNamespace(**{**vars(snapshot), **fields})
+                    patched = True
+            if patched:
+                self._version += 1
+
+    def invalidate(self, pk: Any) -> None:
+        """Remove a single entry."""
+        with self._lock:
+            if self._items.pop(pk, None) is not None:
+                self._version += 1
+
+    def invalidate_where(self, predicate: Callable[[SimpleNamespace], bool]) -> None:
+        """Remove every entry matching ``predicate``."""
+        with self._lock:
+            self._items = {
+                pk: snapshot
+                for pk, snapshot in self._items.items()
+                if not predicate(snapshot)
+            }
+            self._version += 1
+
+    def invalidate_all(self) -> None:
+        """Drop all entries and mark the cache cold."""
+        with self._lock:
+            self._items = {}
+            self._warm = False
+            self._version += 1
+
+    def values(self) -> List[SimpleNamespace]:
+        """Get all cached snapshots."""
+        with self._lock:
+            return list(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class RegistryCache:
+    """
+    Process-wide cache of the hub and node registry.
+
+    Warmed at startup and kept up to date write-through by HubService and
+    NodeService, so steady-state MQTT info/status messages can be checked
+    for changes without querying the database.
+    """
+
+    def __init__(self) -> None:
+        self.hubs = EntityCache("hubs")
+        self.nodes = EntityCache("nodes")
+
+    def warm(self, db: Session) -> None:
+        """
+        Load all hubs and nodes from the database.
+
+        Args:
+            db: Database session
+        """
+        hubs = db.query(HubDbo).all()
+        nodes = db.query(NodeDbo).all()
+
+        self.hubs.load({h.hub_id: snapshot_entity(h) for h in hubs})
+        self.nodes.load({n.node_id: snapshot_entity(n) for n in nodes})
+
+        logger.info(f"Registry cache warmed: {len(hubs)} hubs, {len(nodes)} nodes")
+
+    def ensure_warm(self, db: Session) -> None:
+        """Warm the cache if it has been invalidated."""
+        if not (self.hubs.is_warm and self.nodes.is_warm):
+            self.warm(db)
+
+    def invalidate_all(self) -> None:
+        """Drop all cached entries (e.g. after a rolled back transaction)."""
+        self.hubs.invalidate_all()
+        self.nodes.invalidate_all()
+
+
+registry_cache = RegistryCache()
@@ -0,0 +1,211 @@
+import math
+import threading
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .registry_cache import EntityCache, registry_cache
+
+EARTH_RADIUS_KM = 6371.0
+
+Cell = Tuple[int, int]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in kilometers."""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = math.radians(lon2 - lon1)
+
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+    )
+    return EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class HubSpatialIndex:
+    """
+    Uniform lat/lon grid over the coordinates of active hubs.
+
+    The index is built from the hub registry cache and rebuilt lazily
+    whenever the cache changes (hub created, moved, activated, ...), so
+    lookups never touch the database.
+
+    Nearest-neighbour queries scan rings of cells around the query point
+    and stop as soon as no unvisited cell can contain a closer hub.
+    """
+
+    def __init__(self, hubs: EntityCache, cell_size_deg: float = 0.1) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            hubs: Hub registry cache the index is built from
+            cell_size_deg: Grid cell size in degrees (0.1 deg ~ 11 km)
+        """
+        self.hubs = hubs
+        self.cell_size_deg = cell_size_deg
+
+        self._cells: Dict[Cell, List[SimpleNamespace]] = {}
+        self._bounds: Optional[Tuple[int, int, int, int]] = None
+        self._max_abs_lat = 0.0
+        self._version = -1
+        self._lock = threading.Lock()
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return (
+            math.floor(lat / self.cell_size_deg),
+            math.floor(lon / self.cell_size_deg),
+        )
+
+    def _ensure_current(self) -> None:
+        """Rebuild the grid if the hub cache changed since the last build."""
+        if self._version == self.hubs.version:
+            return
+
+        with self._lock:
+            version = self.hubs.version
+            if self._version == version:
+                return
+
+            cells: Dict[Cell, List[SimpleNamespace]] = defaultdict(list)
+            max_abs_lat = 0.0
+            for hub in self.hubs.values():
+                if not hub.is_active or hub.lat is None or hub.lon is None:
+                    continue
+                cells[self._cell(hub.lat, hub.lon)].append(hub)
+                max_abs_lat = max(max_abs_lat, abs(hub.lat))
+
+            if cells:
+                rows = [row for row, _ in cells]
+                cols = [col for _, col in cells]
+                self._bounds = (min(rows), max(rows), min(cols), max(cols))
+            else:
+                self._bounds = None
+
+            self._cells = dict(cells)
+            self._max_abs_lat = max_abs_lat
+            self._version = version
+
+    def _ring(self, center: Cell, radius: int) -> Iterator[Cell]:
+        """Cells at Chebyshev distance ``radius`` from ``center``."""
+        row, col = center
+        if radius == 0:
+            yield center
+            return
+        for dc in range(-radius, radius + 1):
+            yield (row - radius, col + dc)
+            yield (row + radius, col + dc)
+        for dr in range(-radius + 1, radius):
+            yield (row + dr, col - radius)
+            yield (row + dr, col + radius)
+
+    def _min_distance_km(self, cells_away: int, lat: float) -> float:
+        """Lower bound on the distance to a hub ``cells_away`` whole cells off."""
+        span = math.radians(cells_away * self.cell_size_deg)
+        max_lat = math.radians(min(90.0, max(self._max_abs_lat, abs(lat))))
+        lon_bound = 2 * math.asin(min(1.0, math.cos(max_lat) * math.sin(span / 2)))
+        return EARTH_RADIUS_KM * min(span, lon_bound)
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_distance_km: Optional[float] = None,
+    ) -> List[Tuple[float, SimpleNamespace]]:
+        """
+        Find the k active hubs closest to a location.
+
+        Args:
+            lat: Query latitude
+            lon: Query longitude
+            k: Maximum number of hubs to return
+            max_distance_km: Optional search radius in kilometers
+
+        Returns:
+            (distance_km, hub) pairs sorted by distance
+        """
+        self._ensure_current()
+        cells, bounds = self._cells, self._bounds
+        if not cells or k <= 0:
+            return []
+
+        center = self._cell(lat, lon)
+        min_row, max_row, min_col, max_col = bounds  # type: ignore[misc]
+        max_radius = max(
+            abs(center[0] - min_row),
+            abs(center[0] - max_row),
+            abs(center[1] - min_col),
+            abs(center[1] - max_col),
+        )
+
+        found: List[Tuple[float, SimpleNamespace]] = []
+        for radius in range(max_radius + 1):
+            # Hubs in this ring or beyond are at least radius - 1 cells away
+            bound = self._min_distance_km(max(radius - 1, 0), lat)
+            if max_distance_km is not None and bound > max_distance_km:
+                break
+            if len(found) >= k and found[k - 1][0] <= bound:
+                break
+
+            for cell in self._ring(center, radius):
+                for hub in cells.get(cell, ()):
+                    distance = haversine_km(lat, lon, hub.lat, hub.lon)
+                    if max_distance_km is None or distance <= max_distance_km:
+                        found.append((distance, hub))
+            found.sort(key=lambda item: item[0])
+
+        return found[:k]
+
+    def within_radius(
+        self, lat: float, lon: float, radius_km: float
+    ) -> List[Tuple[float, SimpleNamespace]]:
+        """
+        Find all active hubs within a radius of a location.
+
+        Args:
+            lat: Query latitude
+            lon: Query longitude
+            radius_km: Search radius in kilometers
+
+        Returns:
+            (distance_km, hub) pairs sorted by distance
+        """
+        self._ensure_current()
+        cells = self._cells
+
+        lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+        cos_lat = math.cos(math.radians(min(89.9, abs(lat) + lat_delta)))
+        lon_delta = min(180.0, lat_delta / max(cos_lat, 1e-6))
+
+        min_row, min_col = self._cell(lat - lat_delta, lon - lon_delta)
+        max_row, max_col = self._cell(lat + lat_delta, lon + lon_delta)
+
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > len(cells):
+            candidates = [
+                hub
+                for (row, col), hubs in cells.items()
+                if min_row <= row <= max_row and min_col <= col <= max_col
+                for hub in hubs
+            ]
+        else:
+            candidates = [
+                hub
+                for row in range(min_row, max_row + 1)
+                for col in range(min_col, max_col + 1)
+                for hub in cells.get((row, col), ())
+            ]
+
+        found = [
+            (distance, hub)
+            for hub in candidates
+            if (distance := haversine_km(lat, lon, hub.lat, hub.lon)) <= radius_km
+        ]
+        found.sort(key=lambda item: item[0])
+        return found
+
+
+hub_index = HubSpatialIndex(registry_cache.hubs)
@@ -0,0 +1,170 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from shared.mqtt_dtos import NodeTelemetry, VehicleTelemetry
+
+from .config import settings
+
+
+class NodeTelemetrySnapshot:
+    """Latest telemetry values of a node."""
+
+    __slots__ = (
+        "power_kw",
+        "power_limit_kw",
+        "is_occupied",
+        "connected_vehicle_id",
+        "current_vehicle_soc",
+        "timestamp",
+        "received_at",
+    )
+
+    def __init__(self, telemetry: NodeTelemetry, received_at: float) -> None:
+        self.power_kw = telemetry.power_kw
+        self.power_limit_kw = telemetry.power_limit_kw
+        self.is_occupied = telemetry.is_occupied
+        self.connected_vehicle_id = telemetry.connected_vehicle_id
+        self.current_vehicle_soc = telemetry.current_vehicle_soc
+        self.timestamp = telemetry.timestamp
+        self.received_at = received_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Field values, keyed like the InfluxDB node_telemetry fields."""
+        return {name: getattr(self, name) for name in self.__slots__[:-1]}
+
+
+class VehicleTelemetrySnapshot:
+    """Latest telemetry values of a vehicle."""
+
+    __slots__ = (
+        "battery_level",
+        "latitude",
+        "longitude",
+        "speed_kmh",
+        "is_charging",
+        "timestamp",
+        "received_at",
+    )
+
+    def __init__(self, telemetry: VehicleTelemetry, received_at: float) -> None:
+        self.battery_level = telemetry.battery_level
+        self.latitude = telemetry.geo_location.latitude
+        self.longitude = telemetry.geo_location.longitude
+        self.speed_kmh = telemetry.speed_kmh
+        self.is_charging = telemetry.is_charging
+        self.timestamp = telemetry.timestamp
+        self.received_at = received_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Field values, keyed like the InfluxDB vehicle_telemetry fields."""
+        return {name: getattr(self, name) for name in self.__slots__[:-1]}
+
+
+class TelemetryStore:
+    """
+    In-memory table of the latest node and vehicle telemetry.
+
+    Fed from the MQTT telemetry topics, so the API can answer "current
+    state" questions without an InfluxDB round trip. Entries older than
+    ``max_age`` seconds are treated as missing, mirroring the
+    ``range(start: -1h) |> last()`` queries it replaces.
+
+    Until the store has been fed for ``max_age`` seconds it may miss
+    entries InfluxDB still has (see ``covers_window``).
+    """
+
+    def __init__(self, max_age: float = 3600.0) -> None:
+        self.max_age = max_age
+
+        self._nodes: Dict[str, NodeTelemetrySnapshot] = {}
+        self._vehicles: Dict[str, VehicleTelemetrySnapshot] = {}
+        self._lock = threading.Lock()
+        self._started_at: Optional[float] = None
+
+    def start(self) -> None:
+        """Mark the moment the store starts receiving telemetry."""
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+
+    @property
+    def covers_window(self) -> bool:
+        """Whether the store has been fed for at least ``max_age`` seconds."""
+        return (
+            self._started_at is not None
+            and time.monotonic() - self._started_at >= self.max_age
+        )
+
+    def update_node(self, node_id: str, telemetry: NodeTelemetry) -> None:
+        """Store the latest telemetry of a node."""
+        snapshot = NodeTelemetrySnapshot(telemetry, time.monotonic())
+        with self._lock:
+            self._nodes[node_id] = snapshot
+
+    def update_vehicle(self, vehicle_id: str, telemetry: VehicleTelemetry) -> None:
+        """Store the latest telemetry of a vehicle."""
+        snapshot = VehicleTelemetrySnapshot(telemetry, time.monotonic())
+        with self._lock:
+            self._vehicles[vehicle_id] = snapshot
+
+    def _is_fresh(self, received_at: float, now: float) -> bool:
+        return now - received_at <= self.max_age
+
+    def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest telemetry of a node.
+
+        Args:
+            node_id: Node identifier
+
+        Returns:
+            Telemetry fields or None if unknown or stale
+        """
+        with self._lock:
+            snapshot = self._nodes.get(node_id)
+        if snapshot is None or not self._is_fresh(
+            snapshot.received_at, time.monotonic()
+        ):
+            return None
+        return snapshot.to_dict()
+
+    def get_nodes(self, node_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the latest telemetry of several nodes.
+
+        Args:
+            node_ids: Node identifiers
+
+        Returns:
+            Dictionary mapping node_id to telemetry fields (unknown or stale
+            nodes are omitted)
+        """
+        now = time.monotonic()
+        with self._lock:
+            snapshots = [(nid, self._nodes.get(nid)) for nid in node_ids]
+        return {
+            nid: snapshot.to_dict()
+            for nid, snapshot in snapshots
+            if snapshot is not None and self._is_fresh(snapshot.received_at, now)
+        }
+
+    def get_vehicle(self, vehicle_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest telemetry of a vehicle.
+
+        Args:
+            vehicle_id: Vehicle identifier
+
+        Returns:
+            Telemetry fields or None if unknown or stale
+        """
+        with self._lock:
+            snapshot = self._vehicles.get(vehicle_id)
+        if snapshot is None or not self._is_fresh(
+            snapshot.received_at, time.monotonic()
+        ):
+            return None
+        return snapshot.to_dict()
+
+
+telemetry_store = TelemetryStore(max_age=settings.TELEMETRY_MAX_AGE_S)
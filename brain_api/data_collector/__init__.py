@@ -1,3 +1,4 @@
+from .influx_writer import InfluxTelemetryWriter
 from .mqtt_data_collector import MQTTDataCollector
 
-__all__ = ["MQTTDataCollector"]
+__all__ = ["InfluxTelemetryWriter", "MQTTDataCollector"]
@@ -0,0 +1,161 @@
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Dict, Optional
+
+
+@dataclass(slots=True)
+class _SessionAccumulator:
+    """Running energy and mean power of one charging session."""
+
+    session_id: Optional[int] = None
+    energy_kwh: float = 0.0
+    power_sum_kw: float = 0.0
+    samples: int = 0
+    last_power_kw: Optional[float] = None
+    last_timestamp: Optional[datetime] = None
+
+
+class SessionEnergyIntegrator:
+    """
+    Streaming per-node energy integration of charging sessions.
+
+    Node telemetry samples are integrated with the trapezoidal rule as they
+    arrive, and the mean power is kept as a running sum, so session metrics
+    are available in O(1) when the session ends. This matches the
+    ``integral(unit: 1h)`` and ``mean()`` Flux queries over the same samples.
+
+    Integration is opened and closed from the node status messages as they
+    arrive (``open`` / ``close``), independently of how long the database
+    takes to create and end the session, which is bound later with
+    ``start`` and read back with ``end``. Sessions are bound in the order
+    the node opened them, oldest first.
+
+    Sessions started before the process (e.g. before a restart) are never
+    bound; callers should fall back to InfluxDB for those.
+    """
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, _SessionAccumulator] = {}
+        self._closed: Dict[str, Deque[_SessionAccumulator]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def open(self, node_id: str) -> None:
+        """
+        Start integrating the samples of a node that began charging.
+
+        Does nothing if the node is already being integrated.
+
+        Args:
+            node_id: Node identifier
+        """
+        with self._lock:
+            self._sessions.setdefault(node_id, _SessionAccumulator())
+
+    def close(self, node_id: str) -> None:
+        """
+        Stop integrating a node that stopped charging.
+
+        The accumulated metrics are kept until the session is ended; a node
+        may have several closed sessions waiting to be ended.
+
+        Args:
+            node_id: Node identifier
+        """
+        with self._lock:
+            acc = self._sessions.pop(node_id, None)
+            if acc is not None:
+                self._closed[node_id].append(acc)
+
+    def start(self, node_id: str, session_id: int) -> None:
+        """
+        Bind the charging session created for a node to its integration.
+
+        The oldest integration not yet bound is used. If there is none and
+        the node is being integrated for another session, the session is
+        left unbound (``end`` returns None for it).
+
+        Args:
+            node_id: Node identifier
+            session_id: Charging session identifier
+        """
+        with self._lock:
+            # The node may already have stopped (and restarted) charging, so
+            # the oldest unbound integration belongs to this session
+            candidates = [*self._closed.get(node_id, ()), self._sessions.get(node_id)]
+            for acc in candidates:
+                if acc is not None and acc.session_id is None:
+                    break
+            else:
+                if node_id in self._sessions:
+                    return
+                acc = self._sessions[node_id] = _SessionAccumulator()
+            acc.session_id = session_id
+
+    def add_sample(self, node_id: str, power_kw: float, timestamp: datetime) -> None:
+        """
+        Add a power sample for a node.
+
+        Samples for nodes that are not charging, and samples that are not
+        newer than the previous one, are ignored.
+
+        Args:
+            node_id: Node identifier
+            power_kw: Measured power (kW)
+            timestamp: Sample timestamp
+        """
+        with self._lock:
+            acc = self._sessions.get(node_id)
+            if acc is None:
+                return
+
+            if acc.last_timestamp is not None:
+                elapsed_h = (timestamp - acc.last_timestamp).total_seconds() / 3600
+                if elapsed_h <= 0:
+                    return
+                acc.energy_kwh += (acc.last_power_kw + power_kw) / 2 * elapsed_h
+
+            acc.power_sum_kw += power_kw
+            acc.samples += 1
+            acc.last_power_kw = power_kw
+            acc.last_timestamp = timestamp
+
+    def _pop(self, node_id: str, session_id: int) -> Optional[_SessionAccumulator]:
+        """Remove and return the integration bound to a session (lock held)."""
+        closed = self._closed.get(node_id)
+        if closed:
+            for index, acc in enumerate(closed):
+                if acc.session_id == session_id:
+                    del closed[index]
+                    if not closed:
+                        del self._closed[node_id]
+                    return acc
+
+        acc = self._sessions.get(node_id)
+        if acc is not None and acc.session_id == session_id:
+            return self._sessions.pop(node_id)
+        return None
+
+    def end(self, node_id: str, session_id: int) -> Optional[dict[str, float]]:
+        """
+        Stop integrating a session and return its metrics.
+
+        Args:
+            node_id: Node identifier
+            session_id: Charging session identifier
+
+        Returns:
+            Dictionary with total_energy_kwh and avg_power_kw, or None if the
+            session was not tracked by this integrator
+        """
+        with self._lock:
+            acc = self._pop(node_id, session_id)
+            if acc is None:
+                return None
+
+        avg_power_kw = acc.power_sum_kw / acc.samples if acc.samples else 0.0
+        return {
+            "total_energy_kwh": round(acc.energy_kwh, 3),
+            "avg_power_kw": round(avg_power_kw, 3),
+        }
@@ -0,0 +1,107 @@
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from ..core.registry_cache import registry_cache
+from ..repositories import HubRepository
+
+
+class HeartbeatTracker:
+    """
+    Coalesces hub last_seen updates in memory.
+
+    Status messages only record the latest timestamp per hub; a background
+    thread periodically writes all pending timestamps with a single
+    multi-row UPDATE and refreshes the cached hubs.
+    """
+
+    def __init__(self, session_factory: sessionmaker, flush_interval: float = 10.0):
+        """
+        Initialize heartbeat tracker.
+
+        Args:
+            session_factory: Factory for the session used to flush
+            flush_interval: Interval between flushes (seconds)
+        """
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+
+        self.logger = logging.getLogger("HeartbeatTracker")
+
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+
+        self._flush_thread: Optional[threading.Thread] = None
+        self._stop_flush = threading.Event()
+
+    def touch(self, hub_id: str, seen_at: Optional[datetime] = None) -> None:
+        """
+        Record that a hub has been seen.
+
+        Args:
+            hub_id: Hub identifier
+            seen_at: Time the hub was seen (defaults to now)
+        """
+        seen_at = seen_at or datetime.now(timezone.utc)
+        with self._lock:
+            previous = self._pending.get(hub_id)
+            if previous is None or seen_at > previous:
+                self._pending[hub_id] = seen_at
+
+    def flush(self) -> int:
+        """
+        Write all pending last_seen timestamps in one statement.
+
+        The UPDATE bypasses the ORM, so the cached hub snapshots are patched
+        once it is committed.
+
+        Returns:
+            Number of hubs updated
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        try:
+            with self.session_factory() as db:
+                updated = HubRepository(db).bulk_update_last_seen(pending)
+                db.commit()
+        except Exception as e:
+            self.logger.error(f"Error flushing hub heartbeats: {e}")
+            with self._lock:
+                for hub_id, seen_at in pending.items():
+                    if hub_id not in self._pending or seen_at > self._pending[hub_id]:
+                        self._pending[hub_id] = seen_at
+            return 0
+
+        registry_cache.hubs.patch(
+            {hub_id: {"last_seen": seen_at} for hub_id, seen_at in pending.items()}
+        )
+        self.logger.debug(f"Flushed last_seen for {updated} hubs")
+        return updated
+
+    def _flush_loop(self) -> None:
+        """Background thread for periodic flushes."""
+        while not self._stop_flush.wait(self.flush_interval):
+            self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush thread."""
+        if self._flush_thread is None or not self._flush_thread.is_alive():
+            self._stop_flush.clear()
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop, daemon=True, name="HeartbeatFlush"
+            )
+            self._flush_thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread and write any pending timestamps."""
+        if self._flush_thread and self._flush_thread.is_alive():
+            self._stop_flush.set()
+            self._flush_thread.join(timeout=5)
+        self.flush()
@@ -0,0 +1,299 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from influxdb_client import InfluxDBClient, WritePrecision
+from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client.rest import ApiException
+
+from shared.mqtt_dtos import NodeTelemetry, VehicleTelemetry
+
+from ..core.config import settings
+
+# Field names and types mirror what the Telegraf mqtt_consumer inputs write
+# (numbers as floats, nested objects flattened with "_"), so both ingestion
+# paths produce the same series and the dashboards keep working.
+
+
+def _escape_tag(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(",", "\\,")
+        .replace("=", "\\=")
+        .replace(" ", "\\ ")
+    )
+
+
+def _format_field(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(float(value))
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _format_fields(fields: Dict[str, Any]) -> str:
+    return ",".join(
+        f"{name}={_format_field(value)}"
+        for name, value in fields.items()
+        if value is not None
+    )
+
+
+def _timestamp_ms(timestamp: datetime) -> int:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return int(timestamp.timestamp() * 1000)
+
+
+def node_telemetry_line(hub_id: str, node_id: str, telemetry: NodeTelemetry) -> str:
+    """
+    Convert node telemetry to an InfluxDB line protocol record.
+
+    Args:
+        hub_id: Hub identifier (tag)
+        node_id: Node identifier (tag)
+        telemetry: Parsed node telemetry
+
+    Returns:
+        ``node_telemetry`` record with millisecond timestamp
+    """
+    fields = _format_fields(
+        {
+            "voltage": telemetry.voltage,
+            "current": telemetry.current,
+            "power_kw": telemetry.power_kw,
+            "power_limit_kw": telemetry.power_limit_kw,
+            "is_occupied": telemetry.is_occupied,
+            "connected_vehicle_id": telemetry.connected_vehicle_id,
+            "current_vehicle_soc": telemetry.current_vehicle_soc,
+        }
+    )
+    return (
+        f"node_telemetry,hub_id={_escape_tag(hub_id)},node_id={_escape_tag(node_id)} "
+        f"{fields} {_timestamp_ms(telemetry.timestamp)}"
+    )
+
+
+def vehicle_telemetry_line(vehicle_id: str, telemetry: VehicleTelemetry) -> str:
+    """
+    Convert vehicle telemetry to an InfluxDB line protocol record.
+
+    Args:
+        vehicle_id: Vehicle identifier (tag)
+        telemetry: Parsed vehicle telemetry
+
+    Returns:
+        ``vehicle_telemetry`` record with millisecond timestamp
+    """
+    fields = _format_fields(
+        {
+            "battery_level": telemetry.battery_level,
+            "engine_temp_c": telemetry.engine_temp_c,
+            "geo_location_altitude": telemetry.geo_location.altitude,
+            "geo_location_latitude": telemetry.geo_location.latitude,
+            "geo_location_longitude": telemetry.geo_location.longitude,
+            "is_charging": telemetry.is_charging,
+            "speed_kmh": telemetry.speed_kmh,
+        }
+    )
+    return (
+        f"vehicle_telemetry,vehicle_id={_escape_tag(vehicle_id)} "
+        f"{fields} {_timestamp_ms(telemetry.timestamp)}"
+    )
+
+
+class InfluxTelemetryWriter:
+    """
+    Batched line protocol writer for node and vehicle telemetry.
+
+    In-process alternative to the Telegraf telemetry inputs: telemetry
+    already parsed by the API is converted to line protocol and buffered.
+    A background thread writes the buffer every ``flush_interval`` seconds,
+    or as soon as ``batch_size`` records are pending.
+
+    Failed batches are retried with exponential backoff and then put back
+    in the buffer. When the buffer exceeds ``buffer_limit`` records the
+    oldest ones are dropped.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        buffer_limit: int = 10000,
+        max_retries: int = 3,
+        retry_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            batch_size: Maximum records per write request
+            flush_interval: Maximum time a record waits in the buffer (seconds)
+            buffer_limit: Maximum buffered records
+            max_retries: Retries of a failed write before re-buffering it
+            retry_interval: Delay before the first retry, doubled on each
+                subsequent one (seconds)
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer_limit = buffer_limit
+        self.max_retries = max_retries
+        self.retry_interval = retry_interval
+
+        self.client = InfluxDBClient(
+            url=settings.INFLUXDB_URL,
+            token=settings.INFLUXDB_TOKEN,
+            org=settings.INFLUXDB_ORG,
+        )
+        self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
+        self.bucket = settings.INFLUXDB_BUCKET
+
+        self.logger = logging.getLogger("InfluxTelemetryWriter")
+
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._metrics = {
+            "written": 0,
+            "dropped": 0,
+            "retries": 0,
+            "failed_writes": 0,
+        }
+
+        self._flush_thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stop_flush = threading.Event()
+
+    def write_node(self, hub_id: str, node_id: str, telemetry: NodeTelemetry) -> None:
+        """Buffer a node telemetry sample."""
+        self._append(node_telemetry_line(hub_id, node_id, telemetry))
+
+    def write_vehicle(self, vehicle_id: str, telemetry: VehicleTelemetry) -> None:
+        """Buffer a vehicle telemetry sample."""
+        self._append(vehicle_telemetry_line(vehicle_id, telemetry))
+
+    def _append(self, line: str) -> None:
+        with self._lock:
+            self._buffer.append(line)
+            overflow = len(self._buffer) - self.buffer_limit
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self._metrics["dropped"] += overflow
+            full = len(self._buffer) >= self.batch_size
+
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write all buffered records in batches of ``batch_size``.
+
+        Returns:
+            Number of records written
+        """
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+
+        written = 0
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start : start + self.batch_size]
+            if self._write_batch(batch):
+                written += len(batch)
+            else:
+                self._requeue(pending[start:])
+                break
+
+        return written
+
+    def _write_batch(self, batch: List[str]) -> bool:
+        """
+        Write one batch, retrying transient failures.
+
+        Returns:
+            False if the batch should be kept for a later flush
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                with self._lock:
+                    self._metrics["retries"] += 1
+                time.sleep(self.retry_interval * 2 ** (attempt - 1))
+
+            try:
+                self.write_api.write(
+                    bucket=self.bucket,
+                    org=settings.INFLUXDB_ORG,
+                    record=batch,
+                    write_precision=WritePrecision.MS,
+                )
+                with self._lock:
+                    self._metrics["written"] += len(batch)
+                return True
+            except ApiException as e:
+                if e.status and 400 <= e.status < 500 and e.status != 429:
+                    # Rejected data will never succeed
+                    self.logger.error(
+                        f"InfluxDB rejected {len(batch)} records: {e.status} {e.reason}"
+                    )
+                    with self._lock:
+                        self._metrics["dropped"] += len(batch)
+                        self._metrics["failed_writes"] += 1
+                    return True
+                self.logger.warning(f"InfluxDB write failed ({e.status}): {e.reason}")
+            except Exception as e:
+                self.logger.warning(f"InfluxDB write failed: {e}")
+
+        with self._lock:
+            self._metrics["failed_writes"] += 1
+        self.logger.error(
+            f"Giving up writing {len(batch)} records after {self.max_retries} retries"
+        )
+        return False
+
+    def _requeue(self, records: List[str]) -> None:
+        """Put unwritten records back in front of the buffer."""
+        with self._lock:
+            self._buffer[:0] = records
+            overflow = len(self._buffer) - self.buffer_limit
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self._metrics["dropped"] += overflow
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get write counters and the current buffer size."""
+        with self._lock:
+            return {**self._metrics, "buffered": len(self._buffer)}
+
+    def _flush_loop(self) -> None:
+        """Background thread for size- and time-triggered flushes."""
+        while not self._stop_flush.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self) -> None:
+        """Start the flush thread."""
+        if self._flush_thread is None or not self._flush_thread.is_alive():
+            self._stop_flush.clear()
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop, daemon=True, name="InfluxTelemetryWriter"
+            )
+            self._flush_thread.start()
+
+        self.logger.info(
+            f"Direct InfluxDB telemetry writes enabled "
+            f"(batch: {self.batch_size} records / {self.flush_interval * 1000:.0f} ms)"
+        )
+
+    def stop(self) -> None:
+        """Stop the flush thread, write the remaining records and close."""
+        if self._flush_thread and self._flush_thread.is_alive():
+            self._stop_flush.set()
+            self._wake.set()
+            self._flush_thread.join(timeout=10)
+        self.flush()
+        self.client.close()
+        self.logger.info(f"InfluxDB telemetry writer stopped: {self.get_metrics()}")
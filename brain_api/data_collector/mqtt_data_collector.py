@@ -1,20 +1,26 @@
 import json
 import logging
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
 from brain_api.schemas.dtos.node import NodeUpdate
 from shared.mqtt_dtos import (
     ChargingState,
     ConnectionState,
     DLMNotification,
+    DLMNotificationBatch,
     HubInfo,
     HubStatus,
     NodeInfo,
     NodeStatus,
+    NodeTelemetry,
 )
 
+from ..core.config import settings
+from ..core.recommendation_cache import recommendation_cache
+from ..core.registry_cache import registry_cache
+from ..core.telemetry_store import telemetry_store
 from ..schemas import (
     ChargingSessionEnd,
     ChargingSessionStart,
@@ -25,220 +31,384 @@ from ..schemas import (
 )
 from ..services import ChargingSessionService, DLMService, HubService, NodeService
 from ..services.influxdb_service import InfluxDBService
+from .energy_integrator import SessionEnergyIntegrator
+from .heartbeat_tracker import HeartbeatTracker
+from .influx_writer import InfluxTelemetryWriter
+from .write_behind import WriteBehindPipeline
 
 if TYPE_CHECKING:
     from shared.services.mqtt_service import MQTTService
 
 
+class CollectorContext:
+    """Services bound to the database session of one write-behind batch."""
+
+    def __init__(self, db: Session) -> None:
+        registry_cache.ensure_warm(db)
+
+        self.db = db
+        self.session_service = ChargingSessionService(db)
+        self.dlm_service = DLMService(db)
+        self.hub_service = HubService(db)
+        self.node_service = NodeService(db)
+
+
 class MQTTDataCollector:
     """
     Collects data from MQTT topics and persists to database.
 
+    Node telemetry is handled in memory on the MQTT thread; the other
+    callbacks only enqueue their database work, which runs on the
+    write-behind pipeline workers in batched transactions. Handlers let
+    errors propagate so the pipeline rolls back the message and counts it
+    as failed.
+
     Subscribes to:
     - iot/hubs/+/nodes/+/status
+    - iot/hubs/+/nodes/+/telemetry
     - iot/hubs/+/dlm/events
+    - iot/hubs/+/dlm/events/batch
     """
 
-    def __init__(self, mqtt_service: "MQTTService", db: Session) -> None:
+    def __init__(
+        self,
+        mqtt_service: "MQTTService",
+        session_factory: sessionmaker,
+        telemetry_writer: Optional[InfluxTelemetryWriter] = None,
+    ) -> None:
         """
         Initialize MQTT Data Collector.
 
         Args:
             mqtt_service: MQTT service instance
-            db: Database session
+            session_factory: Factory for the database sessions used by workers
+            telemetry_writer: Optional writer forwarding node telemetry to
+                InfluxDB (when Telegraf does not ingest it)
         """
         self.mqtt_service = mqtt_service
-        self.db = db
+        self.telemetry_writer = telemetry_writer
 
-        self.session_service = ChargingSessionService(db)
-        self.dlm_service = DLMService(db)
-        self.hub_service = HubService(db)
-        self.node_service = NodeService(db)
         self.influx_service = InfluxDBService()
+        self.energy_integrator = SessionEnergyIntegrator()
+        self.heartbeats = HeartbeatTracker(
+            session_factory, flush_interval=settings.HUB_LAST_SEEN_FLUSH_INTERVAL
+        )
+        self.pipeline = WriteBehindPipeline(
+            session_factory=session_factory,
+            context_factory=CollectorContext,
+            on_rollback=registry_cache.invalidate_all,
+            num_workers=settings.COLLECTOR_WORKERS,
+            max_queue_size=settings.COLLECTOR_QUEUE_SIZE,
+            batch_size=settings.COLLECTOR_BATCH_SIZE,
+            batch_interval=settings.COLLECTOR_BATCH_INTERVAL_MS / 1000,
+            enqueue_timeout=settings.COLLECTOR_ENQUEUE_TIMEOUT,
+        )
 
         self.logger = logging.getLogger("MQTTDataCollector")
 
     def subscribe(self) -> None:
         """Start subscribing to MQTT topics."""
         self.logger.info("Starting MQTT Data Collector...")
-        self.mqtt_service.subscribe("iot/hubs/+/info", self._on_hub_info, qos=1)
-        self.mqtt_service.subscribe("iot/hubs/+/status", self._on_hub_status, qos=1)
+        self.pipeline.start()
+        self.heartbeats.start()
+
+        self.mqtt_service.subscribe(
+            "iot/hubs/+/info", self._enqueue(self._on_hub_info), qos=1
+        )
+        self.mqtt_service.subscribe(
+            "iot/hubs/+/status", self._enqueue(self._on_hub_status), qos=1
+        )
         self.mqtt_service.subscribe(
-            "iot/hubs/+/nodes/+/info", self._on_node_info, qos=1
+            "iot/hubs/+/nodes/+/info", self._enqueue(self._on_node_info), qos=1
         )
         self.mqtt_service.subscribe(
-            "iot/hubs/+/nodes/+/status", self._on_node_status, qos=1
+            "iot/hubs/+/nodes/+/status", self._on_node_status_message, qos=1
+        )
+        self.mqtt_service.subscribe(
+            "iot/hubs/+/nodes/+/telemetry", self._on_node_telemetry_message, qos=0
+        )
+        self.mqtt_service.subscribe(
+            "iot/hubs/+/dlm/events", self._enqueue(self._on_dlm_event), qos=1
+        )
+        self.mqtt_service.subscribe(
+            "iot/hubs/+/dlm/events/batch",
+            self._enqueue(self._on_dlm_event_batch),
+            qos=1,
         )
-        self.mqtt_service.subscribe("iot/hubs/+/dlm/events", self._on_dlm_event, qos=1)
 
         self.logger.info("MQTT Data Collector started successfully")
 
-    def _on_hub_info(self, msg) -> None:
+    def _enqueue(
+        self, handler: Callable[[CollectorContext, Any], None]
+    ) -> Callable[[Any], None]:
         """
-        Handle hub info messages and create/update hub in database.
+        Wrap a handler so the MQTT callback only enqueues the message.
 
-        Topic: iot/hubs/+/info
+        Messages are partitioned by hub id to keep per-hub ordering.
         """
-        try:
-            topic_parts = msg.topic.split("/")
-            if len(topic_parts) != 4:
-                self.logger.warning(f"Invalid hub info topic: {msg.topic}")
-                return
 
-            hub_id = topic_parts[2]
-            payload = json.loads(msg.payload.decode())
+        def on_message(msg) -> None:
+            self.pipeline.submit(msg.topic.split("/")[2], handler, msg)
 
-            hub_info = HubInfo(**payload)
+        return on_message
 
-            existing_hub = self.hub_service.repo.get(hub_id)
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get write-behind throughput and backpressure metrics."""
+        return self.pipeline.get_metrics()
 
-            if existing_hub:
-                update_data = HubUpdate(
-                    lat=hub_info.location.latitude,
-                    lon=hub_info.location.longitude,
-                    alt=hub_info.location.altitude,
-                    max_grid_capacity_kw=hub_info.max_grid_capacity_kw,
-                    ip_address=hub_info.ip_address,
-                    firmware_version=hub_info.firmware_version,
-                )
-                _, updated = self.hub_service.update_if_changed(hub_id, update_data)
-                if updated:
-                    self.logger.info(f"Updated hub {hub_id} info")
-                else:
-                    self.logger.debug(f"No changes for hub {hub_id} info")
-            else:
-                create_data = HubCreate(
-                    hub_id=hub_id,
-                    lat=hub_info.location.latitude,
-                    lon=hub_info.location.longitude,
-                    alt=hub_info.location.altitude,
-                    max_grid_capacity_kw=hub_info.max_grid_capacity_kw,
-                    ip_address=hub_info.ip_address,
-                    firmware_version=hub_info.firmware_version,
-                    is_active=True,
-                )
-                self.hub_service.create(create_data)
-                self.logger.info(f"Created new hub {hub_id}")
+    def _on_hub_info(self, ctx: CollectorContext, msg) -> None:
+        """
+        Handle hub info messages and create/update hub in database.
 
-        except Exception as e:
-            self.logger.error(f"Error processing hub info message: {e}", exc_info=True)
+        Topic: iot/hubs/+/info
+        """
+        topic_parts = msg.topic.split("/")
+        if len(topic_parts) != 4:
+            self.logger.warning(f"Invalid hub info topic: {msg.topic}")
+            return
+
+        hub_id = topic_parts[2]
+        payload = json.loads(msg.payload.decode())
+
+        hub_info = HubInfo(**payload)
+
+        existing_hub = ctx.hub_service.find(hub_id)
+
+        if existing_hub:
+            update_data = HubUpdate(
+                lat=hub_info.location.latitude,
+                lon=hub_info.location.longitude,
+                alt=hub_info.location.altitude,
+                max_grid_capacity_kw=hub_info.max_grid_capacity_kw,
+                ip_address=hub_info.ip_address,
+                firmware_version=hub_info.firmware_version,
+            )
+            _, updated = ctx.hub_service.update_if_changed(hub_id, update_data)
+            if updated:
+                self.logger.info(f"Updated hub {hub_id} info")
+            else:
+                self.logger.debug(f"No changes for hub {hub_id} info")
+        else:
+            create_data = HubCreate(
+                hub_id=hub_id,
+                lat=hub_info.location.latitude,
+                lon=hub_info.location.longitude,
+                alt=hub_info.location.altitude,
+                max_grid_capacity_kw=hub_info.max_grid_capacity_kw,
+                ip_address=hub_info.ip_address,
+                firmware_version=hub_info.firmware_version,
+                is_active=True,
+            )
+            ctx.hub_service.create(create_data)
+            self.logger.info(f"Created new hub {hub_id}")
 
-    def _on_hub_status(self, msg) -> None:
+    def _on_hub_status(self, ctx: CollectorContext, msg) -> None:
         """
         Handle hub status messages and update hub status in database.
 
         Topic: iot/hubs/+/status
         """
-        try:
-            topic_parts = msg.topic.split("/")
-            if len(topic_parts) != 4:
-                self.logger.warning(f"Invalid hub status topic: {msg.topic}")
-                return
+        topic_parts = msg.topic.split("/")
+        if len(topic_parts) != 4:
+            self.logger.warning(f"Invalid hub status topic: {msg.topic}")
+            return
 
-            hub_id = topic_parts[2]
-            payload = json.loads(msg.payload.decode())
+        hub_id = topic_parts[2]
+        payload = json.loads(msg.payload.decode())
 
-            hub_status = HubStatus(**payload)
+        hub_status = HubStatus(**payload)
 
-            self.hub_service.repo.update_last_seen(hub_id)
+        self.heartbeats.touch(hub_id)
 
-            if hub_status.state == ConnectionState.ONLINE:
-                self.hub_service.activate(hub_id)
-            elif hub_status.state == ConnectionState.OFFLINE:
-                self.hub_service.deactivate(hub_id)
+        hub = ctx.hub_service.find(hub_id)
+        if hub is None:
+            self.logger.warning(f"Status received for unknown hub {hub_id}")
+            return
 
-            self.logger.debug(f"Updated hub {hub_id} status: {hub_status.state.value}")
+        if hub_status.state == ConnectionState.ONLINE and not hub.is_active:
+            ctx.hub_service.activate(hub_id)
+        elif hub_status.state == ConnectionState.OFFLINE and hub.is_active:
+            ctx.hub_service.deactivate(hub_id)
 
-        except Exception as e:
-            self.logger.error(
-                f"Error processing hub status message: {e}", exc_info=True
-            )
+        self.logger.debug(f"Updated hub {hub_id} status: {hub_status.state.value}")
 
-    def _on_node_info(self, msg) -> None:
+    def _on_node_info(self, ctx: CollectorContext, msg) -> None:
         """
         Handle node info messages and create/update node in database.
 
         Topic: iot/hubs/+/nodes/+/info
         """
+        topic_parts = msg.topic.split("/")
+        if len(topic_parts) != 6:
+            self.logger.warning(f"Invalid node info topic: {msg.topic}")
+            return
+
+        hub_id = topic_parts[2]
+        node_id = topic_parts[4]
+        payload = json.loads(msg.payload.decode())
+
+        node_info = NodeInfo(**payload)
+
+        existing_node = ctx.node_service.find(node_id)
+
+        if existing_node:
+            update_data = NodeUpdate(
+                max_power_kw=node_info.max_power_kw,
+            )
+            _, updated = ctx.node_service.update_if_changed(node_id, update_data)
+            if updated:
+                self.logger.info(f"Updated node {node_id} info for hub {hub_id}")
+            else:
+                self.logger.debug(f"No changes for node {node_id} info")
+        else:
+            create_data = NodeCreate(
+                node_id=node_id,
+                hub_id=hub_id,
+                max_power_kw=node_info.max_power_kw,
+                is_maintenance=False,
+            )
+            ctx.node_service.create(create_data)
+            self.logger.info(f"Created new node {node_id} for hub {hub_id}")
+
+    def _on_node_status_message(self, msg) -> None:
+        """
+        Handle node status messages on the MQTT thread.
+
+        Topic: iot/hubs/+/nodes/+/status
+
+        Opens/closes the node's energy integration in message order with the
+        telemetry, then enqueues the session bookkeeping.
+        """
         try:
             topic_parts = msg.topic.split("/")
             if len(topic_parts) != 6:
-                self.logger.warning(f"Invalid node info topic: {msg.topic}")
+                self.logger.warning(f"Invalid node status topic: {msg.topic}")
                 return
 
             hub_id = topic_parts[2]
             node_id = topic_parts[4]
-            payload = json.loads(msg.payload.decode())
+            node_status = NodeStatus.model_validate_json(msg.payload)
 
-            node_info = NodeInfo(**payload)
+            if node_status.state == ChargingState.CHARGING:
+                self.energy_integrator.open(node_id)
+            else:
+                self.energy_integrator.close(node_id)
 
-            existing_node = self.node_service.repo.get(node_id)
+            if node_status.state != ChargingState.IDLE:
+                recommendation_cache.invalidate_node(node_id)
 
-            if existing_node:
-                update_data = NodeUpdate(
-                    max_power_kw=node_info.max_power_kw,
-                )
-                _, updated = self.node_service.update_if_changed(node_id, update_data)
-                if updated:
-                    self.logger.info(f"Updated node {node_id} info for hub {hub_id}")
-                else:
-                    self.logger.debug(f"No changes for node {node_id} info")
-            else:
-                create_data = NodeCreate(
-                    node_id=node_id,
-                    hub_id=hub_id,
-                    max_power_kw=node_info.max_power_kw,
-                    is_maintenance=False,
-                )
-                self.node_service.create(create_data)
-                self.logger.info(f"Created new node {node_id} for hub {hub_id}")
+            self.pipeline.submit(hub_id, self._on_node_status, (node_id, node_status))
 
         except Exception as e:
-            self.logger.error(f"Error processing node info message: {e}", exc_info=True)
+            self.logger.error(
+                f"Error processing node status message: {e}", exc_info=True
+            )
 
-    def _on_node_status(self, msg) -> None:
+    def _on_node_status(
+        self, ctx: CollectorContext, status: tuple[str, NodeStatus]
+    ) -> None:
         """
-        Handle node status messages and manage charging sessions.
-
-        Topic: iot/hubs/+/nodes/+/status
+        Manage charging sessions from a parsed node status.
 
         Session management:
         - CHARGING: start new session if not already active
         - IDLE/FULL/FAULTED: end active session if exists
         """
+        node_id, node_status = status
+
+        self._manage_charging_session(
+            ctx, node_id, node_status.current_vehicle_id, node_status.state
+        )
+        self.logger.debug(f"Updated node {node_id} status: {node_status.state}")
+
+    def _on_node_telemetry_message(self, msg) -> None:
+        """
+        Handle node telemetry messages on the MQTT thread.
+
+        Topic: iot/hubs/+/nodes/+/telemetry
+
+        Telemetry needs no database work: the latest node state, the
+        session energy integration and the optional InfluxDB writer are all
+        in memory, so samples never wait behind (or get dropped with) the
+        write-behind queues used by status and DLM messages.
+        """
         try:
             topic_parts = msg.topic.split("/")
             if len(topic_parts) != 6:
-                self.logger.warning(f"Invalid node status topic: {msg.topic}")
+                self.logger.warning(f"Invalid node telemetry topic: {msg.topic}")
                 return
 
+            hub_id = topic_parts[2]
             node_id = topic_parts[4]
-            payload = json.loads(msg.payload.decode())
+            telemetry = NodeTelemetry.model_validate_json(msg.payload)
 
-            node_status = NodeStatus(**payload)
+            telemetry_store.update_node(node_id, telemetry)
+            if telemetry.is_occupied:
+                recommendation_cache.invalidate_node(node_id)
 
-            self._manage_charging_session(
-                node_id, node_status.current_vehicle_id, node_status.state
+            if self.telemetry_writer:
+                self.telemetry_writer.write_node(hub_id, node_id, telemetry)
+            self.energy_integrator.add_sample(
+                node_id, telemetry.power_kw, telemetry.timestamp
             )
-            self.logger.debug(f"Updated node {node_id} status: {node_status.state}")
 
         except Exception as e:
             self.logger.error(
-                f"Error processing node status message: {e}", exc_info=True
+                f"Error processing node telemetry message: {e}", exc_info=True
             )
 
+    def _get_session_metrics(self, node_id: str, session) -> dict[str, float]:
+        """
+        Get energy metrics of an ending session.
+
+        Uses the in-memory integrator and falls back to InfluxDB for sessions
+        it did not track (e.g. started before a restart).
+
+        Args:
+            node_id: Node identifier
+            session: Charging session being ended
+
+        Returns:
+            Dictionary with total_energy_kwh and avg_power_kw
+        """
+        metrics = self.energy_integrator.end(node_id, session.charging_session_id)
+
+        if metrics is None:
+            return self.influx_service.get_session_metrics(
+                node_id=node_id, start_time=session.start_time, end_time=None
+            )
+
+        if settings.SESSION_METRICS_INFLUX_CROSSCHECK:
+            influx_metrics = self.influx_service.get_session_metrics(
+                node_id=node_id, start_time=session.start_time, end_time=None
+            )
+            self.logger.info(
+                f"Session {session.charging_session_id} energy cross-check: "
+                f"local {metrics['total_energy_kwh']:.3f} kWh / "
+                f"{metrics['avg_power_kw']:.3f} kW avg, "
+                f"influx {influx_metrics['total_energy_kwh']:.3f} kWh / "
+                f"{influx_metrics['avg_power_kw']:.3f} kW avg"
+            )
+
+        return metrics
+
     def _manage_charging_session(
-        self, node_id: str, vehicle_id: Optional[str], state: ChargingState
+        self,
+        ctx: CollectorContext,
+        node_id: str,
+        vehicle_id: Optional[str],
+        state: ChargingState,
     ) -> None:
         """
         Manage charging session based on node state.
 
         Args:
+            ctx: Services bound to the current batch session
             node_id: Node identifier
             vehicle_id: Optional vehicle identifier
             state: Current charging state
         """
-        active_sessions = self.session_service.get_active(node_id=node_id)
+        active_sessions = ctx.session_service.get_active(node_id=node_id)
         has_active_session = len(active_sessions) > 0
 
         if state == ChargingState.CHARGING:
@@ -246,47 +416,74 @@ class MQTTDataCollector:
                 start_data = ChargingSessionStart(
                     node_id=node_id, vehicle_id=vehicle_id
                 )
-                session = self.session_service.start(start_data)
+                session = ctx.session_service.start(start_data)
+                self.energy_integrator.start(node_id, session.charging_session_id)
                 self.logger.info(
                     f"Started charging session {session.charging_session_id} for node {node_id} and vehicle {vehicle_id}"
                 )
         else:
             for session in active_sessions:
-                metrics = self.influx_service.get_session_metrics(
-                    node_id=node_id,
-                    start_time=session.start_time,
-                    end_time=None,
-                )
+                metrics = self._get_session_metrics(node_id, session)
 
                 end_data = ChargingSessionEnd(
                     total_energy_kwh=metrics["total_energy_kwh"],
                     avg_power_kw=metrics["avg_power_kw"],
                 )
-                self.session_service.end(session.charging_session_id, end_data)
+                ctx.session_service.end(session.charging_session_id, end_data)
                 self.logger.info(
                     f"Ended charging session {session.charging_session_id} for node {node_id} "
                     f"(state changed to {state.value}): "
                     f"{metrics['total_energy_kwh']:.2f} kWh, {metrics['avg_power_kw']:.2f} kW avg"
                 )
 
-    def _on_dlm_event(self, msg) -> None:
+    def _on_dlm_event(self, ctx: CollectorContext, msg) -> None:
         """
         Handle DLM event messages.
 
         Topic: iot/hubs/+/dlm/events
         """
-        try:
-            topic_parts = msg.topic.split("/")
-            if len(topic_parts) != 5:
-                self.logger.warning(f"Invalid DLM event topic: {msg.topic}")
-                return
+        topic_parts = msg.topic.split("/")
+        if len(topic_parts) != 5:
+            self.logger.warning(f"Invalid DLM event topic: {msg.topic}")
+            return
+
+        hub_id = topic_parts[2]
+        payload = json.loads(msg.payload.decode())
+
+        dlm_event = DLMNotification(**payload)
+
+        log_data = DLMEventLog(
+            hub_id=hub_id,
+            node_id=dlm_event.affected_node_id,
+            trigger_reason=dlm_event.trigger_reason,
+            original_limit_kw=dlm_event.original_limit,
+            new_limit_kw=dlm_event.new_limit,
+            total_grid_load_kw=dlm_event.total_grid_load,
+            available_capacity_at_trigger=dlm_event.available_capacity,
+        )
 
-            hub_id = topic_parts[2]
-            payload = json.loads(msg.payload.decode())
+        ctx.dlm_service.log(log_data)
+        self.logger.info(
+            f"Recorded DLM event for node {dlm_event.affected_node_id}: "
+            f"{dlm_event.trigger_reason} ({dlm_event.original_limit} -> {dlm_event.new_limit} kW)"
+        )
 
-            dlm_event = DLMNotification(**payload)
+    def _on_dlm_event_batch(self, ctx: CollectorContext, msg) -> None:
+        """
+        Handle batched DLM event messages and bulk-insert them.
 
-            log_data = DLMEventLog(
+        Topic: iot/hubs/+/dlm/events/batch
+        """
+        topic_parts = msg.topic.split("/")
+        if len(topic_parts) != 6:
+            self.logger.warning(f"Invalid DLM event batch topic: {msg.topic}")
+            return
+
+        hub_id = topic_parts[2]
+        batch = DLMNotificationBatch.model_validate_json(msg.payload)
+
+        logs = [
+            DLMEventLog(
                 hub_id=hub_id,
                 node_id=dlm_event.affected_node_id,
                 trigger_reason=dlm_event.trigger_reason,
@@ -295,15 +492,11 @@ class MQTTDataCollector:
                 total_grid_load_kw=dlm_event.total_grid_load,
                 available_capacity_at_trigger=dlm_event.available_capacity,
             )
+            for dlm_event in batch.root
+        ]
 
-            self.dlm_service.log(log_data)
-            self.logger.info(
-                f"Recorded DLM event for node {dlm_event.affected_node_id}: "
-                f"{dlm_event.trigger_reason} ({dlm_event.original_limit} -> {dlm_event.new_limit} kW)"
-            )
-
-        except Exception as e:
-            self.logger.error(f"Error processing DLM event message: {e}", exc_info=True)
+        count = ctx.dlm_service.log_many(hub_id, logs)
+        self.logger.info(f"Recorded {count} DLM events for hub {hub_id}")
 
     def unsubscribe(self) -> None:
         """Stop data collector and unsubscribe from topics."""
@@ -313,8 +506,12 @@ class MQTTDataCollector:
         self.mqtt_service.unsubscribe("iot/hubs/+/status")
         self.mqtt_service.unsubscribe("iot/hubs/+/nodes/+/info")
         self.mqtt_service.unsubscribe("iot/hubs/+/nodes/+/status")
+        self.mqtt_service.unsubscribe("iot/hubs/+/nodes/+/telemetry")
         self.mqtt_service.unsubscribe("iot/hubs/+/dlm/events")
+        self.mqtt_service.unsubscribe("iot/hubs/+/dlm/events/batch")
 
+        self.pipeline.stop()
+        self.heartbeats.stop()
         self.influx_service.close()
 
         self.logger.info("MQTT Data Collector stopped")
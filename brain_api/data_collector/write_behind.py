@@ -0,0 +1,278 @@
+import logging
+import queue
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session, sessionmaker
+
+ContextT = TypeVar("ContextT")
+
+Handler = Callable[[Any, Any], None]
+"""Message handler: ``handler(context, msg)``."""
+
+
+@dataclass
+class PipelineMetrics:
+    """Counters describing throughput and backpressure of the pipeline."""
+
+    enqueued: int = 0
+    processed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    blocked_enqueues: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    last_batch_size: int = 0
+    last_batch_ms: float = 0.0
+    max_batch_ms: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counters: int) -> None:
+        """Atomically increment counters."""
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def record_batch(self, size: int, duration_ms: float, ok: bool) -> None:
+        """Record the outcome of one flushed batch."""
+        with self._lock:
+            self.batches += 1
+            if not ok:
+                self.failed_batches += 1
+            self.last_batch_size = size
+            self.last_batch_ms = duration_ms
+            self.max_batch_ms = max(self.max_batch_ms, duration_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a consistent copy of all counters."""
+        with self._lock:
+            return {
+                name: value
+                for name, value in self.__dict__.items()
+                if not name.startswith("_")
+            }
+
+
+class WriteBehindPipeline(Generic[ContextT]):
+    """
+    Bounded write-behind queue between MQTT callbacks and the database.
+
+    MQTT callbacks only enqueue ``(handler, msg)`` pairs. A pool of worker
+    threads drains the queues in micro-batches (up to ``batch_size`` messages
+    or ``batch_interval`` seconds after the first one) and runs every batch
+    in a single database transaction.
+
+    Each message runs inside its own SAVEPOINT, so the handlers can keep
+    calling ``session.commit()``/``rollback()`` as usual: a failing message
+    only rolls back its own changes and the batch is committed once.
+
+    Messages are partitioned across workers by key (e.g. hub id), which keeps
+    per-key ordering intact.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        context_factory: Callable[[Session], ContextT],
+        num_workers: int = 4,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        batch_interval: float = 0.1,
+        enqueue_timeout: float = 1.0,
+        on_rollback: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            session_factory: Session factory bound to the database engine
+            context_factory: Builds the per-batch handler context from a session
+            num_workers: Number of worker threads
+            max_queue_size: Capacity of each worker queue
+            batch_size: Maximum messages per transaction
+            batch_interval: Maximum time to wait for a batch to fill (seconds)
+            enqueue_timeout: Maximum time a producer blocks on a full queue
+                before the message is dropped (seconds)
+            on_rollback: Called when a whole batch is rolled back, so caches
+                written through by the handlers can be invalidated
+        """
+        self.session_factory = session_factory
+        self.engine = session_factory.kw["bind"]
+        self.context_factory = context_factory
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.on_rollback = on_rollback
+
+        self.metrics = PipelineMetrics()
+        self.logger = logging.getLogger("WriteBehindPipeline")
+
+        self._queues: List["queue.Queue[Tuple[Handler, Any]]"] = [
+            queue.Queue(maxsize=max_queue_size) for _ in range(max(num_workers, 1))
+        ]
+        self._workers: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start worker threads."""
+        self._stop.clear()
+        for index, work_queue in enumerate(self._queues):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                args=(work_queue,),
+                daemon=True,
+                name=f"WriteBehind-{index}",
+            )
+            worker.start()
+            self._workers.append(worker)
+
+        self.logger.info(
+            f"Started {len(self._workers)} write-behind workers "
+            f"(batch: {self.batch_size} msgs / {self.batch_interval * 1000:.0f} ms)"
+        )
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the workers after draining the queued messages.
+
+        Args:
+            timeout: Maximum time to wait for each worker (seconds)
+        """
+        self._stop.set()
+        for worker in self._workers:
+            worker.join(timeout=timeout)
+        self._workers.clear()
+        self.logger.info(f"Write-behind pipeline stopped: {self.get_metrics()}")
+
+    def submit(self, key: str, handler: Handler, msg: Any) -> bool:
+        """
+        Enqueue a message for asynchronous processing.
+
+        Blocks for at most ``enqueue_timeout`` when the target queue is full,
+        then drops the message.
+
+        Args:
+            key: Partition key; messages with the same key are processed in order
+            handler: Function called as ``handler(context, msg)``
+            msg: Message passed to the handler
+
+        Returns:
+            True if the message was enqueued, False if it was dropped
+        """
+        work_queue = self._queues[zlib.crc32(key.encode()) % len(self._queues)]
+        item = (handler, msg)
+
+        try:
+            work_queue.put_nowait(item)
+        except queue.Full:
+            self.metrics.add(blocked_enqueues=1)
+            try:
+                work_queue.put(item, timeout=self.enqueue_timeout)
+            except queue.Full:
+                self.metrics.add(dropped=1)
+                self.logger.warning(
+                    f"Write-behind queue full, dropped {handler.__name__} for {key}"
+                )
+                return False
+
+        self.metrics.add(enqueued=1)
+        return True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get throughput and backpressure metrics.
+
+        Returns:
+            Counters plus current queue depths and capacity
+        """
+        metrics = self.metrics.snapshot()
+        depths = [q.qsize() for q in self._queues]
+        metrics.update(
+            workers=len(self._queues),
+            queue_depth=sum(depths),
+            queue_depth_per_worker=depths,
+            queue_capacity=sum(q.maxsize for q in self._queues),
+            queue_utilization=(
+                max(d / q.maxsize for d, q in zip(depths, self._queues))
+                if self._queues
+                else 0.0
+            ),
+        )
+        return metrics
+
+    def _next_batch(
+        self, work_queue: "queue.Queue[Tuple[Handler, Any]]"
+    ) -> List[Tuple[Handler, Any]]:
+        """Collect up to batch_size items, waiting at most batch_interval."""
+        try:
+            batch = [work_queue.get(timeout=self.batch_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.batch_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(work_queue.get(timeout=remaining))
+                else:
+                    batch.append(work_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _worker_loop(self, work_queue: "queue.Queue[Tuple[Handler, Any]]") -> None:
+        """Drain one queue in micro-batches until stopped and empty."""
+        while not (self._stop.is_set() and work_queue.empty()):
+            batch = self._next_batch(work_queue)
+            if batch:
+                self._process_batch(batch)
+
+    def _process_batch(self, batch: List[Tuple[Handler, Any]]) -> None:
+        """Run a batch of messages in one transaction."""
+        started = time.perf_counter()
+        failed = 0
+        ok = True
+
+        connection = self.engine.connect()
+        transaction = connection.begin()
+        session: Optional[Session] = None
+        try:
+            session = self.session_factory(
+                bind=connection, join_transaction_mode="create_savepoint"
+            )
+            context = self.context_factory(session)
+
+            for handler, msg in batch:
+                try:
+                    handler(context, msg)
+                    session.commit()
+                except Exception as e:
+                    failed += 1
+                    session.rollback()
+                    self.logger.error(
+                        f"Error processing {getattr(msg, 'topic', msg)}: {e}",
+                        exc_info=True,
+                    )
+
+            transaction.commit()
+        except Exception as e:
+            ok = False
+            failed = len(batch)
+            transaction.rollback()
+            self.logger.error(f"Write-behind batch of {len(batch)} failed: {e}")
+            if self.on_rollback:
+                self.on_rollback()
+        finally:
+            if session is not None:
+                session.close()
+            connection.close()
+
+        self.metrics.add(processed=len(batch) - failed, failed=failed)
+        self.metrics.record_batch(
+            len(batch), (time.perf_counter() - started) * 1000, ok
+        )
@@ -1,4 +1,5 @@
 from .base import Base, drop_db, init_db, seed_db
+from .partitions import PartitionedTable, PartitionMaintainer, partitioned_tables
 from .session import (
     SessionLocal,
     check_db_health,
@@ -17,4 +18,8 @@ __all__ = [
     "init_db",
     "seed_db",
     "drop_db",
+    # Partitioning
+    "PartitionedTable",
+    "PartitionMaintainer",
+    "partitioned_tables",
 ]
@@ -4,6 +4,8 @@ from pathlib import Path
 from sqlalchemy import text
 from sqlalchemy.orm import declarative_base
 
+from ..core.config import settings
+from .partitions import ensure_partitions, is_partitioned, partitioned_tables
 from .session import engine
 
 logger = logging.getLogger(__name__)
@@ -13,7 +15,8 @@ Base = declarative_base()
 
 def init_db() -> None:
     """
-    Create all tables in the database.
+    Create all tables in the database, with the partitions of the
+    partitioned tables.
     """
     import brain_api.models  # noqa: F401
 
@@ -21,6 +24,39 @@ def init_db() -> None:
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created successfully")
 
+    _create_missing_indexes()
+    _create_partitions()
+
+
+def _create_missing_indexes() -> None:
+    """
+    Create indexes declared on the models but missing from existing tables.
+
+    create_all only creates the indexes of the tables it creates, so indexes
+    added to a model later would never reach an existing database.
+    """
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if not conn.dialect.has_index(conn, table.name, index.name):
+                    logger.info(f"Creating index {index.name} on {table.name}")
+                    index.create(conn)
+
+
+def _create_partitions() -> None:
+    """
+    Create the default and upcoming monthly partitions.
+
+    A partitioned table without partitions rejects every INSERT, so they are
+    created here rather than waiting for the PartitionMaintainer.
+    """
+    for table in partitioned_tables():
+        if not is_partitioned(engine, table.name):
+            continue
+        created = ensure_partitions(engine, table, settings.DB_PARTITION_MONTHS_AHEAD)
+        if created:
+            logger.info(f"Created partitions: {', '.join(created)}")
+
 
 def seed_db(sql_path: Path) -> None:
     """
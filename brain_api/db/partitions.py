@@ -0,0 +1,281 @@
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import Engine, text
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    """
+    A table range-partitioned by month on a timestamp column.
+
+    Rows outside every monthly partition land in the default partition,
+    which retention never removes.
+    """
+
+    name: str
+    retention_months: Optional[int] = None  # None keeps every partition
+
+    @property
+    def default_partition(self) -> str:
+        return f"{self.name}_default"
+
+    def partition_name(self, month: date) -> str:
+        return f"{self.name}_{month.year:04d}_{month.month:02d}"
+
+    def partition_month(self, partition: str) -> Optional[date]:
+        """Month covered by a partition, from its name (None if not monthly)."""
+        match = re.fullmatch(rf"{re.escape(self.name)}_(\d{{4}})_(\d{{2}})", partition)
+        if match is None:
+            return None
+        return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def partitioned_tables() -> List[PartitionedTable]:
+    """The partitioned tables with their configured retention."""
+    return [
+        PartitionedTable("dlm_events", settings.DLM_EVENTS_RETENTION_MONTHS),
+        PartitionedTable(
+            "charging_sessions", settings.CHARGING_SESSIONS_RETENTION_MONTHS
+        ),
+    ]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _current_month() -> date:
+    today = datetime.now(timezone.utc).date()
+    return today.replace(day=1)
+
+
+def is_partitioned(engine: Engine, table: str) -> bool:
+    """Check whether a table exists as a partitioned (parent) table."""
+    with engine.connect() as conn:
+        return (
+            conn.execute(
+                text(
+                    "SELECT 1 FROM pg_partitioned_table "
+                    "WHERE partrelid = to_regclass(:table)"
+                ),
+                {"table": table},
+            ).scalar()
+            is not None
+        )
+
+
+def list_partitions(engine: Engine, table: str) -> List[str]:
+    """Names of the partitions currently attached to a table."""
+    with engine.connect() as conn:
+        return list(
+            conn.execute(
+                text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "WHERE pg_inherits.inhparent = to_regclass(:table) "
+                    "ORDER BY child.relname"
+                ),
+                {"table": table},
+            ).scalars()
+        )
+
+
+def has_rows(engine: Engine, table: str) -> bool:
+    """Check whether a table (or partition) holds any row."""
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.connect() as conn:
+        return (
+            conn.execute(text(f"SELECT 1 FROM {quote(table)} LIMIT 1")).scalar()
+            is not None
+        )
+
+
+def ensure_partitions(
+    engine: Engine, table: PartitionedTable, months_ahead: int = 3
+) -> List[str]:
+    """
+    Create the default partition and the monthly partitions from the
+    current month up to ``months_ahead`` months in the future.
+
+    Args:
+        engine: Database engine
+        table: Partitioned table
+        months_ahead: Future months to create in advance
+
+    Returns:
+        Names of the partitions created
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    existing = set(list_partitions(engine, table.name))
+    created = []
+
+    with engine.begin() as conn:
+        if table.default_partition not in existing:
+            conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {quote(table.default_partition)} "
+                    f"PARTITION OF {quote(table.name)} DEFAULT"
+                )
+            )
+            created.append(table.default_partition)
+
+        month = _current_month()
+        for offset in range(months_ahead + 1):
+            start = _add_months(month, offset)
+            name = table.partition_name(start)
+            if name in existing:
+                continue
+
+            end = _add_months(start, 1)
+            conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {quote(name)} "
+                    f"PARTITION OF {quote(table.name)} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            )
+            created.append(name)
+
+    return created
+
+
+def apply_retention(
+    engine: Engine, table: PartitionedTable, drop: bool = True
+) -> List[str]:
+    """
+    Remove the monthly partitions older than the table's retention.
+
+    A partition is removed once its whole month is older than
+    ``retention_months`` full months. Removing a partition is a metadata
+    operation, unlike a DELETE of the same rows.
+
+    The default partition is exempt: it may hold rows of any month, so it
+    is never detached. Rows only reach it when their month has no
+    partition (e.g. rows older than the partitions created on start), and
+    PartitionMaintainer logs a warning while it holds any.
+
+    Args:
+        engine: Database engine
+        table: Partitioned table
+        drop: Drop detached partitions (False keeps them as plain tables,
+            e.g. for archiving)
+
+    Returns:
+        Names of the partitions detached
+    """
+    if table.retention_months is None:
+        return []
+
+    quote = engine.dialect.identifier_preparer.quote
+    cutoff = _add_months(_current_month(), -table.retention_months)
+    expired = [
+        name
+        for name in list_partitions(engine, table.name)
+        if (month := table.partition_month(name)) is not None and month < cutoff
+    ]
+
+    for name in expired:
+        with engine.begin() as conn:
+            conn.execute(
+                text(f"ALTER TABLE {quote(table.name)} DETACH PARTITION {quote(name)}")
+            )
+            if drop:
+                conn.execute(text(f"DROP TABLE {quote(name)}"))
+
+    return expired
+
+
+class PartitionMaintainer:
+    """
+    Keeps monthly partitions created ahead of time and applies retention.
+
+    Runs once on start and then every ``interval`` seconds on a background
+    thread. Tables that are not partitioned (databases created before
+    partitioning was introduced) are skipped with a warning.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        tables: List[PartitionedTable],
+        months_ahead: int = 3,
+        drop_expired: bool = True,
+        interval: float = 6 * 3600,
+    ) -> None:
+        """
+        Initialize the maintainer.
+
+        Args:
+            engine: Database engine
+            tables: Partitioned tables to maintain
+            months_ahead: Future months to create in advance
+            drop_expired: Drop expired partitions instead of only detaching
+            interval: Interval between maintenance runs (seconds)
+        """
+        self.engine = engine
+        self.tables = tables
+        self.months_ahead = months_ahead
+        self.drop_expired = drop_expired
+        self.interval = interval
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def run_once(self) -> None:
+        """Create upcoming partitions and apply retention on every table."""
+        for table in self.tables:
+            try:
+                if not is_partitioned(self.engine, table.name):
+                    logger.warning(
+                        f"Table {table.name} is not partitioned, skipping maintenance"
+                    )
+                    continue
+
+                created = ensure_partitions(self.engine, table, self.months_ahead)
+                if created:
+                    logger.info(f"Created partitions: {', '.join(created)}")
+
+                expired = apply_retention(self.engine, table, self.drop_expired)
+                if expired:
+                    action = "Dropped" if self.drop_expired else "Detached"
+                    logger.info(f"{action} expired partitions: {', '.join(expired)}")
+
+                if table.retention_months is not None and has_rows(
+                    self.engine, table.default_partition
+                ):
+                    logger.warning(
+                        f"Default partition {table.default_partition} holds rows, "
+                        "which retention does not remove"
+                    )
+            except Exception as e:
+                logger.error(f"Partition maintenance failed for {table.name}: {e}")
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+    def start(self) -> None:
+        """Run maintenance now and start the periodic thread."""
+        self.run_once()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop, daemon=True, name="PartitionMaintainer"
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the periodic thread."""
+        if self._thread and self._thread.is_alive():
+            self._stop.set()
+            self._thread.join(timeout=5)
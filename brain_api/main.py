@@ -26,11 +26,15 @@ from .api import (
 )
 from .core.config import settings
 from .core.logging import setup_logging
+from .core.registry_cache import registry_cache
+from .core.telemetry_store import telemetry_store
 from .core.websocket_manager import ws_manager
-from .data_collector import MQTTDataCollector
-from .db import init_db
-from .db.session import SessionLocal
+from .data_collector import InfluxTelemetryWriter, MQTTDataCollector
+from .db import PartitionMaintainer, init_db, partitioned_tables
+from .db.session import SessionLocal, engine
+from .repositories import EnergyAggregateRepository
 from .schemas import ErrorResponse
+from .services.influx_rollups import influx_rollups
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -50,6 +54,17 @@ async def lifespan(app: FastAPI):
     )
     mqtt_service.connect()
 
+    telemetry_writer = None
+    if settings.INFLUX_DIRECT_WRITE:
+        telemetry_writer = InfluxTelemetryWriter(
+            batch_size=settings.INFLUX_WRITE_BATCH_SIZE,
+            flush_interval=settings.INFLUX_WRITE_FLUSH_INTERVAL_MS / 1000,
+            buffer_limit=settings.INFLUX_WRITE_BUFFER_LIMIT,
+            max_retries=settings.INFLUX_WRITE_MAX_RETRIES,
+            retry_interval=settings.INFLUX_WRITE_RETRY_INTERVAL_MS / 1000,
+        )
+        telemetry_writer.start()
+
     # Subscribe to vehicle telemetry topic
     def on_telemetry_message(msg):
         """Callback per messaggi di telemetria dai veicoli."""
@@ -65,6 +80,9 @@ async def lifespan(app: FastAPI):
                 payload = json.loads(msg.payload.decode())
 
                 telemetry = VehicleTelemetry(**payload)
+                if telemetry_writer:
+                    telemetry_writer.write_vehicle(vehicle_id, telemetry)
+                telemetry_store.update_vehicle(vehicle_id, telemetry)
                 data_to_send = telemetry.model_dump(mode="json")
 
                 # 2. USA call_soon_threadsafe per pianificare la coroutine nel loop di FastAPI
@@ -80,6 +98,7 @@ async def lifespan(app: FastAPI):
             # ma il logger standard di python di solito è thread-safe.
             logger.error(f"Error processing telemetry message: {e}")
 
+    telemetry_store.start()
     mqtt_service.subscribe("iot/vehicles/+/telemetry", on_telemetry_message, qos=0)
 
     dependencies.set_mqtt_service(mqtt_service)
@@ -91,15 +110,49 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
 
+    partition_maintainer = PartitionMaintainer(
+        engine,
+        partitioned_tables(),
+        months_ahead=settings.DB_PARTITION_MONTHS_AHEAD,
+        drop_expired=settings.DB_RETENTION_DROP,
+        interval=settings.DB_PARTITION_MAINTENANCE_INTERVAL_H * 3600,
+    )
+    partition_maintainer.start()
+
+    try:
+        with SessionLocal() as db:
+            energy_repo = EnergyAggregateRepository(db)
+            if energy_repo.count() == 0:
+                rows = energy_repo.rebuild()
+                db.commit()
+                if rows:
+                    logger.info(f"Backfilled {rows} energy aggregate rows")
+    except Exception as e:
+        logger.error(f"Failed to backfill energy aggregates: {e}")
+
+    try:
+        with SessionLocal() as db:
+            registry_cache.warm(db)
+    except Exception as e:
+        logger.error(f"Failed to warm registry cache: {e}")
+
+    if settings.INFLUXDB_ROLLUPS_ENABLED:
+        try:
+            influx_rollups.ensure(dependencies.get_influx_service().client)
+            logger.info("InfluxDB rollups ready")
+        except Exception as e:
+            logger.error(f"Failed to set up InfluxDB rollups: {e}")
+
     # Initialize and start MQTT Data Collector
-    db = SessionLocal()
     try:
-        data_collector = MQTTDataCollector(mqtt_service, db)
+        data_collector = MQTTDataCollector(
+            mqtt_service, SessionLocal, telemetry_writer=telemetry_writer
+        )
         data_collector.subscribe()
+        dependencies.set_data_collector(data_collector)
         logger.info("MQTT Data Collector initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize MQTT Data Collector: {e}")
-        db.close()
         raise
 
     yield
@@ -109,8 +162,13 @@ async def lifespan(app: FastAPI):
         data_collector.unsubscribe()
     except Exception as e:
         logger.error(f"Error stopping data collector: {e}")
-    finally:
-        db.close()
+
+    if telemetry_writer:
+        telemetry_writer.stop()
+
+    partition_maintainer.stop()
+
+    await dependencies.close_influx_services()
 
     mqtt_service.disconnect()
     logger.info(f"Shutting down {settings.PROJECT_NAME}")
@@ -1,5 +1,6 @@
 from .charging_session_dbo import ChargingSessionDbo
 from .dlm_event_dbo import DLMEventDbo
+from .energy_aggregate_dbo import EnergyAggregateDbo
 from .hub_dbo import HubDbo
 from .node_dbo import NodeDbo
 from .vehicle_dbo import VehicleDbo
@@ -10,4 +11,5 @@ __all__ = [
     "VehicleDbo",
     "ChargingSessionDbo",
     "DLMEventDbo",
+    "EnergyAggregateDbo",
 ]
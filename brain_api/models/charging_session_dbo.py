@@ -5,9 +5,11 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     func,
+    text,
 )
 from sqlalchemy.orm import relationship
 
@@ -22,6 +24,17 @@ class ChargingSessionDbo(Base):
     """
 
     __tablename__ = "charging_sessions"
+    __table_args__ = (
+        # Active session lookup on every node status message; only open
+        # sessions are indexed, so it stays small as history grows
+        Index(
+            "ix_charging_sessions_active_node",
+            "node_id",
+            postgresql_where=text("end_time IS NULL"),
+        ),
+        # Monthly partitions, managed by db.partitions
+        {"postgresql_partition_by": "RANGE (start_time)"},
+    )
 
     charging_session_id = Column(
         Integer, primary_key=True, index=True, autoincrement=True
@@ -40,8 +53,10 @@ class ChargingSessionDbo(Base):
         index=True,
     )
 
+    # Part of the table primary key as required for the partition key
     start_time = Column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
@@ -59,6 +74,9 @@ class ChargingSessionDbo(Base):
     node = relationship("NodeDbo", back_populates="sessions")
     vehicle = relationship("VehicleDbo", back_populates="sessions")
 
+    # Entities are still identified by their id alone
+    __mapper_args__ = {"primary_key": [charging_session_id]}
+
     def __repr__(self) -> str:
         return f"<ChargingSessionDbo(id={self.charging_session_id}, node={self.node_id}, energy={self.total_energy_kwh}kWh)>"
 
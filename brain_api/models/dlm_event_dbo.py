@@ -5,6 +5,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     func,
@@ -23,11 +24,23 @@ class DLMEventDbo(Base):
     """
 
     __tablename__ = "dlm_events"
+    __table_args__ = (
+        # Keyset pagination: newest first, optionally per hub or node
+        Index("ix_dlm_events_timestamp_id", "timestamp", "dlm_event_id"),
+        Index("ix_dlm_events_hub_timestamp_id", "hub_id", "timestamp", "dlm_event_id"),
+        Index(
+            "ix_dlm_events_node_timestamp_id", "node_id", "timestamp", "dlm_event_id"
+        ),
+        # Monthly partitions, managed by db.partitions
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
     dlm_event_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
+    # Part of the table primary key as required for the partition key
     timestamp = Column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
@@ -67,6 +80,9 @@ class DLMEventDbo(Base):
     hub = relationship("HubDbo", back_populates="dlm_events")
     node = relationship("NodeDbo", back_populates="dlm_events")
 
+    # Entities are still identified by their id alone
+    __mapper_args__ = {"primary_key": [dlm_event_id]}
+
     def __repr__(self) -> str:
         return f"<DLMEventDbo(id={self.dlm_event_id}, reason={self.trigger_reason}, {self.original_limit_kw}->{self.new_limit_kw}kW)>"
 
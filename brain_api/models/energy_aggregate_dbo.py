@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Date, Float, Integer, String
+
+from ..db import Base
+
+
+class EnergyAggregateDbo(Base):
+    """
+    Energy Aggregate - daily charging totals of a node or a hub.
+
+    Maintained incrementally when charging sessions end, so energy reports
+    read a handful of rows instead of scanning charging_sessions.
+    Sessions are attributed to the UTC day they started.
+    """
+
+    __tablename__ = "energy_aggregates"
+
+    day = Column(Date, primary_key=True)
+    scope = Column(String(10), primary_key=True, comment="node or hub")
+    entity_id = Column(String(50), primary_key=True, comment="Node or hub ID")
+
+    energy_kwh = Column(
+        Float, nullable=False, default=0.0, comment="Total energy delivered in kWh"
+    )
+    session_count = Column(
+        Integer, nullable=False, default=0, comment="Number of ended sessions"
+    )
+    avg_power_sum_kw = Column(
+        Float,
+        nullable=False,
+        default=0.0,
+        comment="Sum of the sessions' average power in kW",
+    )
+
+    def __repr__(self) -> str:
+        return f"<EnergyAggregateDbo({self.scope}={self.entity_id}, day={self.day}, energy={self.energy_kwh}kWh)>"
+
+    @property
+    def avg_power_kw(self) -> float:
+        """Average of the sessions' average power."""
+        if not self.session_count:
+            return 0.0
+        return self.avg_power_sum_kw / self.session_count  # type: ignore[return-value]
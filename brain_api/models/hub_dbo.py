@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, Float, String, func
+from sqlalchemy import Boolean, Column, DateTime, Float, Index, String, func, text
 from sqlalchemy.orm import relationship
 
 from ..db import Base
@@ -14,6 +14,16 @@ class HubDbo(Base):
     """
 
     __tablename__ = "hubs"
+    __table_args__ = (
+        # Active hubs with the columns read by capacity and location queries
+        Index(
+            "ix_hubs_active",
+            "hub_id",
+            postgresql_where=text("is_active"),
+            postgresql_include=["lat", "lon", "max_grid_capacity_kw"],
+        ),
+    )
+
     hub_id = Column(String(50), primary_key=True, index=True)
 
     # Geo Location
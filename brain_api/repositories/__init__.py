@@ -1,6 +1,7 @@
 from .base import BaseRepository, DuplicateError, NotFoundError, RepositoryError
 from .charging_session import ChargingSessionRepository
 from .dlm_event import DLMEventRepository
+from .energy_aggregate import EnergyAggregateRepository
 from .hub import HubRepository
 from .node import NodeRepository
 from .vehicle import VehicleRepository
@@ -17,4 +18,5 @@ __all__ = [
     "VehicleRepository",
     "ChargingSessionRepository",
     "DLMEventRepository",
+    "EnergyAggregateRepository",
 ]
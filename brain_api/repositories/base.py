@@ -193,7 +193,6 @@ class BaseRepository(Generic[ModelT, CreateSchemaT, UpdateSchemaT]):
             entity = self.model(**data)  # type: ignore[call-arg]
             self.db.add(entity)
             self.db.flush()
-            self.db.refresh(entity)
             logger.debug(f"Created {self.model.__name__}: {entity}")
             return entity
         except IntegrityError as e:
@@ -220,8 +219,6 @@ class BaseRepository(Generic[ModelT, CreateSchemaT, UpdateSchemaT]):
         try:
             self.db.add_all(entities)
             self.db.flush()
-            for entity in entities:
-                self.db.refresh(entity)
             logger.debug(f"Created {len(entities)} {self.model.__name__} entities")
             return entities
         except IntegrityError as e:
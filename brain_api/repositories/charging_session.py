@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
-from typing import Sequence
+from typing import Any, Iterator, Mapping, Sequence
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, select, update
 
 from ..models import ChargingSessionDbo as ChargingSession
 from ..schemas import ChargingSessionCreate, ChargingSessionUpdate
@@ -52,6 +52,9 @@ class ChargingSessionRepository(
         """
         Get sessions within a time range.
 
+        The range filters on the partition key, so only the monthly
+        partitions overlapping it are scanned.
+
         Args:
             start: Start of range
             end: End of range
@@ -70,6 +73,45 @@ class ChargingSessionRepository(
             stmt = stmt.where(ChargingSession.node_id == node_id)
         return self.db.execute(stmt).scalars().all()
 
+    def stream_sessions(
+        self,
+        node_id: str | None = None,
+        vehicle_id: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Mapping[str, Any]]:
+        """
+        Stream session rows for export, oldest first.
+
+        Rows are plain column mappings fetched ``batch_size`` at a time
+        through a server-side cursor, so memory use does not depend on the
+        number of sessions.
+
+        Args:
+            node_id: Optional node filter
+            vehicle_id: Optional vehicle filter
+            start: Optional start time filter (session start)
+            end: Optional end time filter (session start)
+            batch_size: Rows fetched per round trip
+
+        Returns:
+            Iterator of row mappings keyed by column name
+        """
+        stmt = select(*ChargingSession.__table__.columns)
+        if node_id:
+            stmt = stmt.where(ChargingSession.node_id == node_id)
+        if vehicle_id:
+            stmt = stmt.where(ChargingSession.vehicle_id == vehicle_id)
+        if start:
+            stmt = stmt.where(ChargingSession.start_time >= start)
+        if end:
+            stmt = stmt.where(ChargingSession.start_time <= end)
+        stmt = stmt.order_by(ChargingSession.charging_session_id)
+
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        yield from result.mappings()
+
     def start_session(
         self,
         node_id: str,
@@ -100,9 +142,12 @@ class ChargingSessionRepository(
         session_id: int,
         total_energy_kwh: float,
         avg_power_kw: float,
-    ) -> ChargingSession:
+    ) -> ChargingSession | None:
         """
-        End a charging session.
+        End a charging session if it is still active.
+
+        The session is closed by a single conditional UPDATE, so of two
+        concurrent calls only one closes it.
 
         Args:
             session_id: Session ID
@@ -110,16 +155,24 @@ class ChargingSessionRepository(
             avg_power_kw: Average power during session
 
         Returns:
-            Updated session
+            Updated session, or None if it was not active
         """
-        return self.update(
-            session_id,
-            {
-                "end_time": datetime.now(timezone.utc),
-                "total_energy_kwh": total_energy_kwh,
-                "avg_power_kw": avg_power_kw,
-            },
+        stmt = (
+            update(ChargingSession)
+            .where(
+                ChargingSession.charging_session_id == session_id,
+                ChargingSession.end_time.is_(None),
+            )
+            .values(
+                end_time=datetime.now(timezone.utc),
+                total_energy_kwh=total_energy_kwh,
+                avg_power_kw=avg_power_kw,
+            )
+            .returning(ChargingSession)
         )
+        return self.db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one_or_none()
 
     def get_total_energy(
         self,
@@ -1,7 +1,8 @@
+import json
 from datetime import datetime, timedelta, timezone
-from typing import Any, Sequence
+from typing import Any, Iterator, List, Mapping, Sequence, Tuple
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, insert, select, tuple_
 
 from ..models import DLMEventDbo as DLMEvent
 from ..schemas import DLMEventCreate
@@ -28,6 +29,112 @@ class DLMEventRepository(BaseRepository[DLMEvent, DLMEventCreate, dict[str, Any]
         """Get events by trigger reason."""
         return self.filter_by(trigger_reason=trigger_reason)
 
+    def _filtered(self, stmt, hub_id: str | None, node_id: str | None):
+        if hub_id:
+            stmt = stmt.where(DLMEvent.hub_id == hub_id)
+        if node_id:
+            stmt = stmt.where(DLMEvent.node_id == node_id)
+        return stmt
+
+    def list_events(
+        self,
+        hub_id: str | None = None,
+        node_id: str | None = None,
+        before: Tuple[datetime, int] | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Sequence[DLMEvent]:
+        """
+        Get a page of events, newest first.
+
+        Pages are addressed by keyset: ``before`` is the (timestamp,
+        dlm_event_id) of the last event of the previous page, so the query
+        seeks into the (hub_id/node_id, timestamp, dlm_event_id) indexes
+        instead of skipping rows.
+
+        Args:
+            hub_id: Optional hub filter
+            node_id: Optional node filter
+            before: Only return events strictly older than this key
+            skip: Rows to skip after the keyset position
+            limit: Maximum number of events
+
+        Returns:
+            List of events
+        """
+        stmt = self._filtered(select(DLMEvent), hub_id, node_id)
+        if before:
+            stmt = stmt.where(
+                tuple_(DLMEvent.timestamp, DLMEvent.dlm_event_id) < tuple_(*before)
+            )
+        stmt = (
+            stmt.order_by(DLMEvent.timestamp.desc(), DLMEvent.dlm_event_id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return self.db.execute(stmt).scalars().all()
+
+    def count_events(
+        self, hub_id: str | None = None, node_id: str | None = None
+    ) -> int:
+        """Count events matching the filters exactly."""
+        stmt = select(func.count()).select_from(DLMEvent)
+        stmt = self._filtered(stmt, hub_id, node_id)
+        return self.db.execute(stmt).scalar_one()
+
+    def estimate_events(
+        self, hub_id: str | None = None, node_id: str | None = None
+    ) -> int:
+        """
+        Estimate the number of events matching the filters.
+
+        Uses the PostgreSQL planner's row estimate (table statistics), which
+        costs the same regardless of the table size.
+        """
+        stmt = self._filtered(select(DLMEvent.dlm_event_id), hub_id, node_id)
+        connection = self.db.connection()
+        compiled = stmt.compile(dialect=connection.dialect)
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def stream_events(
+        self,
+        hub_id: str | None = None,
+        node_id: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Mapping[str, Any]]:
+        """
+        Stream event rows for export, oldest first.
+
+        Rows are plain column mappings fetched ``batch_size`` at a time
+        through a server-side cursor.
+
+        Args:
+            hub_id: Optional hub filter
+            node_id: Optional node filter
+            start: Optional start of range
+            end: Optional end of range
+            batch_size: Rows fetched per round trip
+
+        Returns:
+            Iterator of row mappings keyed by column name
+        """
+        stmt = self._filtered(select(*DLMEvent.__table__.columns), hub_id, node_id)
+        if start:
+            stmt = stmt.where(DLMEvent.timestamp >= start)
+        if end:
+            stmt = stmt.where(DLMEvent.timestamp <= end)
+        stmt = stmt.order_by(DLMEvent.timestamp, DLMEvent.dlm_event_id)
+
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        yield from result.mappings()
+
     def get_events_in_range(
         self,
         start: datetime,
@@ -37,6 +144,9 @@ class DLMEventRepository(BaseRepository[DLMEvent, DLMEventCreate, dict[str, Any]
         """
         Get DLM events within a time range.
 
+        The range filters on the partition key, so only the monthly
+        partitions overlapping it are scanned.
+
         Args:
             start: Start of range
             end: End of range
@@ -93,6 +203,24 @@ class DLMEventRepository(BaseRepository[DLMEvent, DLMEventCreate, dict[str, Any]
             }
         )
 
+    def log_events(self, events: List[dict[str, Any]]) -> int:
+        """
+        Log multiple DLM events with a single multi-row INSERT.
+
+        Args:
+            events: Event rows (same keys as log_event, timestamp optional)
+
+        Returns:
+            Number of inserted events
+        """
+        if not events:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        rows = [{"timestamp": now, **event} for event in events]
+        self.db.execute(insert(DLMEvent), rows)
+        return len(rows)
+
     def get_recent_events(
         self, hours: int = 24, limit: int = 100
     ) -> Sequence[DLMEvent]:
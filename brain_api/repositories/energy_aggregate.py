@@ -0,0 +1,210 @@
+from datetime import date
+from typing import Any, Sequence, Tuple
+
+from sqlalchemy import Date, cast, delete, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from ..models import ChargingSessionDbo as ChargingSession
+from ..models import EnergyAggregateDbo as EnergyAggregate
+from ..models import NodeDbo as Node
+from ..schemas import EnergyScope
+from .base import BaseRepository
+
+
+class EnergyAggregateRepository(
+    BaseRepository[EnergyAggregate, dict[str, Any], dict[str, Any]]
+):
+    """
+    Repository for the daily per-node and per-hub energy aggregates.
+    """
+
+    model = EnergyAggregate
+
+    def get(self, pk: Tuple[date, EnergyScope, str]) -> EnergyAggregate | None:
+        """
+        Get the aggregate of one node or hub on one day.
+
+        Args:
+            pk: Composite primary key (day, scope, entity_id)
+
+        Returns:
+            Aggregate or None if not found
+        """
+        day, scope, entity_id = pk
+        return self.db.get(EnergyAggregate, (day, EnergyScope(scope).value, entity_id))
+
+    def _filtered(
+        self,
+        stmt,
+        scope: EnergyScope,
+        entity_id: str | None,
+        start: date | None,
+        end: date | None,
+    ):
+        stmt = stmt.where(EnergyAggregate.scope == scope.value)
+        if entity_id:
+            stmt = stmt.where(EnergyAggregate.entity_id == entity_id)
+        if start:
+            stmt = stmt.where(EnergyAggregate.day >= start)
+        if end:
+            stmt = stmt.where(EnergyAggregate.day <= end)
+        return stmt
+
+    def add_session(
+        self,
+        day: date,
+        node_id: str,
+        hub_id: str,
+        energy_kwh: float,
+        avg_power_kw: float,
+    ) -> None:
+        """
+        Add an ended session to the node and hub totals of its day.
+
+        Both rows are upserted by a single INSERT ... ON CONFLICT DO UPDATE,
+        so concurrent sessions ending on the same node/hub never lose
+        increments.
+
+        Args:
+            day: UTC day the session started
+            node_id: Node the session ran on
+            hub_id: Hub of the node
+            energy_kwh: Energy delivered by the session
+            avg_power_kw: Average power of the session
+        """
+        rows = [
+            {
+                "day": day,
+                "scope": scope.value,
+                "entity_id": entity_id,
+                "energy_kwh": energy_kwh,
+                "session_count": 1,
+                "avg_power_sum_kw": avg_power_kw,
+            }
+            for scope, entity_id in (
+                (EnergyScope.NODE, node_id),
+                (EnergyScope.HUB, hub_id),
+            )
+        ]
+
+        stmt = pg_insert(EnergyAggregate).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                EnergyAggregate.day,
+                EnergyAggregate.scope,
+                EnergyAggregate.entity_id,
+            ],
+            set_={
+                "energy_kwh": EnergyAggregate.energy_kwh + stmt.excluded.energy_kwh,
+                "session_count": EnergyAggregate.session_count
+                + stmt.excluded.session_count,
+                "avg_power_sum_kw": EnergyAggregate.avg_power_sum_kw
+                + stmt.excluded.avg_power_sum_kw,
+            },
+        )
+        self.db.execute(stmt)
+
+    def get_daily(
+        self,
+        scope: EnergyScope,
+        entity_id: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> Sequence[EnergyAggregate]:
+        """
+        Get daily aggregates.
+
+        Args:
+            scope: Node or hub aggregates
+            entity_id: Optional node or hub filter
+            start: Optional first day (inclusive)
+            end: Optional last day (inclusive)
+
+        Returns:
+            Aggregates ordered by day
+        """
+        stmt = self._filtered(select(EnergyAggregate), scope, entity_id, start, end)
+        stmt = stmt.order_by(EnergyAggregate.day, EnergyAggregate.entity_id)
+        return self.db.execute(stmt).scalars().all()
+
+    def get_totals(
+        self,
+        scope: EnergyScope,
+        entity_id: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> dict[str, float]:
+        """
+        Sum the daily aggregates of a range.
+
+        Args:
+            scope: Node or hub aggregates
+            entity_id: Optional node or hub filter
+            start: Optional first day (inclusive)
+            end: Optional last day (inclusive)
+
+        Returns:
+            Dictionary with energy_kwh, session_count and avg_power_kw
+        """
+        stmt = select(
+            func.coalesce(func.sum(EnergyAggregate.energy_kwh), 0.0),
+            func.coalesce(func.sum(EnergyAggregate.session_count), 0),
+            func.coalesce(func.sum(EnergyAggregate.avg_power_sum_kw), 0.0),
+        )
+        stmt = self._filtered(stmt, scope, entity_id, start, end)
+        energy_kwh, session_count, avg_power_sum_kw = self.db.execute(stmt).one()
+
+        return {
+            "energy_kwh": float(energy_kwh),
+            "session_count": int(session_count),
+            "avg_power_kw": (
+                float(avg_power_sum_kw) / session_count if session_count else 0.0
+            ),
+        }
+
+    def rebuild(self) -> int:
+        """
+        Recompute all aggregates from the ended charging sessions.
+
+        Used to backfill the table; the regular path is add_session.
+
+        Returns:
+            Number of aggregate rows written
+        """
+        self.db.execute(delete(EnergyAggregate))
+
+        day = cast(func.timezone("UTC", ChargingSession.start_time), Date)
+        written = 0
+        for scope, entity_id in (
+            (EnergyScope.NODE, ChargingSession.node_id),
+            (EnergyScope.HUB, Node.hub_id),
+        ):
+            source = (
+                select(
+                    day,
+                    literal(scope.value),
+                    entity_id,
+                    func.sum(ChargingSession.total_energy_kwh),
+                    func.count(),
+                    func.sum(ChargingSession.avg_power_kw),
+                )
+                .join(Node, Node.node_id == ChargingSession.node_id)
+                .where(ChargingSession.end_time.is_not(None))
+                .group_by(day, entity_id)
+            )
+            result = self.db.execute(
+                insert(EnergyAggregate).from_select(
+                    [
+                        "day",
+                        "scope",
+                        "entity_id",
+                        "energy_kwh",
+                        "session_count",
+                        "avg_power_sum_kw",
+                    ],
+                    source,
+                )
+            )
+            written += result.rowcount
+
+        return written
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
-from typing import Any, Sequence
+from typing import Any, Dict, Sequence
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import DateTime, String, and_, column, func, select, update, values
 from sqlalchemy.orm import selectinload
 
 from ..models import HubDbo as Hub
@@ -69,6 +69,33 @@ class HubRepository(BaseRepository[Hub, HubCreate, HubUpdate]):
             self.db.flush()
         return hub
 
+    def bulk_update_last_seen(self, last_seen: Dict[str, datetime]) -> int:
+        """
+        Update last_seen for many hubs with one UPDATE ... FROM (VALUES ...).
+
+        Args:
+            last_seen: Mapping of hub_id to last seen timestamp
+
+        Returns:
+            Number of updated rows
+        """
+        if not last_seen:
+            return 0
+
+        seen = values(
+            column("hub_id", String),
+            column("last_seen", DateTime(timezone=True)),
+            name="seen",
+        ).data(list(last_seen.items()))
+
+        stmt = (
+            update(Hub)
+            .where(Hub.hub_id == seen.c.hub_id)
+            .values(last_seen=seen.c.last_seen)
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).rowcount
+
     def set_active(self, hub_id: str, active: bool = True) -> Hub:
         """Set hub active/inactive status."""
         return self.update(hub_id, {"is_active": active})
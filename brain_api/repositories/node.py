@@ -1,4 +1,4 @@
-from typing import Any, Sequence
+from typing import Any, Iterable, Sequence
 
 from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
@@ -20,6 +20,27 @@ class NodeRepository(BaseRepository[Node, NodeCreate, NodeUpdate]):
         """Get all nodes belonging to a hub."""
         return self.filter_by(hub_id=hub_id)
 
+    def get_nodes_by_hubs(self, hub_ids: Iterable[str]) -> Sequence[Node]:
+        """
+        Get all nodes belonging to any of the given hubs in one query.
+
+        Args:
+            hub_ids: Hub identifiers
+
+        Returns:
+            Nodes ordered by hub and node id
+        """
+        hub_ids = list(hub_ids)
+        if not hub_ids:
+            return []
+
+        stmt = (
+            select(Node)
+            .where(Node.hub_id.in_(hub_ids))
+            .order_by(Node.hub_id, Node.node_id)
+        )
+        return self.db.execute(stmt).scalars().all()
+
     def get_available_nodes(self, hub_id: str | None = None) -> Sequence[Node]:
         """
         Get nodes that are not in maintenance.
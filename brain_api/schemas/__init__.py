@@ -23,6 +23,11 @@ from .dtos.dlm_event import (
     DLMEventStats,
     DLMTriggerReason,
 )
+from .dtos.energy_aggregate import (
+    EnergyAggregateResponse,
+    EnergyReportResponse,
+    EnergyScope,
+)
 
 # DTOs
 from .dtos.hub import (
@@ -41,7 +46,12 @@ from .dtos.node import (
     NodeResponse,
     NodeUpdate,
 )
-from .dtos.recommendation import RecommendationRequest, RecommendationResponse
+from .dtos.recommendation import (
+    BulkRecommendationRequest,
+    BulkRecommendationResponse,
+    RecommendationRequest,
+    RecommendationResponse,
+)
 from .dtos.vehicle import (
     VehicleBase,
     VehicleCreate,
@@ -50,13 +60,21 @@ from .dtos.vehicle import (
     VehicleResponse,
     VehicleUpdate,
 )
-from .responses import ErrorResponse, HealthResponse, MessageResponse
+from .responses import (
+    CollectorMetricsResponse,
+    ErrorResponse,
+    ExportFormat,
+    HealthResponse,
+    MessageResponse,
+)
 
 __all__ = [
     # Response schemas
     "HealthResponse",
+    "CollectorMetricsResponse",
     "ErrorResponse",
     "MessageResponse",
+    "ExportFormat",
     # Hub DTOs
     "HubBase",
     "HubCreate",
@@ -100,7 +118,13 @@ __all__ = [
     "DLMEventListResponse",
     "DLMEventStats",
     "DLMTriggerReason",
+    # Energy aggregate DTOs
+    "EnergyScope",
+    "EnergyAggregateResponse",
+    "EnergyReportResponse",
     # Recommendation DTOs
     "RecommendationRequest",
     "RecommendationResponse",
+    "BulkRecommendationRequest",
+    "BulkRecommendationResponse",
 ]
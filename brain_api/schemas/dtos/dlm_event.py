@@ -73,6 +73,12 @@ class DLMEventListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+    total_is_estimate: bool = Field(
+        False, description="Whether total is a planner estimate"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page (None on the last page)"
+    )
 
 
 class DLMEventStats(BaseModel):
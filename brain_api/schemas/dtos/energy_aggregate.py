@@ -0,0 +1,41 @@
+from datetime import date
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class EnergyScope(str, Enum):
+    """Entity an energy aggregate refers to."""
+
+    NODE = "node"
+    HUB = "hub"
+
+
+# ==================== Response Schemas ====================
+
+
+class EnergyAggregateResponse(BaseModel):
+    """Schema for the daily energy totals of a node or hub."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date
+    scope: EnergyScope
+    entity_id: str
+    energy_kwh: float
+    session_count: int
+    avg_power_kw: float = Field(description="Average of the sessions' average power")
+
+
+class EnergyReportResponse(BaseModel):
+    """Schema for an energy report over a range of days."""
+
+    scope: EnergyScope
+    entity_id: Optional[str] = Field(None, description="Node or hub ID (all if None)")
+    start: Optional[date] = None
+    end: Optional[date] = None
+    total_energy_kwh: float
+    session_count: int
+    avg_power_kw: float = Field(description="Average of the sessions' average power")
+    days: list[EnergyAggregateResponse]
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -23,3 +25,21 @@ class RecommendationResponse(BaseModel):
         ..., description="Estimated wait time in minutes"
     )
     available_power_kw: float = Field(..., description="Available charging power in kW")
+
+
+class BulkRecommendationRequest(BaseModel):
+    """Request schema for recommendations for many vehicles at once."""
+
+    vehicles: List[RecommendationRequest] = Field(
+        ..., min_length=1, max_length=1000, description="Vehicles to recommend for"
+    )
+
+
+class BulkRecommendationResponse(BaseModel):
+    """Response schema for bulk recommendations."""
+
+    recommendations: List[Optional[RecommendationResponse]] = Field(
+        ...,
+        description="Recommendation per vehicle in request order "
+        "(null when no station is available)",
+    )
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from enum import Enum
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +17,32 @@ class HealthResponse(BaseModel):
     )
 
 
+class CollectorMetricsResponse(BaseModel):
+    """MQTT data collector write-behind pipeline metrics."""
+
+    enqueued: int = Field(..., description="Messages accepted into the queue")
+    processed: int = Field(..., description="Messages persisted successfully")
+    failed: int = Field(..., description="Messages that failed to persist")
+    dropped: int = Field(..., description="Messages dropped on a full queue")
+    blocked_enqueues: int = Field(
+        ..., description="Enqueues that had to wait for queue space"
+    )
+    batches: int = Field(..., description="Transactions committed or attempted")
+    failed_batches: int = Field(..., description="Transactions rolled back")
+    last_batch_size: int = Field(..., description="Messages in the last batch")
+    last_batch_ms: float = Field(..., description="Duration of the last batch")
+    max_batch_ms: float = Field(..., description="Slowest batch duration")
+    workers: int = Field(..., description="Number of worker threads")
+    queue_depth: int = Field(..., description="Messages waiting in all queues")
+    queue_depth_per_worker: List[int] = Field(
+        ..., description="Messages waiting per worker queue"
+    )
+    queue_capacity: int = Field(..., description="Total queue capacity")
+    queue_utilization: float = Field(
+        ..., description="Fill ratio of the fullest worker queue (0-1)"
+    )
+
+
 class ErrorResponse(BaseModel):
     """Standard error response model."""
 
@@ -29,3 +56,10 @@ class MessageResponse(BaseModel):
 
     message: str = Field(..., description="Response message")
     data: Optional[Dict[str, Any]] = Field(None, description="Additional data")
+
+
+class ExportFormat(str, Enum):
+    """Output format of the streaming export endpoints."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -1,9 +1,10 @@
 import logging
-from typing import Any, Generic, Type, TypeVar
+from typing import Any, Generic, Optional, Type, TypeVar
 
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from ..core.registry_cache import EntityCache, snapshot_entity
 from ..repositories.base import BaseRepository
 
 ModelT = TypeVar("ModelT")
@@ -34,11 +35,15 @@ class BaseService(
         UpdateSchemaT: Pydantic schema for updates
         ResponseSchemaT: Pydantic schema for single entity response
         ListResponseSchemaT: Pydantic schema for list response
+
+    Services that set ``cache`` keep it updated write-through after every
+    commit and use it for existence checks and change detection.
     """
 
     repository_class: Type[RepoT]
     response_schema: Type[ResponseSchemaT]
     list_response_schema: Type[ListResponseSchemaT]
+    cache: Optional[EntityCache] = None
 
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -51,6 +56,53 @@ class BaseService(
         entity = self.repo.get_or_raise(pk)
         return self.response_schema.model_validate(entity)
 
+    def find(self, pk: Any) -> Any | None:
+        """
+        Get an entity without raising, served from the cache when warm.
+
+        A cache miss is not taken as proof that the entity does not exist:
+        rows written outside the services (seeding, other processes, manual
+        fixes) are looked up in the database and added to the cache.
+
+        Args:
+            pk: Primary key of the entity
+
+        Returns:
+            Cached column snapshot (or the entity itself when read from the
+            database), None if it does not exist
+        """
+        if self.cache is not None and self.cache.is_warm:
+            cached = self.cache.get(pk)
+            if cached is not None:
+                return cached
+
+        entity = self.repo.get(pk)
+        if entity is not None and self.cache is not None and self.cache.is_warm:
+            self.cache.put(pk, snapshot_entity(entity))
+        return entity
+
+    def _commit_entity(self, entity: ModelT) -> ResponseSchemaT:
+        """
+        Commit the session and write the entity through to the cache.
+
+        The response and the cache snapshot are taken before committing, so
+        the expired entity does not need to be reloaded afterwards.
+
+        Args:
+            entity: Flushed entity to commit
+
+        Returns:
+            Response schema for the committed entity
+        """
+        response = self.response_schema.model_validate(entity)
+        snapshot = snapshot_entity(entity) if self.cache is not None else None
+
+        self.db.commit()
+
+        if snapshot is not None:
+            self.cache.put(getattr(snapshot, self.repo.pk_field), snapshot)
+        return response
+
     def list(self, skip: int = 0, limit: int = 100) -> ListResponseSchemaT:
         """List entities with pagination."""
         entities = self.repo.get_all(skip=skip, limit=limit)
@@ -65,27 +117,26 @@ class BaseService(
 
     def create(self, data: CreateSchemaT) -> ResponseSchemaT:
         """Create a new entity."""
-        pk = data.model_dump().get("vehicle_id")
-        vehicle = self.repo.get(pk)
+        pk = getattr(data, self.repo.pk_field, None)
 
-        if vehicle:
+        if pk is not None and self.find(pk) is not None:
             raise ValueError(
                 f"{self.repo.model.__name__} with {self.repo.pk_field}={pk} already exists."
             )
 
         entity = self.repo.create(data.model_dump())
-        self.db.commit()
+        response = self._commit_entity(entity)
         self.logger.info(
-            f"Created {self.repo.model.__name__}: {getattr(entity, self.repo.pk_field)}"
+            f"Created {self.repo.model.__name__}: {getattr(response, self.repo.pk_field)}"
         )
-        return self.response_schema.model_validate(entity)
+        return response
 
     def update(self, pk: Any, data: UpdateSchemaT) -> ResponseSchemaT:
         """Update an entity."""
         entity = self.repo.update(pk, data.model_dump(exclude_unset=True))
-        self.db.commit()
+        response = self._commit_entity(entity)
         self.logger.info(f"Updated {self.repo.model.__name__}: {pk}")
-        return self.response_schema.model_validate(entity)
+        return response
 
     def has_changes(self, pk: Any, data: UpdateSchemaT) -> bool:
         """
@@ -99,7 +150,7 @@ class BaseService(
             bool: True if there are changes, False if data is identical
         """
         try:
-            entity = self.repo.get(pk)
+            entity = self.find(pk)
             if not entity:
                 return True
 
@@ -140,7 +191,12 @@ class BaseService(
             entity = self.update(pk, data)
             return entity, True
         else:
-            entity = self.get(pk)
+            cached = self.find(pk)
+            entity = (
+                self.response_schema.model_validate(cached)
+                if cached is not None
+                else self.get(pk)
+            )
             self.logger.debug(
                 f"No changes detected for {self.repo.model.__name__}: {pk}"
             )
@@ -151,5 +207,7 @@ class BaseService(
         result = self.repo.delete(pk)
         if result:
             self.db.commit()
+            if self.cache is not None:
+                self.cache.invalidate(pk)
             self.logger.info(f"Deleted {self.repo.model.__name__}: {pk}")
         return result
@@ -1,12 +1,14 @@
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from shared.mqtt_dtos.vehicle_dto import VehicleRequest
 
+from ..core.telemetry_store import TelemetryStore, telemetry_store
 from ..repositories import NodeRepository, VehicleRepository
-from .influxdb_service import InfluxDBService
+from .influxdb_service import AsyncInfluxDBService, InfluxDBService
 
 if TYPE_CHECKING:
     from shared.services.mqtt_service import MQTTService
@@ -16,7 +18,12 @@ class ChargingRequestService:
     """Service for handling charging session initialization via QR code."""
 
     def __init__(
-        self, db: Session, mqtt_service: "MQTTService", influx_service: InfluxDBService
+        self,
+        db: Session,
+        mqtt_service: "MQTTService",
+        influx_service: InfluxDBService,
+        store: TelemetryStore = telemetry_store,
+        async_influx_service: Optional[AsyncInfluxDBService] = None,
     ) -> None:
         """
         Initialize ChargingRequestService.
@@ -25,15 +32,48 @@ class ChargingRequestService:
             db: Database session
             mqtt_service: MQTT service for publishing messages
             influx_service: InfluxDB service for retrieving vehicle telemetry
+            store: In-memory latest telemetry, queried before InfluxDB
+            async_influx_service: Shared async InfluxDB service used by
+                request_charging_async
         """
         self.db = db
         self.mqtt_service = mqtt_service
         self.influx_service = influx_service
+        self.async_influx_service = async_influx_service
+        self.telemetry_store = store
         self.node_repo = NodeRepository(db)
         self.vehicle_repo = VehicleRepository(db)
 
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    def _get_vehicle_telemetry(self, vehicle_id: str) -> Optional[dict]:
+        """
+        Get the latest vehicle telemetry, from memory when possible.
+
+        Falls back to InfluxDB only while the telemetry store does not yet
+        cover the whole staleness window.
+        """
+        telemetry = self.telemetry_store.get_vehicle(vehicle_id)
+        if telemetry is None and not self.telemetry_store.covers_window:
+            telemetry = self.influx_service.get_latest_vehicle_telemetry(vehicle_id)
+        return telemetry
+
+    async def _get_vehicle_telemetry_async(self, vehicle_id: str) -> Optional[dict]:
+        """Async variant of _get_vehicle_telemetry."""
+        telemetry = self.telemetry_store.get_vehicle(vehicle_id)
+        if telemetry is None and not self.telemetry_store.covers_window:
+            if self.async_influx_service is not None:
+                telemetry = (
+                    await self.async_influx_service.get_latest_vehicle_telemetry(
+                        vehicle_id
+                    )
+                )
+            else:
+                telemetry = await run_in_threadpool(
+                    self.influx_service.get_latest_vehicle_telemetry, vehicle_id
+                )
+        return telemetry
+
     def request_charging(self, node_id: str, vehicle_id: str) -> dict:
         """
         Request a charging session by publishing to MQTT.
@@ -45,6 +85,58 @@ class ChargingRequestService:
         Returns:
             Dict with confirmation message
 
+        Raises:
+            ValueError: If node or vehicle doesn't exist
+        """
+        hub_id = self._validate_request(node_id, vehicle_id)
+
+        telemetry = None
+        if vehicle_id:
+            try:
+                telemetry = self._get_vehicle_telemetry(vehicle_id)
+            except Exception as e:
+                self.logger.error(f"Error retrieving telemetry for {vehicle_id}: {e}")
+
+        soc_percent = self._soc_from_telemetry(vehicle_id, telemetry)
+        return self._publish_request(hub_id, node_id, vehicle_id, soc_percent)
+
+    async def request_charging_async(self, node_id: str, vehicle_id: str) -> dict:
+        """
+        Async variant of request_charging.
+
+        Vehicle telemetry missing from the telemetry store is fetched with
+        the async InfluxDB client; database queries (and the sync InfluxDB
+        fallback) run in the threadpool, so the event loop is never blocked.
+
+        Args:
+            node_id: The station/node ID from the QR code
+            vehicle_id: The vehicle ID from the mobile app
+
+        Returns:
+            Dict with confirmation message
+
+        Raises:
+            ValueError: If node or vehicle doesn't exist
+        """
+        hub_id = await run_in_threadpool(self._validate_request, node_id, vehicle_id)
+
+        telemetry = None
+        if vehicle_id:
+            try:
+                telemetry = await self._get_vehicle_telemetry_async(vehicle_id)
+            except Exception as e:
+                self.logger.error(f"Error retrieving telemetry for {vehicle_id}: {e}")
+
+        soc_percent = self._soc_from_telemetry(vehicle_id, telemetry)
+        return self._publish_request(hub_id, node_id, vehicle_id, soc_percent)
+
+    def _validate_request(self, node_id: str, vehicle_id: str) -> str:
+        """
+        Check that the node and vehicle exist.
+
+        Returns:
+            Hub ID of the node
+
         Raises:
             ValueError: If node or vehicle doesn't exist
         """
@@ -52,28 +144,33 @@ class ChargingRequestService:
         if not node:
             raise ValueError(f"Node {node_id} not found")
 
-        hub_id = node.hub_id
-
-        soc_percent = 50  # Default value if telemetry not available
         if vehicle_id:
             vehicle = self.vehicle_repo.get(vehicle_id)
             self.logger.info(f"Retrieved vehicle: {vehicle}")
             if not vehicle:
                 raise ValueError(f"Vehicle {vehicle_id} not found")
 
-            try:
-                telemetry = self.influx_service.get_latest_vehicle_telemetry(vehicle_id)
-                if telemetry and "battery_level" in telemetry:
-                    soc_percent = int(telemetry["battery_level"])
-                    self.logger.info(f"Retrieved SOC from telemetry: {soc_percent}%")
-                else:
-                    self.logger.warning(
-                        f"No battery_level in telemetry for {vehicle_id}, using default {soc_percent}%"
-                    )
-            except Exception as e:
-                self.logger.error(
-                    f"Error retrieving telemetry for {vehicle_id}: {e}. Using default {soc_percent}%"
-                )
+        return node.hub_id  # type: ignore[return-value]
+
+    def _soc_from_telemetry(self, vehicle_id: str, telemetry: Optional[dict]) -> int:
+        """Extract the SoC from vehicle telemetry, defaulting to 50%."""
+        soc_percent = 50  # Default value if telemetry not available
+        if not vehicle_id:
+            return soc_percent
+
+        if telemetry and "battery_level" in telemetry:
+            soc_percent = int(telemetry["battery_level"])
+            self.logger.info(f"Retrieved SOC from telemetry: {soc_percent}%")
+        else:
+            self.logger.warning(
+                f"No battery_level in telemetry for {vehicle_id}, using default {soc_percent}%"
+            )
+        return soc_percent
+
+    def _publish_request(
+        self, hub_id: str, node_id: str, vehicle_id: str, soc_percent: int
+    ) -> dict:
+        """Publish the charging request to the hub."""
         topic = f"iot/hubs/{hub_id}/requests"
         payload = VehicleRequest(
             node_id=node_id, vehicle_id=vehicle_id, soc_percent=soc_percent
@@ -1,9 +1,15 @@
+from datetime import date, timezone
 from typing import List
 
 from sqlalchemy.orm import Session
 
 from ..models import ChargingSessionDbo
-from ..repositories import ChargingSessionRepository, NodeRepository, VehicleRepository
+from ..repositories import (
+    ChargingSessionRepository,
+    EnergyAggregateRepository,
+    NodeRepository,
+    VehicleRepository,
+)
 from ..schemas import (
     ChargingSessionCreate,
     ChargingSessionEnd,
@@ -11,6 +17,9 @@ from ..schemas import (
     ChargingSessionResponse,
     ChargingSessionStart,
     ChargingSessionUpdate,
+    EnergyAggregateResponse,
+    EnergyReportResponse,
+    EnergyScope,
 )
 from .base import BaseService
 
@@ -35,6 +44,7 @@ class ChargingSessionService(
         super().__init__(db)
         self.node_repo = NodeRepository(db)
         self.vehicle_repo = VehicleRepository(db)
+        self.energy_repo = EnergyAggregateRepository(db)
 
     def list(
         self,
@@ -81,12 +91,49 @@ class ChargingSessionService(
         return ChargingSessionResponse.model_validate(session)
 
     def end(self, session_id: int, data: ChargingSessionEnd) -> ChargingSessionResponse:
-        """End a charging session."""
+        """End an active charging session and add it to the energy aggregates."""
         session = self.repo.end_session(
             session_id,
             data.total_energy_kwh,
             data.avg_power_kw,
         )
+        if session is None:
+            session = self.repo.get_or_raise(session_id)
+            return ChargingSessionResponse.model_validate(session)
+
+        start_time = session.start_time
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        node = self.node_repo.get_or_raise(session.node_id)
+        self.energy_repo.add_session(
+            day=start_time.astimezone(timezone.utc).date(),
+            node_id=node.node_id,
+            hub_id=node.hub_id,
+            energy_kwh=data.total_energy_kwh,
+            avg_power_kw=data.avg_power_kw,
+        )
         self.db.commit()
         self.logger.info(f"Ended session {session_id}: {data.total_energy_kwh} kWh")
         return ChargingSessionResponse.model_validate(session)
+
+    def get_energy_report(
+        self,
+        scope: EnergyScope = EnergyScope.NODE,
+        entity_id: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> EnergyReportResponse:
+        """Get daily and total energy of nodes or hubs from the aggregates."""
+        days = self.energy_repo.get_daily(scope, entity_id, start, end)
+        totals = self.energy_repo.get_totals(scope, entity_id, start, end)
+
+        return EnergyReportResponse(
+            scope=scope,
+            entity_id=entity_id,
+            start=start,
+            end=end,
+            total_energy_kwh=totals["energy_kwh"],
+            session_count=totals["session_count"],
+            avg_power_kw=totals["avg_power_kw"],
+            days=[EnergyAggregateResponse.model_validate(d) for d in days],
+        )
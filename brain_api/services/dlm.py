@@ -1,9 +1,17 @@
-from typing import List
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Tuple
 
 from sqlalchemy.orm import Session
 
 from ..models import DLMEventDbo
-from ..repositories import DLMEventRepository, HubRepository, NodeRepository
+from ..repositories import (
+    DLMEventRepository,
+    HubRepository,
+    NodeRepository,
+    NotFoundError,
+)
 from ..schemas import (
     DLMEventCreate,
     DLMEventListResponse,
@@ -13,6 +21,27 @@ from ..schemas import (
 from .base import BaseService
 
 
+def encode_cursor(timestamp: datetime, dlm_event_id: int) -> str:
+    """Encode an event's keyset position as an opaque cursor."""
+    raw = f"{timestamp.isoformat()}|{dlm_event_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, dlm_event_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(dlm_event_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
 class DLMService(
     BaseService[
         DLMEventDbo,
@@ -40,23 +69,41 @@ class DLMService(
         node_id: str | None = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: str | None = None,
+        exact_total: bool = False,
     ) -> DLMEventListResponse:
-        """List DLM events with pagination, optionally filtering by hub or node."""
-        if hub_id:
-            events = self.repo.get_events_by_hub(hub_id)
-            total = len(list(events))
-        elif node_id:
-            events = self.repo.get_events_by_node(node_id)
-            total = len(list(events))
+        """
+        List DLM events newest first, optionally filtering by hub or node.
+
+        Pass the returned ``next_cursor`` back to get the following page.
+        ``total`` is a planner estimate unless ``exact_total`` is set.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        before = decode_cursor(cursor) if cursor else None
+        events = self.repo.list_events(
+            hub_id=hub_id, node_id=node_id, before=before, skip=skip, limit=limit + 1
+        )
+
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            last = events[-1]
+            next_cursor = encode_cursor(last.timestamp, last.dlm_event_id)
+
+        if exact_total:
+            total = self.repo.count_events(hub_id=hub_id, node_id=node_id)
         else:
-            events = self.repo.get_all(skip=skip, limit=limit)
-            total = self.repo.count()
+            total = self.repo.estimate_events(hub_id=hub_id, node_id=node_id)
 
         return DLMEventListResponse(
             items=[DLMEventResponse.model_validate(e) for e in events],
             total=total,
             skip=skip,
             limit=limit,
+            total_is_estimate=not exact_total,
+            next_cursor=next_cursor,
         )
 
     def get_recent(self, hours: int = 24, limit: int = 100) -> List[DLMEventResponse]:
@@ -81,3 +128,35 @@ class DLMService(
         self.db.commit()
         self.logger.info(f"DLM Event: {data.trigger_reason} on {data.node_id}")
         return DLMEventResponse.model_validate(event)
+
+    def log_many(self, hub_id: str, items: List[DLMEventLog]) -> int:
+        """
+        Log a batch of DLM events for one hub in a single transaction.
+
+        Raises:
+            NotFoundError: If the hub or any referenced node does not exist
+        """
+        self.hub_repo.get_or_raise(hub_id)
+
+        known_nodes = {n.node_id for n in self.node_repo.get_nodes_by_hub(hub_id)}
+        for data in items:
+            if data.node_id not in known_nodes:
+                raise NotFoundError(f"NodeDbo with node_id={data.node_id} not found")
+
+        count = self.repo.log_events(
+            [
+                {
+                    "hub_id": hub_id,
+                    "node_id": data.node_id,
+                    "trigger_reason": data.trigger_reason,
+                    "total_grid_load_kw": data.total_grid_load_kw,
+                    "original_limit_kw": data.original_limit_kw,
+                    "new_limit_kw": data.new_limit_kw,
+                    "available_capacity_at_trigger": data.available_capacity_at_trigger,
+                }
+                for data in items
+            ]
+        )
+        self.db.commit()
+        self.logger.info(f"DLM Events: logged {count} events for hub {hub_id}")
+        return count
@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..db.session import SessionLocal
+from ..schemas import ExportFormat
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+CHUNK_SIZE = 64 * 1024
+"""Encoded bytes buffered before a chunk is handed to the response."""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def stream_in_session(fetch: Callable[[Session], Iterable[Any]]) -> Iterator[Any]:
+    """
+    Iterate over ``fetch(db)`` with a session owned by the iterator.
+
+    Streaming responses are consumed after the request dependencies have
+    been closed, so the export cannot use the request's session.
+    """
+    with SessionLocal() as db:
+        yield from fetch(db)
+
+
+def _encode_ndjson(rows: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(row), default=_json_default) + "\n"
+
+
+def _encode_csv(
+    rows: Iterable[Mapping[str, Any]], columns: Sequence[str]
+) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def encode_export(
+    rows: Iterable[Mapping[str, Any]],
+    columns: Sequence[str],
+    fmt: ExportFormat,
+    compress: bool = False,
+) -> Iterator[bytes]:
+    """
+    Encode rows as NDJSON or CSV, in chunks of about CHUNK_SIZE bytes.
+
+    Args:
+        rows: Row mappings, consumed lazily
+        columns: Column order (CSV header)
+        fmt: Output format
+        compress: Gzip the output
+
+    Returns:
+        Iterator of encoded chunks
+    """
+    if fmt == ExportFormat.NDJSON:
+        lines = _encode_ndjson(rows)
+    else:
+        lines = _encode_csv(rows, columns)
+    compressor = zlib.compressobj(wbits=31) if compress else None  # gzip framing
+
+    pending: list[bytes] = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        pending.append(data)
+        size += len(data)
+        if size >= CHUNK_SIZE:
+            chunk = b"".join(pending)
+            pending.clear()
+            size = 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+
+    chunk = b"".join(pending)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def export_headers(
+    name: str, fmt: ExportFormat, compress: bool = False
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Media type and download headers of an export.
+
+    Args:
+        name: Base file name
+        fmt: Output format
+        compress: Whether the output is gzipped
+
+    Returns:
+        Tuple of (media type, headers)
+    """
+    filename = f"{name}.{fmt.value}"
+    media_type = MEDIA_TYPES[fmt]
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return media_type, {"Content-Disposition": f'attachment; filename="{filename}"'}
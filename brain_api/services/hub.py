@@ -1,3 +1,6 @@
+from typing import Any
+
+from ..core.registry_cache import registry_cache
 from ..models import HubDbo
 from ..repositories import HubRepository
 from ..schemas import HubCreate, HubListResponse, HubResponse, HubUpdate
@@ -19,6 +22,7 @@ class HubService(
     repository_class = HubRepository
     response_schema = HubResponse
     list_response_schema = HubListResponse
+    cache = registry_cache.hubs
 
     def list(
         self,
@@ -44,11 +48,16 @@ class HubService(
     def activate(self, hub_id: str) -> HubResponse:
         """Activate a hub."""
         hub = self.repo.set_active(hub_id, True)
-        self.db.commit()
-        return HubResponse.model_validate(hub)
+        return self._commit_entity(hub)
 
     def deactivate(self, hub_id: str) -> HubResponse:
         """Deactivate a hub."""
         hub = self.repo.set_active(hub_id, False)
-        self.db.commit()
-        return HubResponse.model_validate(hub)
+        return self._commit_entity(hub)
+
+    def delete(self, pk: Any) -> bool:
+        """Delete a hub (its nodes are deleted by cascade)."""
+        result = super().delete(pk)
+        if result:
+            registry_cache.nodes.invalidate_where(lambda node: node.hub_id == pk)
+        return result
@@ -0,0 +1,228 @@
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from influxdb_client import (
+    BucketRetentionRules,
+    InfluxDBClient,
+    TaskCreateRequest,
+    TaskUpdateRequest,
+)
+
+from ..core.config import settings
+
+ROLLUP_MEASUREMENT = "node_power"
+
+# One task per resolution downsamples the raw node power into windows
+# stamped with their start time. Energy is mean power times window length,
+# so samples straddling two windows are not lost as with a per-window
+# integral().
+ROLLUP_TASK_FLUX = """option task = {{name: "{task_name}", every: {every}, offset: {offset}}}
+
+data = from(bucket: "{source_bucket}")
+  |> range(start: -task.every)
+  |> filter(fn: (r) => r._measurement == "node_telemetry" and r._field == "power_kw")
+  |> keep(columns: ["_start", "_stop", "_time", "_value", "_field", "hub_id", "node_id"])
+
+rollup = (fn, field) => data
+  |> aggregateWindow(every: task.every, fn: fn, timeSrc: "_start", createEmpty: false)
+  |> toFloat()
+  |> set(key: "_field", value: field)
+
+mean = rollup(fn: mean, field: "power_kw_mean")
+energy = mean
+  |> map(fn: (r) => ({{r with _value: r._value * {window_hours}}}))
+  |> set(key: "_field", value: "energy_kwh")
+
+union(
+    tables: [
+        mean,
+        energy,
+        rollup(fn: sum, field: "power_kw_sum"),
+        rollup(fn: count, field: "power_kw_count"),
+    ],
+)
+  |> set(key: "_measurement", value: "{measurement}")
+  |> to(bucket: "{target_bucket}")
+"""
+
+
+def _duration(value: timedelta) -> str:
+    """Format a timedelta as a Flux duration literal."""
+    return f"{int(value.total_seconds())}s"
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """A downsampled copy of node power at a fixed resolution."""
+
+    name: str
+    every: timedelta
+    bucket: str
+    retention: Optional[timedelta] = None
+
+    @property
+    def task_name(self) -> str:
+        """Name of the InfluxDB task writing the rollup."""
+        return f"{self.bucket}_rollup"
+
+    def floor(self, value: datetime) -> datetime:
+        """Start of the window containing ``value`` (windows are epoch aligned)."""
+        step = self.every.total_seconds()
+        return datetime.fromtimestamp(
+            math.floor(value.timestamp() / step) * step, tz=timezone.utc
+        )
+
+    def ceil(self, value: datetime) -> datetime:
+        """First window boundary at or after ``value``."""
+        step = self.every.total_seconds()
+        return datetime.fromtimestamp(
+            math.ceil(value.timestamp() / step) * step, tz=timezone.utc
+        )
+
+
+class InfluxRollups:
+    """
+    Continuous rollups of node power and resolution routing.
+
+    ``ensure`` creates (or updates) one bucket and one InfluxDB task per
+    rollup. A rollup is only used for the part of a query range it has
+    fully processed: windows after its task was created and old enough
+    for the task to have run.
+    """
+
+    def __init__(
+        self,
+        source_bucket: str,
+        rollups: List[Rollup],
+        task_offset: timedelta = timedelta(seconds=30),
+        min_windows: int = 60,
+    ) -> None:
+        """
+        Initialize rollups.
+
+        Args:
+            source_bucket: Bucket with the raw telemetry
+            rollups: Rollup resolutions, finest first
+            task_offset: Delay between the end of a window and its task run
+            min_windows: Minimum number of windows a range must span for a
+                rollup to be used, bounding the error at its edges
+        """
+        self.source_bucket = source_bucket
+        self.rollups = rollups
+        self.task_offset = task_offset
+        self.min_windows = min_windows
+
+        # rollup name -> start of the first window the rollup covers
+        self.available_since: Dict[str, datetime] = {}
+
+        self.logger = logging.getLogger("InfluxRollups")
+
+    def task_flux(self, rollup: Rollup) -> str:
+        """Flux script of the task maintaining a rollup."""
+        return ROLLUP_TASK_FLUX.format(
+            task_name=rollup.task_name,
+            every=_duration(rollup.every),
+            offset=_duration(self.task_offset),
+            source_bucket=self.source_bucket,
+            target_bucket=rollup.bucket,
+            measurement=ROLLUP_MEASUREMENT,
+            window_hours=repr(rollup.every.total_seconds() / 3600),
+        )
+
+    def ensure(self, client: InfluxDBClient) -> None:
+        """
+        Create missing rollup buckets and tasks, and update outdated tasks.
+
+        Args:
+            client: InfluxDB client with permission to manage buckets and tasks
+        """
+        buckets_api = client.buckets_api()
+        tasks_api = client.tasks_api()
+
+        for rollup in self.rollups:
+            if buckets_api.find_bucket_by_name(rollup.bucket) is None:
+                retention = (
+                    BucketRetentionRules(
+                        every_seconds=int(rollup.retention.total_seconds())
+                    )
+                    if rollup.retention
+                    else []
+                )
+                buckets_api.create_bucket(
+                    bucket_name=rollup.bucket,
+                    retention_rules=retention,
+                    org=settings.INFLUXDB_ORG,
+                )
+                self.logger.info(f"Created rollup bucket {rollup.bucket}")
+
+            flux = self.task_flux(rollup)
+            tasks = tasks_api.find_tasks(name=rollup.task_name)
+            if not tasks:
+                task = tasks_api.create_task(
+                    task_create_request=TaskCreateRequest(
+                        flux=flux, org=settings.INFLUXDB_ORG, status="active"
+                    )
+                )
+                self.logger.info(f"Created rollup task {rollup.task_name}")
+            else:
+                task = tasks[0]
+                if task.flux != flux or task.status != "active":
+                    tasks_api.update_task_request(
+                        task.id, TaskUpdateRequest(flux=flux, status="active")
+                    )
+                    self.logger.info(f"Updated rollup task {rollup.task_name}")
+
+            created_at = task.created_at or datetime.now(timezone.utc)
+            self.available_since[rollup.name] = rollup.ceil(created_at)
+
+    def select(self, start: datetime, stop: datetime) -> Optional[Rollup]:
+        """
+        Pick the coarsest rollup suitable for a time range.
+
+        A rollup is skipped when the range starts before its retention, as
+        its oldest windows are already deleted.
+
+        Args:
+            start: Range start (timezone aware)
+            stop: Range stop (timezone aware)
+
+        Returns:
+            The rollup to use, or None to query the raw data
+        """
+        now = datetime.now(timezone.utc)
+        for rollup in reversed(self.rollups):
+            since = self.available_since.get(rollup.name)
+            if since is None or rollup.ceil(start) < since:
+                continue
+            if rollup.retention is not None and start < now - rollup.retention:
+                continue
+            if stop - start >= rollup.every * self.min_windows:
+                return rollup
+        return None
+
+    def processed_until(self, rollup: Rollup, now: datetime) -> datetime:
+        """End of the last window the rollup task has had time to write."""
+        # One extra window of slack for late points and slow task runs
+        return rollup.floor(now - self.task_offset - rollup.every)
+
+
+influx_rollups = InfluxRollups(
+    source_bucket=settings.INFLUXDB_BUCKET,
+    rollups=[
+        Rollup(
+            name="1m",
+            every=timedelta(minutes=1),
+            bucket=f"{settings.INFLUXDB_BUCKET}_1m",
+            retention=timedelta(days=settings.INFLUXDB_ROLLUP_1M_RETENTION_DAYS),
+        ),
+        Rollup(
+            name="15m",
+            every=timedelta(minutes=15),
+            bucket=f"{settings.INFLUXDB_BUCKET}_15m",
+        ),
+    ],
+    min_windows=settings.INFLUXDB_ROLLUP_MIN_WINDOWS,
+)
@@ -1,11 +1,176 @@
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional, Tuple
 
+from influxdb_client.client.flux_table import TableList
 from influxdb_client.client.influxdb_client import InfluxDBClient
+from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
 from influxdb_client.client.query_api import QueryApi
+from influxdb_client.client.query_api_async import QueryApiAsync
 
 from ..core.config import settings
+from .influx_rollups import ROLLUP_MEASUREMENT, influx_rollups
+
+# Flux queries are constant and take their inputs as ``params`` (sent as
+# ``_name`` options), so no query text is built per call and ids never need
+# escaping. Filters are combined in a single predicate so they can be pushed
+# down to the storage engine, and keep() drops unused columns before they
+# are shipped.
+
+SESSION_METRICS_QUERY = """
+data = from(bucket: _bucket)
+  |> range(start: _start, stop: _stop)
+  |> filter(fn: (r) =>
+      r._measurement == "node_telemetry"
+      and r._field == "power_kw"
+      and r.node_id == _node_id)
+  |> keep(columns: ["_start", "_stop", "_time", "_value", "_field", "node_id"])
+
+data |> integral(unit: 1h) |> yield(name: "energy")
+data |> sum() |> yield(name: "sum")
+data |> count() |> yield(name: "count")
+"""
+
+ROLLUP_SESSION_METRICS_QUERY = """
+data = from(bucket: _bucket)
+  |> range(start: _start, stop: _stop)
+  |> filter(fn: (r) => r._measurement == _measurement and r.node_id == _node_id)
+  |> keep(columns: ["_start", "_stop", "_time", "_value", "_field", "node_id"])
+
+data |> filter(fn: (r) => r._field == "energy_kwh") |> sum() |> yield(name: "energy")
+data |> filter(fn: (r) => r._field == "power_kw_sum") |> sum() |> yield(name: "sum")
+data |> filter(fn: (r) => r._field == "power_kw_count") |> sum() |> yield(name: "count")
+"""
+
+LATEST_NODE_TELEMETRY_QUERY = """
+from(bucket: _bucket)
+  |> range(start: -1h)
+  |> filter(fn: (r) =>
+      r._measurement == "node_telemetry" and r.node_id == _node_id)
+  |> keep(columns: ["_time", "_value", "_field", "node_id"])
+  |> last()
+"""
+
+NODES_CURRENT_STATE_QUERY = """
+from(bucket: _bucket)
+  |> range(start: -1h)
+  |> filter(fn: (r) =>
+      r._measurement == "node_telemetry"
+      and contains(value: r._field, set: _fields)
+      and contains(value: r.node_id, set: _node_ids))
+  |> keep(columns: ["_time", "_value", "_field", "node_id"])
+  |> last()
+"""
+
+LATEST_VEHICLE_TELEMETRY_QUERY = """
+from(bucket: _bucket)
+  |> range(start: -1h)
+  |> filter(fn: (r) =>
+      r._measurement == "vehicle_telemetry" and r.vehicle_id == _vehicle_id)
+  |> keep(columns: ["_time", "_value", "_field", "vehicle_id"])
+  |> last()
+"""
+
+NODE_STATE_FIELDS = [
+    "is_occupied",
+    "power_kw",
+    "power_limit_kw",
+    "current_vehicle_soc",
+]
+"""Node telemetry fields returned by get_nodes_current_state."""
+
+
+def _session_metrics_queries(
+    bucket: str, node_id: str, start_time: datetime, end_time: Optional[datetime]
+) -> List[Tuple[str, dict]]:
+    """
+    Plan the queries for a session's power totals (naive times are UTC).
+
+    Long ranges read the coarsest suitable rollup for the windows it has
+    already processed; the partial windows at both ends are read raw.
+
+    Returns:
+        (query, params) pairs whose totals add up to the whole range
+    """
+    now = datetime.now(timezone.utc)
+    start = _as_utc(start_time)
+    stop = _as_utc(end_time) if end_time else now
+
+    def raw(seg_start: datetime, seg_stop: datetime) -> Tuple[str, dict]:
+        params = {
+            "_bucket": bucket,
+            "_node_id": node_id,
+            "_start": seg_start,
+            "_stop": seg_stop,
+        }
+        return SESSION_METRICS_QUERY, params
+
+    rollup = influx_rollups.select(start, stop)
+    if rollup is None:
+        return [raw(start, stop)]
+
+    rollup_start = rollup.ceil(start)
+    rollup_stop = min(rollup.floor(stop), influx_rollups.processed_until(rollup, now))
+    if rollup_stop <= rollup_start:
+        return [raw(start, stop)]
+
+    queries = [
+        (
+            ROLLUP_SESSION_METRICS_QUERY,
+            {
+                "_bucket": rollup.bucket,
+                "_measurement": ROLLUP_MEASUREMENT,
+                "_node_id": node_id,
+                "_start": rollup_start,
+                "_stop": rollup_stop,
+            },
+        )
+    ]
+    if start < rollup_start:
+        queries.append(raw(start, rollup_start))
+    if rollup_stop < stop:
+        queries.append(raw(rollup_stop, stop))
+    return queries
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _parse_session_metrics(results: List[TableList]) -> dict[str, float]:
+    """Combine the energy/sum/count totals of session queries into metrics."""
+    totals = {"energy": 0.0, "sum": 0.0, "count": 0.0}
+    for result in results:
+        for table in result:
+            for record in table.records:
+                if record["result"] in totals and record.get_value() is not None:
+                    totals[record["result"]] += float(record.get_value())
+
+    avg_power = totals["sum"] / totals["count"] if totals["count"] else 0.0
+    return {
+        "total_energy_kwh": round(totals["energy"], 3),
+        "avg_power_kw": round(avg_power, 3),
+    }
+
+
+def _parse_fields(result: TableList) -> dict:
+    """Map field name to value for a single-series query result."""
+    telemetry = {}
+    for table in result:
+        for record in table.records:
+            telemetry[record.get_field()] = record.get_value()
+    return telemetry
+
+
+def _parse_nodes_state(result: TableList) -> dict[str, dict]:
+    """Map node_id to its field values for a multi-node query result."""
+    nodes_state: dict[str, dict] = {}
+    for table in result:
+        for record in table.records:
+            node_id = record.values.get("node_id")
+            nodes_state.setdefault(node_id, {})[record.get_field()] = record.get_value()
+    return nodes_state
 
 
 class InfluxDBService:
@@ -37,35 +202,17 @@ class InfluxDBService:
         Returns:
             Dictionary with total_energy_kwh and avg_power_kw
         """
-        start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
-
-        now_utc = datetime.now(timezone.utc)
-        end_time_val = end_time if end_time else now_utc
-        end_time_str = end_time_val.strftime("%Y-%m-%dT%H:%M:%S")
-
-        query = f"""
-        data = from(bucket: "{self.bucket}")
-          |> range(start: {start_time_str}Z, stop: {end_time_str}Z)
-          |> filter(fn: (r) => r["_measurement"] == "node_telemetry")
-          |> filter(fn: (r) => r["node_id"] == "{node_id}")
-          |> filter(fn: (r) => r["_field"] == "power_kw")
-        
-        data |> mean() |> yield(name: "avg")
-        data |> integral(unit: 1h) |> yield(name: "energy")
-        """
+        queries = _session_metrics_queries(self.bucket, node_id, start_time, end_time)
 
         try:
-            result = self.query_api.query(query=query, org=settings.INFLUXDB_ORG)
-
-            metrics = {"total_energy_kwh": 0.0, "avg_power_kw": 0.0}
-            for table in result:
-                for record in table.records:
-                    if record["result"] == "avg":
-                        metrics["avg_power_kw"] = round(float(record.get_value()), 3)
-                    elif record["result"] == "energy":
-                        metrics["total_energy_kwh"] = round(
-                            float(record.get_value()), 3
-                        )
+            results = [
+                self.query_api.query(
+                    query=query, org=settings.INFLUXDB_ORG, params=params
+                )
+                for query, params in queries
+            ]
+
+            metrics = _parse_session_metrics(results)
 
             self.logger.debug(
                 f"Session metrics for node {node_id}: "
@@ -88,23 +235,16 @@ class InfluxDBService:
         Returns:
             Dictionary with latest telemetry data or None if not found
         """
-        query = f"""
-        from(bucket: "{self.bucket}")
-          |> range(start: -1h)
-          |> filter(fn: (r) => r["_measurement"] == "node_telemetry")
-          |> filter(fn: (r) => r["node_id"] == "{node_id}")
-          |> last()
-        """
+        params = {"_bucket": self.bucket, "_node_id": node_id}
 
         try:
-            result = self.query_api.query(query=query, org=settings.INFLUXDB_ORG)
+            result = self.query_api.query(
+                query=LATEST_NODE_TELEMETRY_QUERY,
+                org=settings.INFLUXDB_ORG,
+                params=params,
+            )
 
-            telemetry = {}
-            for table in result:
-                for record in table.records:
-                    field = record.get_field()
-                    value = record.get_value()
-                    telemetry[field] = value
+            telemetry = _parse_fields(result)
 
             if telemetry:
                 self.logger.debug(f"Latest telemetry for node {node_id}: {telemetry}")
@@ -129,29 +269,20 @@ class InfluxDBService:
         if not node_ids:
             return {}
 
-        node_filter = " or ".join([f'r["node_id"] == "{nid}"' for nid in node_ids])
-
-        query = f"""
-        from(bucket: "{self.bucket}")
-          |> range(start: -1h)
-          |> filter(fn: (r) => r["_measurement"] == "node_telemetry")
-          |> filter(fn: (r) => {node_filter})
-          |> last()
-        """
+        params = {
+            "_bucket": self.bucket,
+            "_node_ids": list(node_ids),
+            "_fields": NODE_STATE_FIELDS,
+        }
 
         try:
-            result = self.query_api.query(query=query, org=settings.INFLUXDB_ORG)
-
-            nodes_state = {}
-            for table in result:
-                for record in table.records:
-                    node_id = record.values.get("node_id")
-                    if node_id not in nodes_state:
-                        nodes_state[node_id] = {}
+            result = self.query_api.query(
+                query=NODES_CURRENT_STATE_QUERY,
+                org=settings.INFLUXDB_ORG,
+                params=params,
+            )
 
-                    field = record.get_field()
-                    value = record.get_value()
-                    nodes_state[node_id][field] = value
+            nodes_state = _parse_nodes_state(result)
 
             self.logger.debug(f"Retrieved state for {len(nodes_state)} nodes")
             return nodes_state
@@ -170,23 +301,16 @@ class InfluxDBService:
         Returns:
             Dictionary with latest telemetry data (including battery_level) or None if not found
         """
-        query = f"""
-        from(bucket: "{self.bucket}")
-          |> range(start: -1h)
-          |> filter(fn: (r) => r["_measurement"] == "vehicle_telemetry")
-          |> filter(fn: (r) => r["vehicle_id"] == "{vehicle_id}")
-          |> last()
-        """
+        params = {"_bucket": self.bucket, "_vehicle_id": vehicle_id}
 
         try:
-            result = self.query_api.query(query=query, org=settings.INFLUXDB_ORG)
+            result = self.query_api.query(
+                query=LATEST_VEHICLE_TELEMETRY_QUERY,
+                org=settings.INFLUXDB_ORG,
+                params=params,
+            )
 
-            telemetry = {}
-            for table in result:
-                for record in table.records:
-                    field = record.get_field()
-                    value = record.get_value()
-                    telemetry[field] = value
+            telemetry = _parse_fields(result)
 
             if telemetry:
                 self.logger.debug(
@@ -205,3 +329,145 @@ class InfluxDBService:
         """Close InfluxDB client connection."""
         if self.client:
             self.client.close()
+
+
+class AsyncInfluxDBService:
+    """
+    Non-blocking variant of InfluxDBService for async request handlers.
+
+    A single instance is meant to be shared by the whole application: the
+    underlying ``InfluxDBClientAsync`` keeps a pool of HTTP connections
+    that are reused across requests. The client is created lazily because
+    it must be bound to the running event loop.
+    """
+
+    def __init__(self, connection_pool_maxsize: int = 20):
+        """
+        Initialize the service.
+
+        Args:
+            connection_pool_maxsize: Maximum simultaneous HTTP connections
+        """
+        self.connection_pool_maxsize = connection_pool_maxsize
+        self.client: Optional[InfluxDBClientAsync] = None
+        self._query_api: Optional[QueryApiAsync] = None
+        self.bucket = settings.INFLUXDB_BUCKET
+
+        self.logger = logging.getLogger("AsyncInfluxDBService")
+
+    @property
+    def query_api(self) -> QueryApiAsync:
+        """Async query API of the shared client (created on first use)."""
+        if self._query_api is None:
+            self.client = InfluxDBClientAsync(
+                url=settings.INFLUXDB_URL,
+                token=settings.INFLUXDB_TOKEN,
+                org=settings.INFLUXDB_ORG,
+                connection_pool_maxsize=self.connection_pool_maxsize,
+            )
+            self._query_api = self.client.query_api()
+        return self._query_api
+
+    async def get_session_metrics(
+        self, node_id: str, start_time: datetime, end_time: Optional[datetime] = None
+    ) -> dict[str, float]:
+        """
+        Get aggregated metrics for a charging session.
+
+        Args:
+            node_id: Node identifier
+            start_time: Session start time
+            end_time: Session end time (None for ongoing sessions)
+
+        Returns:
+            Dictionary with total_energy_kwh and avg_power_kw
+        """
+        queries = _session_metrics_queries(self.bucket, node_id, start_time, end_time)
+
+        try:
+            results = await asyncio.gather(
+                *(
+                    self.query_api.query(
+                        query=query, org=settings.INFLUXDB_ORG, params=params
+                    )
+                    for query, params in queries
+                )
+            )
+            return _parse_session_metrics(results)
+
+        except Exception as e:
+            self.logger.error(f"Error querying InfluxDB for session metrics: {e}")
+            return {"total_energy_kwh": 0.0, "avg_power_kw": 0.0}
+
+    async def get_nodes_current_state(self, node_ids: list[str]) -> dict[str, dict]:
+        """
+        Get current state for multiple nodes.
+
+        Args:
+            node_ids: List of node identifiers
+
+        Returns:
+            Dictionary mapping node_id to telemetry data
+        """
+        if not node_ids:
+            return {}
+
+        params = {
+            "_bucket": self.bucket,
+            "_node_ids": list(node_ids),
+            "_fields": NODE_STATE_FIELDS,
+        }
+
+        try:
+            result = await self.query_api.query(
+                query=NODES_CURRENT_STATE_QUERY,
+                org=settings.INFLUXDB_ORG,
+                params=params,
+            )
+
+            nodes_state = _parse_nodes_state(result)
+
+            self.logger.debug(f"Retrieved state for {len(nodes_state)} nodes")
+            return nodes_state
+
+        except Exception as e:
+            self.logger.error(f"Error querying InfluxDB for nodes state: {e}")
+            return {}
+
+    async def get_latest_vehicle_telemetry(self, vehicle_id: str) -> Optional[dict]:
+        """
+        Get the latest telemetry data for a specific vehicle.
+
+        Args:
+            vehicle_id: Vehicle identifier
+
+        Returns:
+            Dictionary with latest telemetry data (including battery_level) or None if not found
+        """
+        params = {"_bucket": self.bucket, "_vehicle_id": vehicle_id}
+
+        try:
+            result = await self.query_api.query(
+                query=LATEST_VEHICLE_TELEMETRY_QUERY,
+                org=settings.INFLUXDB_ORG,
+                params=params,
+            )
+
+            telemetry = _parse_fields(result)
+
+            if telemetry:
+                return telemetry
+
+            self.logger.warning(f"No telemetry found for vehicle {vehicle_id}")
+            return None
+
+        except Exception as e:
+            self.logger.error(f"Error querying InfluxDB for vehicle telemetry: {e}")
+            return None
+
+    async def close(self):
+        """Close the shared client and its connection pool."""
+        if self.client:
+            await self.client.close()
+            self.client = None
+            self._query_api = None
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 
+from ..core.registry_cache import registry_cache
 from ..models import NodeDbo
 from ..repositories import HubRepository, NodeRepository
 from ..schemas import NodeCreate, NodeListResponse, NodeResponse, NodeUpdate
@@ -21,6 +22,7 @@ class NodeService(
     repository_class = NodeRepository
     response_schema = NodeResponse
     list_response_schema = NodeListResponse
+    cache = registry_cache.nodes
 
     def __init__(self, db: Session) -> None:
         super().__init__(db)
@@ -55,5 +57,4 @@ class NodeService(
     def set_maintenance(self, node_id: str, maintenance: bool) -> NodeResponse:
         """Set node maintenance status."""
         node = self.repo.set_maintenance(node_id, maintenance)
-        self.db.commit()
-        return NodeResponse.model_validate(node)
+        return self._commit_entity(node)
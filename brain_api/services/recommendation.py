@@ -1,144 +1,416 @@
 import logging
-import math
-from typing import List, Optional
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+from ..core.config import settings
+from ..core.recommendation_cache import RecommendationCache, recommendation_cache
+from ..core.registry_cache import registry_cache
+from ..core.spatial_index import HubSpatialIndex, haversine_km, hub_index
+from ..core.telemetry_store import TelemetryStore, telemetry_store
 from ..repositories import HubRepository, NodeRepository
 from ..schemas import RecommendationRequest, RecommendationResponse
-from .influxdb_service import InfluxDBService
+from .influxdb_service import AsyncInfluxDBService, InfluxDBService
+from .recommendation_kernel import assign_nodes, best_nodes, score_candidates
+
+
+@dataclass
+class CandidateNodes:
+    """Nodes that can be recommended, with column arrays for scoring."""
+
+    nodes: list
+    node_ids: List[str]
+    hubs: List[SimpleNamespace]
+    lat: np.ndarray
+    lon: np.ndarray
+    available_power_kw: np.ndarray
+    is_occupied: np.ndarray
+    columns: np.ndarray
+    """(vehicles x K) indices of the nodes each vehicle may be sent to (-1 pads)."""
+    exhausted: np.ndarray
+    """Per vehicle: its candidate hubs already include every reachable hub."""
 
 
 class RecommendationService:
     """Service for generating charging station recommendations."""
 
-    def __init__(self, db: Session, influx_service: InfluxDBService):
+    def __init__(
+        self,
+        db: Session,
+        influx_service: InfluxDBService,
+        store: TelemetryStore = telemetry_store,
+        index: HubSpatialIndex = hub_index,
+        cache: RecommendationCache = recommendation_cache,
+        async_influx_service: Optional[AsyncInfluxDBService] = None,
+    ):
         self.db = db
         self.hub_repo = HubRepository(db)
         self.node_repo = NodeRepository(db)
         self.influx_service = influx_service
+        self.async_influx_service = async_influx_service
+        self.telemetry_store = store
+        self.hub_index = index
+        self.cache = cache
 
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def get_recommendation(
+    async def get_recommendation_async(
         self, request: RecommendationRequest
     ) -> Optional[RecommendationResponse]:
         """
         Generate charging recommendation based on vehicle status and node availability.
 
+        Only the nearest active hubs (see RECOMMENDATION_CANDIDATE_HUBS and
+        RECOMMENDATION_MAX_DISTANCE_KM) are scored, widening the search when
+        none of them has an available node. The chosen hub and node are
+        cached for a short time per location cell and battery bucket;
+        distance and wait time are always computed for the requester.
+
+        Node state missing from the telemetry store is fetched with the
+        async InfluxDB client; database queries (and the sync InfluxDB
+        fallback) run in the threadpool, so the event loop is never blocked.
+
         Args:
             request: Vehicle status (position and battery level)
 
         Returns:
             Recommended hub and node or None if no suitable option found
         """
-        active_hubs = list(self.hub_repo.get_active_hubs())
+        key = self.cache.key(request.latitude, request.longitude, request.battery_level)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._from_cached(cached, request)
+
+        recommendation = None
+        k = settings.RECOMMENDATION_CANDIDATE_HUBS
+        while True:
+            # Database work runs in the threadpool, off the event loop
+            candidates = await run_in_threadpool(self._prepare, [request], k)
+            if candidates is None:
+                break
+
+            nodes_state = self.telemetry_store.get_nodes(candidates.node_ids)
+            missing = self._missing_node_ids(candidates.node_ids, nodes_state)
+            if missing and self.async_influx_service is not None:
+                nodes_state.update(
+                    await self.async_influx_service.get_nodes_current_state(missing)
+                )
+            elif missing:
+                nodes_state.update(
+                    await run_in_threadpool(
+                        self.influx_service.get_nodes_current_state, missing
+                    )
+                )
+            self._apply_nodes_state(candidates, nodes_state)
 
-        if not active_hubs:
-            self.logger.warning("No active hubs available for recommendation")
-            return None
+            recommendation = self._select([request], candidates, best_nodes)[0]
+            if recommendation is not None or candidates.exhausted[0]:
+                break
+            k *= 2
 
-        best_recommendation = None
-        best_score = float("-inf")
+        if recommendation is not None:
+            self.cache.put(key, recommendation)
+        else:
+            self.logger.warning("No available nodes found for recommendation")
+        return recommendation
 
-        for hub in active_hubs:
-            if hub.lat is None or hub.lon is None:
-                continue
+    def get_recommendations(
+        self, requests: Sequence[RecommendationRequest]
+    ) -> List[Optional[RecommendationResponse]]:
+        """
+        Generate independent recommendations for many vehicles at once.
 
-            hub_lat: float = hub.lat  # type: ignore
-            hub_lon: float = hub.lon  # type: ignore
+        The nodes of all candidate hubs are loaded with one query and one
+        telemetry lookup, then every vehicle is scored against the nodes of
+        its own nearest hubs in a single vectorized pass, so the result
+        matches the single-vehicle recommendation.
 
-            distance_km = self._calculate_distance(
-                request.latitude, request.longitude, hub_lat, hub_lon
-            )
+        Args:
+            requests: Vehicle statuses (position and battery level)
 
-            nodes = list(self.node_repo.get_nodes_by_hub(hub.hub_id))  # type: ignore
-            if not nodes:
-                continue
+        Returns:
+            Recommendation per request (None where no suitable option found),
+            in request order
+        """
+        return self._recommend(requests, best_nodes, exclusive=False)
 
-            node_ids: List[str] = [node.node_id for node in nodes]  # type: ignore
-            nodes_state = self.influx_service.get_nodes_current_state(node_ids)
+    def assign_recommendations(
+        self, requests: Sequence[RecommendationRequest]
+    ) -> List[Optional[RecommendationResponse]]:
+        """
+        Jointly assign many vehicles to distinct nodes.
 
-            for node in nodes:
-                is_occupied = False
-                available_power: float = node.max_power_kw  # type: ignore
+        Unlike get_recommendations, no node is recommended to more than one
+        vehicle: the assignment maximizing the number of served vehicles,
+        then the total score, is computed with the Hungarian algorithm.
 
-                node_id_str = str(node.node_id)
-                if node_id_str in nodes_state:
-                    state = nodes_state[node_id_str]
-                    is_occupied = state.get("is_occupied", False)
-                    available_power = float(
-                        state.get("power_limit_kw", node.max_power_kw)
-                    )
+        Args:
+            requests: Vehicle statuses (position and battery level)
 
-                if is_occupied:
-                    continue
+        Returns:
+            Assigned node per request (None where no node is left), in
+            request order
+        """
+        return self._recommend(requests, assign_nodes, exclusive=True)
+
+    def _recommend(
+        self,
+        requests: Sequence[RecommendationRequest],
+        select: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        exclusive: bool,
+    ) -> List[Optional[RecommendationResponse]]:
+        """
+        Score all requests against their candidate nodes and pick nodes.
 
-                score = self._calculate_score(
-                    distance_km, available_power, request.battery_level
-                )
+        Vehicles left without a node are retried with twice as many
+        candidate hubs, until a node is found or no hub is left to add.
 
-                if score > best_score:
-                    best_score = score
-                    best_recommendation = {
-                        "hub": hub,
-                        "node": node,
-                        "distance_km": distance_km,
-                        "available_power_kw": available_power,
-                    }
+        Args:
+            requests: Vehicle statuses
+            select: Maps the (vehicles x K) candidate scores and columns to
+                the chosen candidate column per vehicle (-1 for none)
+            exclusive: Nodes chosen in a round are not offered to the
+                vehicles retried in later rounds
 
-        if not best_recommendation:
-            self.logger.warning("No available nodes found for recommendation")
+        Returns:
+            Recommendation per request, in request order
+        """
+        recommendations: List[Optional[RecommendationResponse]] = [None] * len(requests)
+        taken: set[str] = set()
+        pending = list(range(len(requests)))
+        k = settings.RECOMMENDATION_CANDIDATE_HUBS
+
+        while pending:
+            batch = [requests[i] for i in pending]
+            candidates = self._prepare(batch, k)
+            if candidates is None:
+                break
+
+            self._apply_nodes_state(
+                candidates, self._get_nodes_state(candidates.node_ids)
+            )
+            if taken:
+                candidates.is_occupied |= np.isin(candidates.node_ids, list(taken))
+
+            retry = []
+            chosen = self._select(batch, candidates, select)
+            for i, recommendation, exhausted in zip(
+                pending, chosen, candidates.exhausted.tolist()
+            ):
+                recommendations[i] = recommendation
+                if recommendation is not None:
+                    if exclusive:
+                        taken.add(recommendation.node_id)
+                elif not exhausted:
+                    retry.append(i)
+
+            pending = retry
+            k *= 2
+
+        missing = recommendations.count(None)
+        if missing:
+            self.logger.warning(
+                f"No available nodes found for {missing}/{len(requests)} "
+                "recommendation requests"
+            )
+        return recommendations
+
+    def _prepare(
+        self, requests: Sequence[RecommendationRequest], k: int
+    ) -> Optional[CandidateNodes]:
+        """
+        Find the candidate hubs of every request and load their nodes.
+
+        Args:
+            requests: Vehicle statuses
+            k: Number of nearest hubs considered per request
+
+        Returns:
+            Candidate nodes (without live state yet), or None if there are
+            no candidate hubs at all
+        """
+        registry_cache.ensure_warm(self.db)
+
+        nearest_hubs = [self._nearest_hubs(request, k) for request in requests]
+
+        hubs: Dict[str, SimpleNamespace] = {}
+        for candidate_hubs in nearest_hubs:
+            for _, hub in candidate_hubs:
+                hubs.setdefault(hub.hub_id, hub)
+
+        if not hubs:
+            self.logger.warning("No active hubs available for recommendation")
             return None
 
-        estimated_wait_time = self._estimate_wait_time(
-            best_recommendation["distance_km"]
+        candidates = self._load_candidates(hubs.values())
+
+        # A vehicle may only be sent to nodes of its own candidate hubs
+        hub_nodes: Dict[str, List[int]] = {hub_id: [] for hub_id in hubs}
+        for index, hub in enumerate(candidates.hubs):
+            hub_nodes[hub.hub_id].append(index)
+        vehicle_nodes = [
+            [index for _, hub in candidate_hubs for index in hub_nodes[hub.hub_id]]
+            for candidate_hubs in nearest_hubs
+        ]
+        width = max((len(nodes) for nodes in vehicle_nodes), default=0)
+        candidates.columns = np.full((len(requests), width), -1, dtype=np.intp)
+        for row, nodes in enumerate(vehicle_nodes):
+            candidates.columns[row, : len(nodes)] = nodes
+        candidates.exhausted = np.array(
+            [len(candidate_hubs) < k for candidate_hubs in nearest_hubs], dtype=bool
         )
 
-        return RecommendationResponse(
-            hub_id=best_recommendation["hub"].hub_id,  # type: ignore
-            node_id=best_recommendation["node"].node_id,  # type: ignore
-            hub_latitude=best_recommendation["hub"].lat,  # type: ignore
-            hub_longitude=best_recommendation["hub"].lon,  # type: ignore
-            distance_km=round(best_recommendation["distance_km"], 2),
-            estimated_wait_time_min=estimated_wait_time,
-            available_power_kw=round(best_recommendation["available_power_kw"], 2),
+        return candidates
+
+    def _select(
+        self,
+        requests: Sequence[RecommendationRequest],
+        candidates: CandidateNodes,
+        select: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    ) -> List[Optional[RecommendationResponse]]:
+        """Score the candidates for every request and build the responses."""
+        scores, distance_km = score_candidates(
+            np.array([r.latitude for r in requests], dtype=np.float64),
+            np.array([r.longitude for r in requests], dtype=np.float64),
+            np.array([r.battery_level for r in requests], dtype=np.float64),
+            candidates.lat,
+            candidates.lon,
+            candidates.available_power_kw,
+            candidates.is_occupied,
+            candidates.columns,
         )
+        chosen = select(scores, candidates.columns)
 
-    def _calculate_distance(
-        self, lat1: float, lon1: float, lat2: float, lon2: float
-    ) -> float:
-        """Calculate distance between two coordinates using Haversine formula."""
-        R = 6371.0
+        recommendations: List[Optional[RecommendationResponse]] = []
+        for row, column in enumerate(chosen.tolist()):
+            if column < 0:
+                recommendations.append(None)
+                continue
+            recommendations.append(
+                self._build_response(
+                    candidates,
+                    int(candidates.columns[row, column]),
+                    float(distance_km[row, column]),
+                )
+            )
 
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
+        return recommendations
+
+    def _nearest_hubs(
+        self, request: RecommendationRequest, k: int
+    ) -> List[Tuple[float, SimpleNamespace]]:
+        """Candidate hubs for a vehicle, nearest first."""
+        return self.hub_index.nearest(
+            request.latitude,
+            request.longitude,
+            k=k,
+            max_distance_km=settings.RECOMMENDATION_MAX_DISTANCE_KM,
+        )
 
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
+    def _load_candidates(self, hubs: Iterable[SimpleNamespace]) -> CandidateNodes:
+        """
+        Load the nodes of the given hubs.
+
+        Args:
+            hubs: Candidate hubs
 
-        a = (
-            math.sin(dlat / 2) ** 2
-            + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+        Returns:
+            Candidate nodes with their coordinates and nominal power
+        """
+        hubs_by_id = {hub.hub_id: hub for hub in hubs}
+
+        # Keep hub order so ties are resolved in favour of the nearest hub
+        nodes_by_hub: Dict[str, list] = {hub_id: [] for hub_id in hubs_by_id}
+        for node in self.node_repo.get_nodes_by_hubs(hubs_by_id):
+            nodes_by_hub[node.hub_id].append(node)  # type: ignore[index]
+        nodes = [node for hub_nodes in nodes_by_hub.values() for node in hub_nodes]
+
+        node_hubs = [hubs_by_id[node.hub_id] for node in nodes]  # type: ignore[index]
+
+        return CandidateNodes(
+            nodes=nodes,
+            node_ids=[str(node.node_id) for node in nodes],
+            hubs=node_hubs,
+            lat=np.array([hub.lat for hub in node_hubs], dtype=np.float64),
+            lon=np.array([hub.lon for hub in node_hubs], dtype=np.float64),
+            available_power_kw=np.array(
+                [node.max_power_kw for node in nodes], dtype=np.float64
+            ),
+            is_occupied=np.zeros(len(nodes), dtype=bool),
+            columns=np.zeros((0, 0), dtype=np.intp),
+            exhausted=np.zeros(0, dtype=bool),
         )
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
-        return R * c
+    def _apply_nodes_state(
+        self, candidates: CandidateNodes, nodes_state: Dict[str, dict]
+    ) -> None:
+        """Overlay live occupancy and power limits on the candidate nodes."""
+        for i, node_id in enumerate(candidates.node_ids):
+            state = nodes_state.get(node_id)
+            if state is not None:
+                candidates.is_occupied[i] = bool(state.get("is_occupied", False))
+                candidates.available_power_kw[i] = float(
+                    state.get("power_limit_kw", candidates.available_power_kw[i])
+                )
 
-    def _calculate_score(
-        self, distance_km: float, available_power_kw: float, battery_level: int
-    ) -> float:
+    def _build_response(
+        self, candidates: CandidateNodes, index: int, distance_km: float
+    ) -> RecommendationResponse:
+        """Build the recommendation for one candidate node."""
+        hub = candidates.hubs[index]
+        return RecommendationResponse(
+            hub_id=hub.hub_id,
+            node_id=candidates.nodes[index].node_id,  # type: ignore
+            hub_latitude=hub.lat,
+            hub_longitude=hub.lon,
+            distance_km=round(distance_km, 2),
+            estimated_wait_time_min=self._estimate_wait_time(distance_km),
+            available_power_kw=round(float(candidates.available_power_kw[index]), 2),
+        )
+
+    def _from_cached(
+        self, cached: RecommendationResponse, request: RecommendationRequest
+    ) -> RecommendationResponse:
+        """Reuse a cached hub/node choice with the requester's own distance."""
+        distance_km = haversine_km(
+            request.latitude,
+            request.longitude,
+            cached.hub_latitude,
+            cached.hub_longitude,
+        )
+        return cached.model_copy(
+            update={
+                "distance_km": round(distance_km, 2),
+                "estimated_wait_time_min": self._estimate_wait_time(distance_km),
+            }
+        )
+
+    def _get_nodes_state(self, node_ids: List[str]) -> Dict[str, dict]:
         """
-        Calculate recommendation score.
-        Higher score means better recommendation.
+        Get the latest telemetry of nodes, from memory when possible.
+
+        InfluxDB is only queried for nodes missing from the telemetry store
+        while the store does not yet cover the whole staleness window.
         """
-        distance_score = 1 / (1 + distance_km)
-        power_score = available_power_kw / 50.0
-        urgency_score = (100 - battery_level) / 100.0
+        nodes_state = self.telemetry_store.get_nodes(node_ids)
+
+        missing = self._missing_node_ids(node_ids, nodes_state)
+        if missing:
+            nodes_state.update(self.influx_service.get_nodes_current_state(missing))
+
+        return nodes_state
 
-        return distance_score * 0.6 + power_score * 0.3 + urgency_score * 0.1
+    def _missing_node_ids(
+        self, node_ids: List[str], nodes_state: Dict[str, dict]
+    ) -> List[str]:
+        """Nodes to look up in InfluxDB (none once the store covers the window)."""
+        if self.telemetry_store.covers_window:
+            return []
+        return [nid for nid in node_ids if nid not in nodes_state]
 
     def _estimate_wait_time(self, distance_km: float) -> int:
         """Estimate wait time in minutes based on distance."""
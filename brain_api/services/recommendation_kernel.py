@@ -0,0 +1,283 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+DISTANCE_WEIGHT = 0.6
+POWER_WEIGHT = 0.3
+URGENCY_WEIGHT = 0.1
+REFERENCE_POWER_KW = 50.0
+
+
+def haversine_km(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """
+    Great-circle distance in kilometers, broadcasting over the inputs.
+
+    Pass column vectors for one side and row vectors for the other to get
+    a full distance matrix.
+    """
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = np.radians(lon2) - np.radians(lon1)
+
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2) ** 2
+    )
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def score_nodes(
+    distance_km: np.ndarray,
+    available_power_kw: np.ndarray,
+    battery_level: np.ndarray,
+) -> np.ndarray:
+    """
+    Recommendation score, broadcasting over the inputs.
+    Higher score means better recommendation.
+    """
+    distance_score = 1 / (1 + distance_km)
+    power_score = available_power_kw / REFERENCE_POWER_KW
+    urgency_score = (100 - battery_level) / 100.0
+
+    return (
+        distance_score * DISTANCE_WEIGHT
+        + power_score * POWER_WEIGHT
+        + urgency_score * URGENCY_WEIGHT
+    )
+
+
+def score_candidates(
+    vehicle_lat: np.ndarray,
+    vehicle_lon: np.ndarray,
+    battery_level: np.ndarray,
+    node_lat: np.ndarray,
+    node_lon: np.ndarray,
+    available_power_kw: np.ndarray,
+    unavailable: np.ndarray,
+    columns: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score the candidate nodes of every vehicle.
+
+    Each vehicle is only scored against its own candidates, given as a
+    padded (V, K) array of node indices, so memory grows with V * K rather
+    than with the number of nodes across all vehicles.
+
+    Args:
+        vehicle_lat: Vehicle latitudes, shape (V,)
+        vehicle_lon: Vehicle longitudes, shape (V,)
+        battery_level: Vehicle battery levels (%), shape (V,)
+        node_lat: Latitude of each node's hub, shape (N,)
+        node_lon: Longitude of each node's hub, shape (N,)
+        available_power_kw: Available power per node, shape (N,)
+        unavailable: Nodes that must not be recommended, shape (N,)
+        columns: Candidate node indices per vehicle, -1 for padding,
+            shape (V, K)
+
+    Returns:
+        Tuple of (scores, -inf for padding and unavailable nodes; distances
+        in km), both of shape (V, K)
+    """
+    if columns.shape[1] == 0:
+        empty = np.zeros(columns.shape)
+        return empty, empty
+
+    valid = columns >= 0
+    nodes = np.where(valid, columns, 0)
+
+    distance_km = haversine_km(
+        vehicle_lat[:, None], vehicle_lon[:, None], node_lat[nodes], node_lon[nodes]
+    )
+    scores = score_nodes(distance_km, available_power_kw[nodes], battery_level[:, None])
+    scores = np.where(valid & ~unavailable[nodes], scores, -np.inf)
+    return scores, distance_km
+
+
+def best_nodes(scores: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """
+    Pick the best node per vehicle independently (greedy).
+
+    Args:
+        scores: Candidate scores from score_candidates, shape (V, K)
+        columns: Candidate node indices, shape (V, K) (unused; same
+            signature as assign_nodes)
+
+    Returns:
+        Column of the best candidate per vehicle, -1 if none, shape (V,)
+    """
+    if scores.shape[1] == 0:
+        return np.full(scores.shape[0], -1)
+
+    best = np.argmax(scores, axis=1)
+    best[np.isneginf(scores[np.arange(scores.shape[0]), best])] = -1
+    return best
+
+
+def assign_nodes(scores: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """
+    Assign vehicles to distinct nodes maximizing the total score.
+
+    Vehicles that cannot compete for the same node are independent, so the
+    problem is split into connected components (vehicles linked through
+    shared candidate nodes), each solved as a dense rectangular assignment
+    with the Hungarian algorithm. Unavailable pairs are only used when
+    unavoidable and are then reported as unassigned, so the number of
+    assigned vehicles is maximized first.
+
+    Args:
+        scores: Candidate scores from score_candidates, shape (V, K)
+        columns: Candidate node indices, shape (V, K)
+
+    Returns:
+        Column of the assigned candidate per vehicle, -1 if none, shape (V,)
+    """
+    n_vehicles = scores.shape[0]
+    assignment = np.full(n_vehicles, -1)
+
+    feasible = np.isfinite(scores)
+    rows, cols = np.nonzero(feasible)
+    if rows.size == 0:
+        return assignment
+
+    # Union-find over vehicles: two vehicles sharing a node are linked
+    parent = list(range(n_vehicles))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    first_vehicle: Dict[int, int] = {}
+    for row, node in zip(rows.tolist(), columns[rows, cols].tolist()):
+        other = first_vehicle.setdefault(node, row)
+        parent[find(row)] = find(other)
+
+    components: Dict[int, List[int]] = {}
+    for row in sorted(set(rows.tolist())):
+        components.setdefault(find(row), []).append(row)
+
+    for vehicles in components.values():
+        sub_rows = np.array(vehicles)
+        sub_feasible = feasible[sub_rows]
+        nodes = np.unique(columns[sub_rows][sub_feasible])
+        node_position = {node: i for i, node in enumerate(nodes.tolist())}
+
+        dense = np.full((len(vehicles), len(nodes)), -np.inf)
+        candidate_of: Dict[Tuple[int, int], int] = {}
+        for i, row in enumerate(vehicles):
+            for k in np.nonzero(feasible[row])[0].tolist():
+                j = node_position[int(columns[row, k])]
+                dense[i, j] = scores[row, k]
+                candidate_of[(i, j)] = k
+
+        for i, j in enumerate(_assign_dense(dense).tolist()):
+            if j >= 0:
+                assignment[vehicles[i]] = candidate_of[(i, j)]
+
+    return assignment
+
+
+def _assign_dense(scores: np.ndarray) -> np.ndarray:
+    """
+    Maximum-score assignment on a dense (vehicles x nodes) score matrix.
+
+    Args:
+        scores: Score matrix, -inf for forbidden pairs
+
+    Returns:
+        Node index assigned to each vehicle, -1 if none
+    """
+    n_vehicles, n_nodes = scores.shape
+    assignment = np.full(n_vehicles, -1)
+    if n_vehicles == 0 or n_nodes == 0:
+        return assignment
+
+    feasible = np.isfinite(scores)
+    if not feasible.any():
+        return assignment
+
+    # Forbidden pairs cost more than any set of feasible ones combined
+    cost = -scores
+    finite = cost[feasible]
+    forbidden = (finite.max() - finite.min() + 1) * min(n_vehicles, n_nodes) + 1
+    cost = np.where(feasible, cost - finite.min(), forbidden)
+
+    transposed = n_vehicles > n_nodes
+    if transposed:
+        cost = cost.T
+
+    rows_to_cols = _hungarian(cost)
+    if transposed:
+        pairs = [(col, row) for row, col in enumerate(rows_to_cols)]
+    else:
+        pairs = list(enumerate(rows_to_cols))
+
+    for vehicle, node in pairs:
+        if feasible[vehicle, node]:
+            assignment[vehicle] = node
+    return assignment
+
+
+def _hungarian(cost: np.ndarray) -> List[int]:
+    """
+    Minimum-cost assignment of every row to a distinct column.
+
+    Args:
+        cost: Finite cost matrix with rows <= columns
+
+    Returns:
+        Column assigned to each row
+    """
+    n_rows, n_cols = cost.shape
+    u = np.zeros(n_rows + 1)
+    v = np.zeros(n_cols + 1)
+    # col_owner[j]: 1-based row assigned to column j (0 = free); column 0 is
+    # a virtual column holding the row being inserted
+    col_owner = np.zeros(n_cols + 1, dtype=np.intp)
+    way = np.zeros(n_cols + 1, dtype=np.intp)
+
+    for row in range(1, n_rows + 1):
+        col_owner[0] = row
+        col = 0
+        min_slack = np.full(n_cols + 1, np.inf)
+        used = np.zeros(n_cols + 1, dtype=bool)
+
+        while True:
+            used[col] = True
+            owner = col_owner[col]
+
+            free = ~used
+            free[0] = False
+            slack = cost[owner - 1] - u[owner] - v[1:]
+            improved = free[1:] & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = col
+
+            candidates = np.where(free, min_slack, np.inf)
+            next_col = int(np.argmin(candidates))
+            delta = candidates[next_col]
+
+            u[col_owner[used]] += delta
+            v[used] -= delta
+            min_slack[free] -= delta
+
+            col = next_col
+            if col_owner[col] == 0:
+                break
+
+        while col:
+            prev = way[col]
+            col_owner[col] = col_owner[prev]
+            col = prev
+
+    rows_to_cols = [0] * n_rows
+    for col in range(1, n_cols + 1):
+        if col_owner[col]:
+            rows_to_cols[col_owner[col] - 1] = col - 1
+    return rows_to_cols
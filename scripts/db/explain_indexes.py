@@ -0,0 +1,127 @@
+"""
+Query plan check for the repository hot paths.
+
+Runs EXPLAIN on the queries behind the active session lookup, the per-hub
+and per-node DLM event pages and the active hub queries, and fails if a
+plan does not use the index meant for it. Sequential scans are disabled
+for the check, so small development databases still exercise the indexes.
+
+Usage:
+    uv run scripts/db/explain_indexes.py
+    uv run scripts/db/explain_indexes.py --verbose   # Print the plans
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import click
+from sqlalchemy import func, select, text
+
+from brain_api.db import engine
+from brain_api.models import ChargingSessionDbo as ChargingSession
+from brain_api.models import DLMEventDbo as DLMEvent
+from brain_api.models import HubDbo as Hub
+
+# (description, statement, expected index on the parent table)
+CHECKS = [
+    (
+        "active session of a node",
+        select(ChargingSession).where(
+            ChargingSession.end_time.is_(None), ChargingSession.node_id == "node"
+        ),
+        "ix_charging_sessions_active_node",
+    ),
+    (
+        "DLM events of a hub, newest first",
+        select(DLMEvent)
+        .where(DLMEvent.hub_id == "hub")
+        .order_by(DLMEvent.timestamp.desc(), DLMEvent.dlm_event_id.desc())
+        .limit(50),
+        "ix_dlm_events_hub_timestamp_id",
+    ),
+    (
+        "DLM events of a node, newest first",
+        select(DLMEvent)
+        .where(DLMEvent.node_id == "node")
+        .order_by(DLMEvent.timestamp.desc(), DLMEvent.dlm_event_id.desc())
+        .limit(50),
+        "ix_dlm_events_node_timestamp_id",
+    ),
+    (
+        "active hubs",
+        select(Hub).where(Hub.is_active == True),  # noqa: E712
+        "ix_hubs_active",
+    ),
+    (
+        "active grid capacity",
+        select(func.sum(Hub.max_grid_capacity_kw)).where(
+            Hub.is_active == True  # noqa: E712
+        ),
+        "ix_hubs_active",
+    ),
+]
+
+
+def _index_names(plan: dict) -> set[str]:
+    """Collect the index names used anywhere in a plan tree."""
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+def _with_partition_indexes(conn, index: str) -> set[str]:
+    """An index and the indexes of its partitions (partitioned tables)."""
+    children = conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:index)"
+        ),
+        {"index": index},
+    ).scalars()
+    return {index, *children}
+
+
+@click.command()
+@click.option("--verbose", is_flag=True, help="Print the query plans")
+def main(verbose: bool):
+    """Check that the hot path queries use their indexes."""
+    failures = 0
+
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+
+        for description, stmt, index in CHECKS:
+            compiled = stmt.compile(
+                dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            plan = plan[0]["Plan"]
+
+            used = _index_names(plan)
+            if used & _with_partition_indexes(conn, index):
+                click.secho(f"OK    {description}: {index}", fg="green")
+            else:
+                failures += 1
+                click.secho(
+                    f"FAIL  {description}: expected {index}, "
+                    f"used {', '.join(sorted(used)) or 'no index'}",
+                    fg="red",
+                )
+            if verbose:
+                click.echo(json.dumps(plan, indent=2))
+
+        conn.rollback()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
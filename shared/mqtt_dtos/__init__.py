@@ -1,4 +1,4 @@
-from .dlm_dto import DLMNotification
+from .dlm_dto import DLMNotification, DLMNotificationBatch
 from .enums import ChargingState, ConnectionState, GeoLocation
 from .hub_dto import HubInfo, HubStatus
 from .node_dto import NodeInfo, NodeStatus, NodeTelemetry
@@ -13,6 +13,7 @@ __all__ = [
     "VehicleTelemetry",
     "VehicleRequest",
     "DLMNotification",
+    "DLMNotificationBatch",
     "ChargingState",
     "ConnectionState",
     "GeoLocation",
@@ -1,7 +1,8 @@
 import datetime
 from datetime import datetime, timezone
+from typing import List
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, RootModel, field_validator
 
 
 class DLMNotification(BaseModel):
@@ -42,3 +43,11 @@ class DLMNotification(BaseModel):
         if v is None or v < 0:
             return 0.0
         return v
+
+
+class DLMNotificationBatch(RootModel[List[DLMNotification]]):
+    """
+    All DLM notifications produced by one policy run.
+
+    Topic: iot/hubs/+/dlm/events/batch
+    """
@@ -2,12 +2,14 @@ from shared.mqtt_dtos import VehicleRequest
 
 from .base_policy import IPolicy, PowerAllocation
 from .equal_sharing_policy import EqualSharingPolicy
+from .node_state import NodeStateArrays
 from .priority_policy import PriorityPolicy
 
 __all__ = [
     "IPolicy",
     "VehicleRequest",
     "PowerAllocation",
+    "NodeStateArrays",
     "EqualSharingPolicy",
     "PriorityPolicy",
 ]
@@ -2,6 +2,10 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Dict, List
 
+import numpy as np
+
+from .node_state import NodeStateArrays
+
 
 @dataclass
 class PowerAllocation:
@@ -16,8 +20,9 @@ class IPolicy(ABC):
     """
     Abstract base class for Dynamic Load Management policies.
 
-    Policies are callable and take the current system state to compute
-    power allocations for all nodes.
+    Policies operate on a column-oriented NodeStateArrays snapshot and return
+    an allocation vector. Calling a policy with the legacy per-node dict is
+    still supported and returns PowerAllocation objects.
     """
 
     def __init__(self, max_grid_capacity_kw: float):
@@ -30,6 +35,54 @@ class IPolicy(ABC):
         self.max_grid_capacity_kw = max_grid_capacity_kw
 
     @abstractmethod
+    def allocate(self, state: NodeStateArrays) -> np.ndarray:
+        """
+        Compute the power allocation vector for all nodes.
+
+        Args:
+            state: Current state of all nodes
+
+        Returns:
+            Array of length len(state) with the allocated power in kW for each
+            node, or NaN for nodes not managed by this policy
+        """
+        pass
+
+    def allocation_reason(self, state: NodeStateArrays, index: int) -> str:
+        """
+        Describe why node ``index`` received its allocation.
+
+        Args:
+            state: State the allocation was computed from
+            index: Row of the node in ``state``
+
+        Returns:
+            Human readable reason (used in DLM notifications)
+        """
+        return self.get_policy_name()
+
+    def to_allocations(
+        self, state: NodeStateArrays, allocation: np.ndarray
+    ) -> List[PowerAllocation]:
+        """
+        Convert an allocation vector into PowerAllocation objects.
+
+        Args:
+            state: State the allocation was computed from
+            allocation: Vector returned by allocate()
+
+        Returns:
+            Power allocations for managed nodes
+        """
+        return [
+            PowerAllocation(
+                node_id=state.node_ids[index],
+                allocated_power_kw=float(allocation[index]),
+                reason=self.allocation_reason(state, index),
+            )
+            for index in np.flatnonzero(~np.isnan(allocation))
+        ]
+
     def __call__(self, nodes_state: Dict[str, Dict]) -> List[PowerAllocation]:
         """
         Compute power allocation for all nodes.
@@ -40,7 +93,7 @@ class IPolicy(ABC):
                     "node_01": {
                         "max_power_kw": 22.0,
                         "current_power_kw": 15.0,
-                        "state": "CHARGING",
+                        "state": "charging",
                         "vehicle_id": "vehicle_123",
                         "vehicle_soc": 50,
                         "is_occupied": True
@@ -50,7 +103,8 @@ class IPolicy(ABC):
         Returns:
             List of power allocations for each node
         """
-        pass
+        state = NodeStateArrays.from_nodes_state(nodes_state)
+        return self.to_allocations(state, self.allocate(state))
 
     @abstractmethod
     def get_policy_name(self) -> str:
@@ -1,47 +1,47 @@
-from typing import Dict, List
+import numpy as np
 
-from .base_policy import IPolicy, PowerAllocation
+from .base_policy import IPolicy
+from .node_state import NodeStateArrays
+from .water_filling import water_fill
 
 
 class EqualSharingPolicy(IPolicy):
     """
     Equal sharing policy: distribute grid capacity equally among active nodes.
+
+    Capacity that a node cannot use because of its hardware limit is shared
+    equally among the remaining nodes (water-filling).
     """
 
-    def __call__(self, nodes_state: Dict[str, Dict]) -> List[PowerAllocation]:
+    _active_count: int = 0
+
+    def allocate(self, state: NodeStateArrays) -> np.ndarray:
         """
         Distribute power equally among charging nodes.
 
         Args:
-            nodes_state: Current state of all nodes
+            state: Current state of all nodes
 
         Returns:
-            Power allocations for each node
+            Allocation vector (NaN for nodes that are not charging)
         """
-        allocations = []
-
-        charging_nodes = []
-        for node_id, state in nodes_state.items():
-            if state.get("is_occupied") and state.get("state") == "CHARGING":
-                charging_nodes.append(node_id)
-
-        if not charging_nodes:
-            return []
-
-        power_per_node = self.max_grid_capacity_kw / len(charging_nodes)
-
-        for node_id, state in nodes_state.items():
-            if node_id in charging_nodes:
-                allocated = min(power_per_node, state["max_power_kw"])
-                allocations.append(
-                    PowerAllocation(
-                        node_id=node_id,
-                        allocated_power_kw=allocated,
-                        reason=f"Equal share ({len(charging_nodes)} active)",
-                    )
-                )
-
-        return allocations
+        allocation = np.full(len(state), np.nan)
+
+        charging = state.is_occupied & state.is_charging()
+        self._active_count = int(np.count_nonzero(charging))
+
+        if not self._active_count:
+            return allocation
+
+        caps = state.max_power_kw[charging]
+        allocation[charging] = water_fill(
+            caps, np.ones_like(caps), self.max_grid_capacity_kw
+        )
+
+        return allocation
+
+    def allocation_reason(self, state: NodeStateArrays, index: int) -> str:
+        return f"Equal share ({self._active_count} active)"
 
     def get_policy_name(self) -> str:
         return "EqualSharing"
@@ -0,0 +1,151 @@
+from typing import ClassVar, Dict, List, Optional
+
+import numpy as np
+
+from shared.mqtt_dtos import ChargingState
+
+
+class NodeStateArrays:
+    """
+    Column-oriented snapshot of the nodes managed by a DLM policy.
+
+    Each attribute is a NumPy view of length ``size`` over a preallocated
+    buffer, so a hub can refill the same object on every DLM tick without
+    allocating. Row ``i`` of every column describes ``node_ids[i]``.
+
+    Columns:
+    - max_power_kw: Hardware power limit of the node
+    - current_power_kw: Measured (or simulated) power draw
+    - soc: Connected vehicle SoC in percent (NaN if unknown)
+    - is_occupied: Whether a vehicle is physically present
+    - has_vehicle: Whether a vehicle is assigned to the node
+    - state_code: ChargingState encoded with STATE_CODES
+    """
+
+    STATE_CODES: ClassVar[Dict[str, int]] = {
+        ChargingState.IDLE.value: 0,
+        ChargingState.CHARGING.value: 1,
+        ChargingState.FULL.value: 2,
+        ChargingState.FAULTED.value: 3,
+    }
+    UNKNOWN_STATE: ClassVar[int] = -1
+
+    def __init__(self, capacity: int = 8):
+        """
+        Initialize empty state with preallocated buffers.
+
+        Args:
+            capacity: Initial number of rows to preallocate
+        """
+        self.size = 0
+        self.node_ids: List[str] = []
+        self._allocate(max(capacity, 1))
+
+    def _allocate(self, capacity: int) -> None:
+        """Allocate buffers for ``capacity`` rows."""
+        self._capacity = capacity
+        self._max_power_kw = np.zeros(capacity, dtype=np.float64)
+        self._current_power_kw = np.zeros(capacity, dtype=np.float64)
+        self._soc = np.full(capacity, np.nan, dtype=np.float64)
+        self._is_occupied = np.zeros(capacity, dtype=np.bool_)
+        self._has_vehicle = np.zeros(capacity, dtype=np.bool_)
+        self._state_code = np.full(capacity, self.UNKNOWN_STATE, dtype=np.int8)
+
+    def reset(self, size: int) -> None:
+        """
+        Prepare the buffers to hold ``size`` rows, growing them if needed.
+
+        Args:
+            size: Number of nodes that will be written with set_row
+        """
+        if size > self._capacity:
+            self._allocate(max(size, self._capacity * 2))
+
+        self.size = size
+        self.node_ids = [""] * size
+
+    def set_row(
+        self,
+        index: int,
+        node_id: str,
+        max_power_kw: float,
+        current_power_kw: float,
+        state: str,
+        soc: Optional[float],
+        is_occupied: bool,
+        has_vehicle: bool,
+    ) -> None:
+        """Write the state of one node into row ``index``."""
+        self.node_ids[index] = node_id
+        self._max_power_kw[index] = max_power_kw
+        self._current_power_kw[index] = current_power_kw or 0.0
+        self._soc[index] = np.nan if soc is None else soc
+        self._is_occupied[index] = bool(is_occupied)
+        self._has_vehicle[index] = bool(has_vehicle)
+        self._state_code[index] = self.encode_state(state)
+
+    @classmethod
+    def encode_state(cls, state: Optional[str]) -> int:
+        """Map a ChargingState value (case-insensitive) to its integer code."""
+        if state is None:
+            return cls.UNKNOWN_STATE
+        return cls.STATE_CODES.get(str(state).lower(), cls.UNKNOWN_STATE)
+
+    @classmethod
+    def from_nodes_state(cls, nodes_state: Dict[str, Dict]) -> "NodeStateArrays":
+        """
+        Build arrays from the legacy per-node dict representation.
+
+        Args:
+            nodes_state: Mapping of node_id to state dict (see IPolicy.__call__)
+
+        Returns:
+            Populated NodeStateArrays
+        """
+        arrays = cls(capacity=len(nodes_state))
+        arrays.reset(len(nodes_state))
+
+        for index, (node_id, state) in enumerate(nodes_state.items()):
+            arrays.set_row(
+                index,
+                node_id=node_id,
+                max_power_kw=state["max_power_kw"],
+                current_power_kw=state.get("current_power_kw", 0.0),
+                state=state.get("state"),
+                soc=state.get("vehicle_soc"),
+                is_occupied=state.get("is_occupied", False),
+                has_vehicle=bool(state.get("vehicle_id")),
+            )
+
+        return arrays
+
+    @property
+    def max_power_kw(self) -> np.ndarray:
+        return self._max_power_kw[: self.size]
+
+    @property
+    def current_power_kw(self) -> np.ndarray:
+        return self._current_power_kw[: self.size]
+
+    @property
+    def soc(self) -> np.ndarray:
+        return self._soc[: self.size]
+
+    @property
+    def is_occupied(self) -> np.ndarray:
+        return self._is_occupied[: self.size]
+
+    @property
+    def has_vehicle(self) -> np.ndarray:
+        return self._has_vehicle[: self.size]
+
+    @property
+    def state_code(self) -> np.ndarray:
+        return self._state_code[: self.size]
+
+    def is_charging(self) -> np.ndarray:
+        """Boolean mask of nodes in the CHARGING state."""
+        return self.state_code == self.STATE_CODES[ChargingState.CHARGING.value]
+
+    def __len__(self) -> int:
+        return self.size
@@ -1,7 +1,10 @@
 import logging
-from typing import Dict, List
 
-from .base_policy import IPolicy, PowerAllocation
+import numpy as np
+
+from .base_policy import IPolicy
+from .node_state import NodeStateArrays
+from .water_filling import water_fill
 
 logger = logging.getLogger(__name__)
 
@@ -10,71 +13,52 @@ class PriorityPolicy(IPolicy):
     """
     Priority-based policy: Lower SoC vehicles get more power.
     Helps vehicles with lower battery charge first.
+
+    Power a node cannot take because of its hardware limit is redistributed
+    to the other nodes in proportion to their priority (water-filling).
     """
 
-    def __call__(self, nodes_state: Dict[str, Dict]) -> List[PowerAllocation]:
+    DEFAULT_SOC = 50  # Default to 50% if SoC unknown
+
+    _active_count: int = 0
+
+    def allocate(self, state: NodeStateArrays) -> np.ndarray:
         """
         Distribute power prioritizing vehicles with lower SoC.
 
         Args:
-            nodes_state: Current state of all nodes
-                {
-                    "node_01": {
-                        "max_power_kw": 22.0,
-                        "current_power_kw": 15.0,
-                        "state": "CHARGING",
-                        "vehicle_id": "vehicle_123",
-                        "vehicle_soc": 50,
-                        "is_occupied": True
-                    }
-                }
+            state: Current state of all nodes
 
         Returns:
-            List of power allocations for each node
+            Allocation vector (NaN for nodes without a charging vehicle)
         """
-        allocations = []
-
-        charging_nodes = []
-        for node_id, state in nodes_state.items():
-            if (
-                state.get("is_occupied")
-                and state.get("state") == "charging"
-                and state.get("vehicle_id")
-            ):
-                charging_nodes.append((node_id, state))
-
-        if not charging_nodes:
-            return []
-
-        priorities = []
-        for node_id, state in charging_nodes:
-            soc = state.get("vehicle_soc")
-            if soc is None:
-                soc = 50  # Default to 50% if SoC unknown
-
-            priority = max(1, 100 - soc)
-            priorities.append((node_id, state, priority, soc))
-
-        total_priority = sum(p[2] for p in priorities)
-
-        for node_id, state, priority, soc in priorities:
-            proportional_power = (priority / total_priority) * self.max_grid_capacity_kw
-            allocated = min(proportional_power, state["max_power_kw"])
-
-            allocations.append(
-                PowerAllocation(
-                    node_id=node_id,
-                    allocated_power_kw=allocated,
-                    reason=f"Priority-based (SoC: {soc}%, {len(charging_nodes)} active)",
-                )
-            )
+        allocation = np.full(len(state), np.nan)
+
+        charging = state.is_occupied & state.is_charging() & state.has_vehicle
+        self._active_count = int(np.count_nonzero(charging))
+
+        if not self._active_count:
+            return allocation
+
+        soc = state.soc[charging]
+        soc = np.where(np.isnan(soc), self.DEFAULT_SOC, soc)
+        priority = np.maximum(1.0, 100.0 - soc)
+
+        allocation[charging] = water_fill(
+            state.max_power_kw[charging], priority, self.max_grid_capacity_kw
+        )
 
         logger.debug(
             f"Priority policy: distributed {self.max_grid_capacity_kw:.1f}kW "
-            f"across {len(charging_nodes)} nodes based on SoC priorities"
+            f"across {self._active_count} nodes based on SoC priorities"
         )
 
-        return allocations
+        return allocation
+
+    def allocation_reason(self, state: NodeStateArrays, index: int) -> str:
+        soc = state.soc[index]
+        soc = self.DEFAULT_SOC if np.isnan(soc) else int(soc)
+        return f"Priority-based (SoC: {soc}%, {self._active_count} active)"
 
     def get_policy_name(self) -> str:
         return "Priority"
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def water_fill(caps: np.ndarray, weights: np.ndarray, budget: float) -> np.ndarray:
+    """
+    Weighted water-filling of ``budget`` over nodes with individual caps.
+
+    Every node receives ``min(cap_i, level * weight_i)`` where ``level`` is
+    chosen so the allocations sum to ``budget``. Power a capped node cannot
+    use is therefore redistributed to the remaining nodes in proportion to
+    their weights, instead of being left unallocated.
+
+    Runs in O(n log n): nodes are sorted by the level at which they saturate
+    (``cap / weight``) and the level is found from prefix sums.
+
+    Args:
+        caps: Maximum power per node (kW)
+        weights: Strictly positive share weight per node
+        budget: Total power to distribute (kW)
+
+    Returns:
+        Allocation per node, in the same order as ``caps``
+    """
+    caps = np.asarray(caps, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    if caps.size == 0 or budget <= 0:
+        return np.zeros_like(caps)
+
+    if caps.sum() <= budget:
+        return caps.copy()
+
+    saturation = caps / weights
+    order = np.argsort(saturation, kind="stable")
+    sorted_caps = caps[order]
+    sorted_weights = weights[order]
+    sorted_saturation = saturation[order]
+
+    # If the k nodes with the lowest saturation level are capped, the level
+    # for the rest is (budget - sum of those caps) / (sum of remaining weights)
+    capped_power = np.concatenate(([0.0], np.cumsum(sorted_caps)[:-1]))
+    free_weight = sorted_weights[::-1].cumsum()[::-1]
+    levels = (budget - capped_power) / free_weight
+
+    # First node that does not saturate at its candidate level
+    k = int(np.argmax(levels <= sorted_saturation))
+    level = levels[k]
+
+    return np.minimum(caps, level * weights)
@@ -1,10 +1,11 @@
 import json
 import logging
 import threading
-from typing import Callable, Dict, List, Optional
+import time
+from typing import Callable, Dict, List, Optional, Set
 
-from shared.mqtt_dtos import DLMNotification, VehicleRequest
-from shared.policies import IPolicy, PowerAllocation
+from shared.mqtt_dtos import DLMNotification, DLMNotificationBatch, VehicleRequest
+from shared.policies import IPolicy, NodeStateArrays, PowerAllocation
 
 from .mqtt_service import MQTTService
 
@@ -17,6 +18,7 @@ class DLMService:
     - Manage PolicyManager
     - Subscribe to vehicle requests
     - Apply DLM policy (event-driven + periodic)
+    - Track nodes changed since the last run and skip idle periodic ticks
     - Publish DLM notifications when allocations change
     - Provide power allocations to nodes
     """
@@ -27,6 +29,8 @@ class DLMService:
         mqtt_service: MQTTService,
         policy: IPolicy,
         dlm_interval: float = 5.0,
+        full_refresh_interval: float = 60.0,
+        batch_notifications: bool = False,
     ):
         """
         Initialize DLM service.
@@ -36,21 +40,34 @@ class DLMService:
             mqtt_service: MQTT service for pub/sub
             policy: IPolicy to use
             dlm_interval: Interval for periodic policy execution (seconds)
+            full_refresh_interval: Maximum time between policy runs when no
+                node is marked dirty (seconds)
+            batch_notifications: Publish all notifications of a policy run as
+                one message on the dlm/events/batch topic
         """
         self.hub_id = hub_id
         self.mqtt_service = mqtt_service
         self.dlm_interval = dlm_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.batch_notifications = batch_notifications
         self.policy = policy
 
         self.logger = logging.getLogger(f"DLMService-{hub_id}")
 
         self._current_allocations: Dict[str, float] = {}
+        self._applied_limits: Dict[str, float] = {}
 
-        self._get_nodes_state_callback: Optional[Callable[[], Dict[str, Dict]]] = None
+        self._dirty_nodes: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._policy_lock = threading.RLock()
+        self._applying = threading.local()
+        self._last_run: float = 0.0
 
-        self._apply_allocation_callback: Optional[Callable[[PowerAllocation], None]] = (
-            None
-        )
+        self._get_nodes_state_callback: Optional[Callable[[], NodeStateArrays]] = None
+
+        self._apply_allocations_callback: Optional[
+            Callable[[List[PowerAllocation]], None]
+        ] = None
 
         self._handle_vehicle_assignment_callback: Optional[
             Callable[[VehicleRequest], None]
@@ -60,26 +77,26 @@ class DLMService:
         self._stop_dlm = threading.Event()
 
     def set_get_nodes_state_callback(
-        self, callback: Callable[[], Dict[str, Dict]]
+        self, callback: Callable[[], NodeStateArrays]
     ) -> None:
         """
         Set callback to get current nodes state.
 
         Args:
-            callback: Function that returns nodes state dict
+            callback: Function that returns the nodes state arrays
         """
         self._get_nodes_state_callback = callback
 
-    def set_apply_allocation_callback(
-        self, callback: Callable[[PowerAllocation], None]
+    def set_apply_allocations_callback(
+        self, callback: Callable[[List[PowerAllocation]], None]
     ) -> None:
         """
-        Set callback to apply power allocation to a node.
+        Set callback to apply a batch of power allocations to the nodes.
 
         Args:
-            callback: Function that applies allocation to a node
+            callback: Function that applies all allocations in one pass
         """
-        self._apply_allocation_callback = callback
+        self._apply_allocations_callback = callback
 
     def set_handle_vehicle_assignment_callback(
         self, callback: Callable[[VehicleRequest], None]
@@ -92,6 +109,33 @@ class DLMService:
         """
         self._handle_vehicle_assignment_callback = callback
 
+    def mark_dirty(self, node_id: str) -> None:
+        """
+        Mark a node as changed so the next periodic tick re-runs the policy.
+
+        Changes caused by the service itself while applying allocations are
+        ignored, otherwise every tick would schedule the next one.
+
+        Args:
+            node_id: Node whose state, SoC bucket, occupancy or limit changed
+        """
+        if getattr(self._applying, "active", False):
+            return
+
+        with self._dirty_lock:
+            self._dirty_nodes.add(node_id)
+
+    def has_pending_changes(self) -> bool:
+        """Check whether any node changed since the last policy run."""
+        with self._dirty_lock:
+            return bool(self._dirty_nodes)
+
+    def _take_dirty_nodes(self) -> Set[str]:
+        """Return and clear the set of dirty nodes."""
+        with self._dirty_lock:
+            dirty, self._dirty_nodes = self._dirty_nodes, set()
+        return dirty
+
     def subscribe_to_requests(self) -> None:
         """Subscribe to vehicle request topic from cloud/brain API."""
         request_topic = f"iot/hubs/{self.hub_id}/requests"
@@ -123,84 +167,123 @@ class DLMService:
         """
         Apply DLM policy and update node power limits.
 
+        Only allocations that differ from the last applied limit, or that
+        target a node marked dirty, are pushed to the nodes. All of them are
+        applied through a single callback and the resulting notifications
+        are published together.
+
         Returns:
             List of power allocations
         """
-        if not self._get_nodes_state_callback or not self._apply_allocation_callback:
+        if not self._get_nodes_state_callback or not self._apply_allocations_callback:
             self.logger.warning("Callbacks not set, cannot apply policy")
             return []
 
-        nodes_state = self._get_nodes_state_callback()
-
-        allocations = self.policy(nodes_state)
+        with self._policy_lock:
+            dirty_nodes = self._take_dirty_nodes()
+            self._last_run = time.monotonic()
 
-        for alloc in allocations:
-            old_limit = self._current_allocations.get(alloc.node_id)
-            new_limit = alloc.allocated_power_kw
+            nodes_state = self._get_nodes_state_callback()
 
-            self._apply_allocation_callback(alloc)
+            allocation_vector = self.policy.allocate(nodes_state)
+            allocations = self.policy.to_allocations(nodes_state, allocation_vector)
 
-            total_grid_load = sum(
-                nodes_state[n]["current_power_kw"] for n in nodes_state
-            )
+            total_grid_load = float(nodes_state.current_power_kw.sum())
             available_capacity = self.policy.max_grid_capacity_kw - total_grid_load
 
-            if old_limit is None or abs(old_limit - new_limit) > 1.5:
-                self._publish_dlm_notification(
-                    node_id=alloc.node_id,
-                    old_limit=old_limit or new_limit,
-                    new_limit=new_limit,
-                    reason=alloc.reason,
-                    total_grid_load=total_grid_load,
-                    available_capacity=available_capacity,
+            to_apply: List[PowerAllocation] = []
+            notifications: List[DLMNotification] = []
+
+            for alloc in allocations:
+                new_limit = alloc.allocated_power_kw
+
+                applied_limit = self._applied_limits.get(alloc.node_id)
+                if (
+                    alloc.node_id in dirty_nodes
+                    or applied_limit is None
+                    or abs(applied_limit - new_limit) > 1e-3
+                ):
+                    to_apply.append(alloc)
+
+                old_limit = self._current_allocations.get(alloc.node_id)
+                if old_limit is None or abs(old_limit - new_limit) > 1.5:
+                    notifications.append(
+                        DLMNotification(
+                            trigger_reason=alloc.reason,
+                            original_limit=old_limit or new_limit,
+                            new_limit=new_limit,
+                            affected_node_id=alloc.node_id,
+                            total_grid_load=total_grid_load,
+                            available_capacity=available_capacity,
+                        )
+                    )
+
+            if to_apply:
+                self._applying.active = True
+                try:
+                    self._apply_allocations_callback(to_apply)
+                except Exception:
+                    # Nothing is recorded as applied; retry on the next tick
+                    with self._dirty_lock:
+                        self._dirty_nodes.update(a.node_id for a in to_apply)
+                    raise
+                finally:
+                    self._applying.active = False
+
+                for alloc in to_apply:
+                    self._applied_limits[alloc.node_id] = alloc.allocated_power_kw
+
+            for notification in notifications:
+                self._current_allocations[notification.affected_node_id] = (
+                    notification.new_limit
                 )
 
-                self._current_allocations[alloc.node_id] = new_limit
+            if notifications:
+                self._publish_dlm_notifications(notifications)
 
         return allocations
 
-    def _publish_dlm_notification(
-        self,
-        node_id: str,
-        old_limit: float,
-        new_limit: float,
-        reason: str,
-        total_grid_load: float,
-        available_capacity: float,
-    ) -> None:
+    def _publish_dlm_notifications(self, notifications: List[DLMNotification]) -> None:
         """
-        Publish DLM event notification.
+        Publish the DLM event notifications produced by one policy run.
+
+        With batch_notifications enabled they are sent as a single message on
+        iot/hubs/{hub_id}/dlm/events/batch, otherwise one message per node on
+        iot/hubs/{hub_id}/dlm/events.
 
         Args:
-            node_id: Affected node ID
-            old_limit: Previous power limit
-            new_limit: New power limit
-            reason: Reason for DLM action
-            total_grid_load: Total grid load at trigger time
+            notifications: Notifications for every node whose limit changed
         """
-        notification = DLMNotification(
-            trigger_reason=reason,
-            original_limit=old_limit,
-            new_limit=new_limit,
-            affected_node_id=node_id,
-            total_grid_load=total_grid_load,
-            available_capacity=available_capacity,
-        )
-
         topic = f"iot/hubs/{self.hub_id}/dlm/events"
-        payload = notification.model_dump_json()
 
-        self.mqtt_service.publish(topic, payload, qos=1, retain=False)
+        if self.batch_notifications:
+            payload = DLMNotificationBatch(notifications).model_dump_json()
+            self.mqtt_service.publish(f"{topic}/batch", payload, qos=1, retain=False)
+        else:
+            for notification in notifications:
+                self.mqtt_service.publish(
+                    topic, notification.model_dump_json(), qos=1, retain=False
+                )
 
         self.logger.info(
-            f"📢 DLM Event: {node_id} | {old_limit:.1f}kW → {new_limit:.1f}kW | {reason}"
+            f"📢 DLM Event: {len(notifications)} node(s) updated | "
+            + ", ".join(
+                f"{n.affected_node_id} {n.original_limit:.1f}kW → {n.new_limit:.1f}kW"
+                for n in notifications
+            )
         )
 
     def _dlm_loop(self) -> None:
         """Background thread for periodic DLM policy execution."""
         while not self._stop_dlm.is_set():
             try:
-                self.apply_policy()
+                refresh_due = (
+                    time.monotonic() - self._last_run >= self.full_refresh_interval
+                )
+                if refresh_due or self.has_pending_changes():
+                    self.apply_policy()
+                else:
+                    self.logger.debug("No node changes since last run, skipping DLM")
             except Exception as e:
                 self.logger.error(f"Error in DLM loop: {e}")
 
@@ -1,5 +1,5 @@
 import random
-from typing import Dict, Optional
+from typing import List, Optional
 
 from shared.mqtt_dtos import (
     ChargingState,
@@ -9,7 +9,12 @@ from shared.mqtt_dtos import (
     HubStatus,
 )
 from shared.mqtt_dtos.vehicle_dto import VehicleRequest
-from shared.policies import EqualSharingPolicy, IPolicy, PowerAllocation
+from shared.policies import (
+    EqualSharingPolicy,
+    IPolicy,
+    NodeStateArrays,
+    PowerAllocation,
+)
 from shared.services import DLMService, MQTTService
 from smart_objects.resources import Node, SmartObject
 
@@ -36,6 +41,7 @@ class Hub(SmartObject):
         firmware_version: str = "1.0.0",
         dlm_policy: Optional[IPolicy] = None,
         dlm_interval: float = 5.0,
+        dlm_batch_notifications: bool = False,
     ):
         super().__init__(object_id=hub_id, mqtt_service=mqtt_service)
 
@@ -48,6 +54,8 @@ class Hub(SmartObject):
         self.ip_address: str = ip_address
         self.cpu_temp: float = 0.0
 
+        self._nodes_state = NodeStateArrays()
+
         policy = dlm_policy or EqualSharingPolicy(
             max_grid_capacity_kw=max_grid_capacity_kw
         )
@@ -56,10 +64,11 @@ class Hub(SmartObject):
             mqtt_service=mqtt_service,
             policy=policy,
             dlm_interval=dlm_interval,
+            batch_notifications=dlm_batch_notifications,
         )
 
         self.dlm_service.set_get_nodes_state_callback(self._get_nodes_state)
-        self.dlm_service.set_apply_allocation_callback(self._apply_allocation)
+        self.dlm_service.set_apply_allocations_callback(self.apply_allocations)
         self.dlm_service.set_handle_vehicle_assignment_callback(
             self._handle_vehicle_assignment
         )
@@ -92,6 +101,9 @@ class Hub(SmartObject):
             serial_port=serial_port,
         )
 
+        node.set_dlm_change_callback(self.dlm_service.mark_dirty)
+        self.dlm_service.mark_dirty(node_id)
+
         self.resource_map[node_id] = node
         self.logger.info(f"➕ Added node {node_id} to hub {self.hub_id}")
 
@@ -177,33 +189,51 @@ class Hub(SmartObject):
 
             self.logger.info(f"✅ Registered listeners for node {node_id}")
 
-    def _get_nodes_state(self) -> Dict[str, Dict]:
-        """Get current state of all nodes for DLM policy."""
-        nodes_state = {}
+    def _get_nodes_state(self) -> NodeStateArrays:
+        """
+        Get current state of all nodes for DLM policy.
 
-        for node_id, resource in self.resource_map.items():
-            if isinstance(resource, Node):
-                current_power = (
-                    resource.power_sensor.get_value("power")
-                    if not resource.simulation
-                    else resource.power_limit_kw
-                )
-                nodes_state[node_id] = {
-                    "max_power_kw": resource.max_power_kw,
-                    "current_power_kw": current_power,
-                    "state": resource.current_state.value,
-                    "vehicle_id": resource.connected_vehicle_id,
-                    "vehicle_soc": resource.current_vehicle_soc,
-                    "is_occupied": resource.is_occupied,
-                }
+        Refills the hub's preallocated NodeStateArrays in place, so the
+        returned object is only valid until the next call.
+        """
+        nodes = [
+            resource
+            for resource in self.resource_map.values()
+            if isinstance(resource, Node)
+        ]
+        nodes_state = self._nodes_state
+        nodes_state.reset(len(nodes))
+
+        for index, node in enumerate(nodes):
+            current_power = (
+                node.power_sensor.get_value("power")
+                if not node.simulation
+                else node.power_limit_kw
+            )
+            nodes_state.set_row(
+                index,
+                node_id=node.node_id,
+                max_power_kw=node.max_power_kw,
+                current_power_kw=current_power,
+                state=node.current_state.value,
+                soc=node.current_vehicle_soc,
+                is_occupied=node.is_occupied,
+                has_vehicle=bool(node.connected_vehicle_id),
+            )
 
         return nodes_state
 
-    def _apply_allocation(self, allocation: PowerAllocation) -> None:
-        """Apply power allocation to a node."""
-        node = self.get_node(allocation.node_id)
-        if node:
-            node.set_power_limit(allocation.allocated_power_kw)
+    def apply_allocations(self, allocations: List[PowerAllocation]) -> None:
+        """
+        Apply a batch of power allocations to the hub's nodes in one pass.
+
+        Args:
+            allocations: Allocations computed by the DLM policy
+        """
+        for allocation in allocations:
+            node = self.resource_map.get(allocation.node_id)
+            if isinstance(node, Node):
+                node.set_power_limit(allocation.allocated_power_kw)
 
     def _handle_vehicle_assignment(self, request: VehicleRequest) -> None:
         """
@@ -1,6 +1,6 @@
 import json
 import threading
-from typing import ClassVar, Optional
+from typing import Callable, ClassVar, Optional
 
 from edge.gateway import ArduinoSerialBridge
 from shared.mqtt_dtos import ChargingState, NodeInfo, NodeStatus, NodeTelemetry
@@ -29,6 +29,7 @@ class Node(SmartObjectResource):
         50  # Vehicle present if distance < 50cm
     )
     TELEMETRY_INTERVAL: ClassVar[float] = 2.0  # seconds
+    SOC_BUCKET_SIZE: ClassVar[int] = 5  # SoC changes below this don't trigger DLM
 
     def __init__(
         self,
@@ -74,9 +75,37 @@ class Node(SmartObjectResource):
         self.connected_vehicle_id: Optional[str] = None
         self.current_vehicle_soc: Optional[int] = None
 
+        self._dlm_change_callback: Optional[Callable[[str], None]] = None
+
         self._telemetry_thread: Optional[threading.Thread] = None
         self._stop_telemetry = threading.Event()
 
+    def set_dlm_change_callback(self, callback: Callable[[str], None]) -> None:
+        """
+        Set callback invoked with the node id when a DLM-relevant input changes
+        (state, occupancy, vehicle SoC bucket or power limit).
+
+        Args:
+            callback: Function that marks the node dirty for the DLM service
+        """
+        self._dlm_change_callback = callback
+
+    def _notify_dlm_change(self) -> None:
+        """Notify the DLM service that this node changed."""
+        if self._dlm_change_callback:
+            self._dlm_change_callback(self.node_id)
+
+    def _update_vehicle_soc(self, soc: Optional[int]) -> None:
+        """Update vehicle SoC, notifying DLM only when its bucket changes."""
+        old_soc = self.current_vehicle_soc
+        self.current_vehicle_soc = soc
+
+        if old_soc is None or soc is None:
+            if old_soc != soc:
+                self._notify_dlm_change()
+        elif old_soc // self.SOC_BUCKET_SIZE != soc // self.SOC_BUCKET_SIZE:
+            self._notify_dlm_change()
+
     def set_state(self, new_state: ChargingState, error_code: int = 0) -> None:
         """
         Update node state and notify listeners (which will publish status).
@@ -104,6 +133,7 @@ class Node(SmartObjectResource):
                 self.unsubscribe_from_vehicle_telemetry(self.connected_vehicle_id)  # type: ignore
 
             self.notify_update(message_type="status")
+            self._notify_dlm_change()
 
     def _start_charging(self) -> None:
         """Start charging by activating the actuator."""
@@ -124,7 +154,9 @@ class Node(SmartObjectResource):
         Args:
             limit_kw: New power limit in kW
         """
-        self.power_limit_kw = limit_kw
+        if limit_kw != self.power_limit_kw:
+            self.power_limit_kw = limit_kw
+            self._notify_dlm_change()
 
         if self.current_state == ChargingState.CHARGING:
             pwm_ratio = min(limit_kw / self.max_power_kw, 1.0)
@@ -144,7 +176,10 @@ class Node(SmartObjectResource):
         distance = self.distance_sensor.get_value("distance")
 
         if not self.simulation:
-            self.is_occupied = distance < self.VEHICLE_DETECTION_THRESHOLD
+            is_occupied = distance < self.VEHICLE_DETECTION_THRESHOLD
+            if is_occupied != self.is_occupied:
+                self.is_occupied = is_occupied
+                self._notify_dlm_change()
 
         power_w = self.power_sensor.get_value("power")
         self.logger.debug(
@@ -239,7 +274,7 @@ class Node(SmartObjectResource):
                 telemetry = VehicleTelemetry(**data)
 
                 if telemetry.battery_level is not None:
-                    self.current_vehicle_soc = telemetry.battery_level
+                    self._update_vehicle_soc(telemetry.battery_level)
 
                 if (
                     not telemetry.is_charging